@@ -0,0 +1,155 @@
+"""
+Benchmark of the formatting of the miner predictions.
+
+Times convert_prices_to_time_format against the per-float rounding it
+replaced, on (num_simulations x time points) random walks, and checks
+that both give bit-identical prices.
+
+    python -m benchmarks.formatting --num_simulations 1000 --output formatting.json
+"""
+
+import argparse
+from datetime import datetime, timezone
+import time
+import typing
+
+
+import numpy as np
+
+
+from benchmarks.utils import environment, percentiles, write_results
+from synth.utils.helpers import (
+    convert_prices_to_time_format,
+    round_to_8_significant_digits,
+)
+from synth.validator import prompt_config
+
+
+def convert_prices_per_float(
+    prices: list, start_time_str: str, time_increment: int
+) -> tuple:
+    """The previous convert_prices_to_time_format, one price at a time."""
+    start_time = datetime.fromisoformat(start_time_str).replace(
+        tzinfo=timezone.utc
+    )
+    result = [int(start_time.timestamp()), time_increment]
+
+    for price_item in prices:
+        result.append(
+            [round_to_8_significant_digits(price) for price in price_item]
+        )
+
+    return tuple(result)
+
+
+def time_function(func: typing.Callable, repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start_time)
+    return percentiles(durations)
+
+
+def bit_identical(expected: tuple, actual: tuple) -> bool:
+    if expected[:2] != actual[:2] or len(expected) != len(actual):
+        return False
+
+    return bool(
+        np.array_equal(
+            np.array(expected[2:], dtype=np.float64).view(np.int64),
+            np.array(actual[2:], dtype=np.float64).view(np.int64),
+        )
+    )
+
+
+def run_benchmark(
+    num_simulations: int = 1000,
+    time_points: int = prompt_config.LOW_FREQUENCY.time_length
+    // prompt_config.LOW_FREQUENCY.time_increment
+    + 1,
+    repeat: int = 5,
+    seed: int = 0,
+) -> dict:
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0, 0.001, (num_simulations, time_points - 1))
+    # as simulate_crypto_price_paths returns them, the miner converts
+    # them with tolist()
+    prices = (
+        90000
+        * np.exp(
+            np.concatenate(
+                [np.zeros((num_simulations, 1)), np.cumsum(log_returns, 1)],
+                1,
+            )
+        )
+    ).tolist()
+    start_time = "2025-01-01T00:00:00"
+    time_increment = prompt_config.LOW_FREQUENCY.time_increment
+
+    def per_float():
+        return convert_prices_per_float(prices, start_time, time_increment)
+
+    def vectorized():
+        return convert_prices_to_time_format(
+            prices, start_time, time_increment
+        )
+
+    functions = {
+        "per_float": time_function(per_float, repeat),
+        "vectorized": time_function(vectorized, repeat),
+    }
+
+    return {
+        "benchmark": "formatting",
+        "environment": environment(),
+        "config": {
+            "num_simulations": num_simulations,
+            "time_points": time_points,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "functions": functions,
+        "speedup": functions["per_float"]["p50"]
+        / functions["vectorized"]["p50"],
+        "bit_identical": bit_identical(per_float(), vectorized()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the formatting of the miner predictions"
+    )
+    parser.add_argument("--num_simulations", type=int, default=1000)
+    parser.add_argument(
+        "--time_points",
+        type=int,
+        default=prompt_config.LOW_FREQUENCY.time_length
+        // prompt_config.LOW_FREQUENCY.time_increment
+        + 1,
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs of each function"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write the results as JSON"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.num_simulations, args.time_points, args.repeat, args.seed
+    )
+
+    for name, stats in results["functions"].items():
+        print(f"{name}: p50 {stats['p50']:.4f}s max {stats['max']:.4f}s")
+    print(
+        f"speedup {results['speedup']:.1f}x, "
+        f"bit-identical: {results['bit_identical']}"
+    )
+    if args.output is not None:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,546 @@
+"""
+Validator ingest benchmark against a local fleet of mock miners.
+
+Each round does what query_available_miners_and_save_responses does:
+sync_forward_multiprocess to every mock axon, the validation of the
+responses and save_responses to a local Postgres. The mock axons are
+served by a separate process so they don't compete with the validator
+side for the CPU of this one.
+
+    python -m benchmarks.ingest --miners 256 --prompt low --rounds 3
+
+Without --database_url a Postgres container is started with
+testcontainers (see requirements-dev.txt) and migrated with alembic.
+"""
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import json
+import multiprocessing as mp
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import traceback
+import uuid
+
+
+from aiohttp import web
+import bittensor as bt
+import numpy as np
+from sqlalchemy import create_engine
+
+
+from benchmarks.utils import (
+    PROJECT_ROOT,
+    environment,
+    peak_rss_mb,
+    percentiles,
+    write_results,
+)
+from synth.base.dendrite_multiprocess import sync_forward_multiprocess
+from synth.protocol import Simulation
+from synth.simulation_input import SimulationInput
+from synth.utils.helpers import timeout_from_start_time
+from synth.validator import prompt_config
+from synth.validator.miner_data_handler import MinerDataHandler
+from synth.validator.response_validation_v2 import (
+    CORRECT,
+    validate_responses,
+)
+
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+# never the ip of a mock axon, see get_endpoint_url
+EXTERNAL_IP = "192.0.2.1"
+
+
+def sample_latency(
+    rng: np.random.Generator, distribution: str, mean: float
+) -> float:
+    if mean <= 0:
+        return 0.0
+    if distribution == "constant":
+        return mean
+    if distribution == "uniform":
+        return rng.uniform(0, 2 * mean)
+    if distribution == "exponential":
+        return rng.exponential(mean)
+    if distribution == "lognormal":
+        sigma = 0.5
+        return rng.lognormal(np.log(mean) - sigma**2 / 2, sigma)
+    raise ValueError(f"unknown latency distribution: {distribution}")
+
+
+def simulation_output(simulation_input: dict, seed: int) -> bytes:
+    """A prediction passing the validation, as JSON."""
+    start_time = datetime.fromisoformat(simulation_input["start_time"])
+    time_increment = simulation_input["time_increment"]
+    time_points = simulation_input["time_length"] // time_increment + 1
+
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(
+        0, 0.001, (simulation_input["num_simulations"], time_points - 1)
+    )
+    paths = 90000 * np.exp(
+        np.concatenate(
+            [np.zeros((len(log_returns), 1)), np.cumsum(log_returns, 1)], 1
+        )
+    )
+
+    prediction = [
+        int(start_time.timestamp()),
+        time_increment,
+        *np.round(paths, 2).tolist(),
+    ]
+    return json.dumps(prediction, separators=(",", ":")).encode()
+
+
+async def serve_fleet(
+    connection,
+    miners: int,
+    latency_distribution: str,
+    latency_mean: float,
+    error_rate: float,
+    seed: int,
+):
+    rng = np.random.default_rng(seed)
+    # the output of the current prompt, shared by all the axons
+    outputs: dict[str, bytes] = {}
+
+    async def handle(request: web.Request) -> web.Response:
+        body = await request.json()
+        await asyncio.sleep(
+            sample_latency(rng, latency_distribution, latency_mean)
+        )
+        if rng.random() < error_rate:
+            return web.json_response(
+                {"message": "mock miner error"}, status=500
+            )
+
+        simulation_input = json.dumps(body["simulation_input"])
+        if simulation_input not in outputs:
+            outputs.clear()
+            outputs[simulation_input] = simulation_output(
+                body["simulation_input"], seed
+            )
+
+        return web.Response(
+            body=b'{"simulation_input":'
+            + simulation_input.encode()
+            + b',"simulation_output":'
+            + outputs[simulation_input]
+            + b"}",
+            content_type="application/json",
+        )
+
+    app = web.Application()
+    app.router.add_post("/Simulation", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+
+    ports = []
+    for _ in range(miners):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(runner, sock).start()
+        ports.append(sock.getsockname()[1])
+    connection.send(ports)
+
+    # until the benchmark terminates the process
+    await asyncio.Event().wait()
+
+
+def run_fleet(*args):
+    asyncio.run(serve_fleet(*args))
+
+
+@contextmanager
+def mock_fleet(
+    miners: int,
+    latency_distribution: str,
+    latency_mean: float,
+    error_rate: float,
+    seed: int,
+):
+    """Yield the ports of the mock axons."""
+    context = mp.get_context("spawn")
+    parent_connection, child_connection = context.Pipe()
+    process = context.Process(
+        target=run_fleet,
+        args=(
+            child_connection,
+            miners,
+            latency_distribution,
+            latency_mean,
+            error_rate,
+            seed,
+        ),
+        name="mock-fleet",
+        daemon=True,
+    )
+    process.start()
+    try:
+        if not parent_connection.poll(120):
+            raise RuntimeError("the mock fleet did not start")
+        yield parent_connection.recv()
+    finally:
+        process.terminate()
+        process.join()
+
+
+@contextmanager
+def local_database(database_url: str | None):
+    if database_url is not None:
+        yield database_url
+        return
+
+    # dev dependency, only needed without --database-url
+    from testcontainers.postgres import PostgresContainer
+
+    postgres = PostgresContainer("postgres:16-alpine")
+    postgres.start()
+    try:
+        database_url = postgres.get_connection_url()
+        subprocess.run(
+            ["alembic", "upgrade", "head"],
+            check=True,
+            cwd=PROJECT_ROOT,
+            env={**os.environ, "DB_URL_TEST": database_url},
+        )
+        yield database_url
+    finally:
+        postgres.stop()
+
+
+def run_round(
+    miner_data_handler: MinerDataHandler,
+    keypair: bt.Keypair,
+    axons: list[bt.AxonInfo],
+    miner_uids: list[int],
+    simulation_input: SimulationInput,
+    request_time: datetime,
+    nprocs: int,
+) -> dict:
+    timeout = timeout_from_start_time(None, simulation_input.start_time)
+
+    start_time = time.perf_counter()
+    synapses = sync_forward_multiprocess(
+        keypair,
+        str(uuid.uuid4()),
+        EXTERNAL_IP,
+        axons,
+        Simulation(simulation_input=simulation_input),
+        timeout,
+        nprocs,
+    )
+    forward_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    miner_predictions = {}
+    for miner_uid, synapse in zip(miner_uids, synapses):
+        response = synapse.deserialize()
+        process_time = synapse.dendrite.process_time
+        format_validation = validate_responses(
+            response, simulation_input, request_time, process_time
+        )
+        miner_predictions[miner_uid] = (
+            response,
+            format_validation,
+            process_time,
+        )
+    validation_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    miner_data_handler.save_responses(
+        miner_predictions, simulation_input, request_time
+    )
+    save_seconds = time.perf_counter() - start_time
+
+    total_seconds = forward_seconds + validation_seconds + save_seconds
+    return {
+        "forward_seconds": forward_seconds,
+        "validation_seconds": validation_seconds,
+        "save_seconds": save_seconds,
+        "total_seconds": total_seconds,
+        "responses": sum(
+            synapse.dendrite.process_time is not None for synapse in synapses
+        ),
+        "valid": sum(
+            format_validation == CORRECT
+            for _, format_validation, _ in miner_predictions.values()
+        ),
+        "throughput": len(axons) / total_seconds,
+        "process_times": [
+            float(synapse.dendrite.process_time)
+            for synapse in synapses
+            if synapse.dendrite.process_time is not None
+        ],
+    }
+
+
+def run_benchmark(
+    database_url: str,
+    miners: int = 256,
+    rounds: int = 3,
+    prompt: prompt_config.PromptConfig = prompt_config.LOW_FREQUENCY,
+    num_simulations: int | None = None,
+    deadline: float | None = None,
+    nprocs: int = 2,
+    latency_distribution: str = "lognormal",
+    latency_mean: float = 1.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> dict:
+    """
+    Run the rounds and return the results.
+
+    num_simulations and deadline (seconds from the request to the
+    simulation start time) default to the ones of the prompt.
+    """
+    if num_simulations is None:
+        num_simulations = prompt.num_simulations
+    if deadline is None:
+        deadline = prompt.timeout_extra_seconds
+
+    engine = create_engine(database_url)
+    miner_data_handler = MinerDataHandler(engine)
+    keypair = bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+
+    miner_uids = list(range(miners))
+    miner_data_handler.insert_new_miners(
+        [
+            {
+                "neuron_uid": uid,
+                "coldkey": f"mock-coldkey-{uid}",
+                "hotkey": f"mock-hotkey-{uid}",
+            }
+            for uid in miner_uids
+        ]
+    )
+
+    round_results = []
+    with mock_fleet(
+        miners, latency_distribution, latency_mean, error_rate, seed
+    ) as ports:
+        axons = [
+            bt.AxonInfo(
+                version=1,
+                ip="127.0.0.1",
+                port=port,
+                ip_type=4,
+                hotkey=f"mock-hotkey-{uid}",
+                coldkey=f"mock-coldkey-{uid}",
+            )
+            for uid, port in zip(miner_uids, ports)
+        ]
+
+        for round_number in range(rounds):
+            request_time = datetime.now(timezone.utc)
+            simulation_input = SimulationInput(
+                asset="BTC",
+                start_time=(
+                    request_time + timedelta(seconds=deadline)
+                ).isoformat(),
+                time_increment=prompt.time_increment,
+                time_length=prompt.time_length,
+                num_simulations=num_simulations,
+            )
+            round_result = run_round(
+                miner_data_handler,
+                keypair,
+                axons,
+                miner_uids,
+                simulation_input,
+                request_time,
+                nprocs,
+            )
+            bt.logging.info(
+                f"round {round_number}: "
+                f"{round_result['total_seconds']:.2f}s, "
+                f"{round_result['valid']}/{miners} valid responses"
+            )
+            round_results.append(round_result)
+
+        # the dendrite processes have exited, not the mock fleet
+        peak_rss_children = peak_rss_mb(resource.RUSAGE_CHILDREN)
+
+    engine.dispose()
+
+    process_times = [
+        process_time
+        for round_result in round_results
+        for process_time in round_result.pop("process_times")
+    ]
+    return {
+        "benchmark": "ingest",
+        "environment": environment(),
+        "config": {
+            "miners": miners,
+            "rounds": rounds,
+            "prompt": prompt.label,
+            "time_length": prompt.time_length,
+            "time_increment": prompt.time_increment,
+            "num_simulations": num_simulations,
+            "deadline": deadline,
+            "nprocs": nprocs,
+            "latency_distribution": latency_distribution,
+            "latency_mean": latency_mean,
+            "error_rate": error_rate,
+            "seed": seed,
+        },
+        "rounds": round_results,
+        "summary": {
+            "throughput": percentiles(
+                [round_result["throughput"] for round_result in round_results]
+            ),
+            "miner_response_seconds": percentiles(process_times),
+            **{
+                stage: percentiles(
+                    [round_result[stage] for round_result in round_results]
+                )
+                for stage in (
+                    "forward_seconds",
+                    "validation_seconds",
+                    "save_seconds",
+                    "total_seconds",
+                )
+            },
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_dendrite_workers_mb": peak_rss_children,
+        },
+    }
+
+
+def print_summary(results: dict):
+    summary = results["summary"]
+    print(
+        f"throughput: {summary['throughput']['mean']:.1f} miners/s "
+        f"over {results['config']['rounds']} round(s) of "
+        f"{results['config']['miners']} miners"
+    )
+    for stage in (
+        "miner_response_seconds",
+        "forward_seconds",
+        "validation_seconds",
+        "save_seconds",
+        "total_seconds",
+    ):
+        stats = summary[stage]
+        if stats["count"] == 0:
+            print(f"{stage}: no data")
+            continue
+        print(
+            f"{stage}: p50 {stats['p50']:.3f} p90 {stats['p90']:.3f} "
+            f"p99 {stats['p99']:.3f} max {stats['max']:.3f}"
+        )
+    print(
+        f"peak RSS: {summary['peak_rss_mb']:.0f} MB (validator), "
+        f"{summary['peak_rss_dendrite_workers_mb']:.0f} MB (dendrite worker)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the validator ingest against mock miners"
+    )
+    parser.add_argument(
+        "--miners", type=int, default=256, help="Number of mock axons"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Number of prompts to send"
+    )
+    parser.add_argument(
+        "--prompt",
+        choices=[
+            prompt_config.LOW_FREQUENCY.label,
+            prompt_config.HIGH_FREQUENCY.label,
+        ],
+        default=prompt_config.LOW_FREQUENCY.label,
+        help="Prompt config giving the size of the responses",
+    )
+    parser.add_argument(
+        "--num_simulations",
+        type=int,
+        default=None,
+        help="Override the number of paths of the responses",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Seconds from the request to the simulation start time",
+    )
+    parser.add_argument(
+        "--nprocs", type=int, default=2, help="Dendrite processes"
+    )
+    parser.add_argument(
+        "--latency_distribution",
+        choices=LATENCY_DISTRIBUTIONS,
+        default="lognormal",
+        help="Distribution of the mock miner latency",
+    )
+    parser.add_argument(
+        "--latency_mean",
+        type=float,
+        default=1.0,
+        help="Mean mock miner latency in seconds",
+    )
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        default=0.0,
+        help="Fraction of the requests answered with an HTTP 500",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--database_url",
+        type=str,
+        default=None,
+        help="Migrated Postgres database, a container is started if omitted",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write the results as JSON"
+    )
+    args = parser.parse_args()
+
+    # same start method as the validator
+    mp.set_start_method("spawn", force=True)
+
+    prompt = (
+        prompt_config.HIGH_FREQUENCY
+        if args.prompt == prompt_config.HIGH_FREQUENCY.label
+        else prompt_config.LOW_FREQUENCY
+    )
+    try:
+        with local_database(args.database_url) as database_url:
+            results = run_benchmark(
+                database_url,
+                miners=args.miners,
+                rounds=args.rounds,
+                prompt=prompt,
+                num_simulations=args.num_simulations,
+                deadline=args.deadline,
+                nprocs=args.nprocs,
+                latency_distribution=args.latency_distribution,
+                latency_mean=args.latency_mean,
+                error_rate=args.error_rate,
+                seed=args.seed,
+            )
+    except Exception as e:
+        bt.logging.error(f"in ingest benchmark (got an exception): {e}")
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
+
+    print_summary(results)
+    if args.output is not None:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+Scoring benchmark on synthetic predictions.
+
+Times the stages of the scoring of one validator request, for both
+prompt configs: the conversion of the stored predictions to arrays,
+calculate_crps_for_miner, compute_prompt_scores and get_rewards end to
+end. The predictions are (miners x num_simulations x time points)
+random walks and the real price path has NaN gaps, like the prices
+missing from the price provider.
+
+    python -m benchmarks.scoring --miners 64 --output scoring.json
+
+The timings are measured without tracemalloc, the peak allocation of
+each stage is measured by a separate run.
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import time
+import tracemalloc
+import typing
+
+
+import bittensor as bt
+import numpy as np
+
+
+from benchmarks.utils import (
+    environment,
+    peak_rss_mb,
+    percentiles,
+    write_results,
+)
+from synth.db.models import MinerPrediction, ValidatorRequest
+from synth.validator import prompt_config, response_validation_v2
+from synth.validator.crps_calculation import calculate_crps_for_miner
+from synth.validator.reward import (
+    compute_prompt_scores,
+    get_rewards,
+    prediction_to_array,
+)
+
+
+PROMPTS = (prompt_config.LOW_FREQUENCY, prompt_config.HIGH_FREQUENCY)
+
+
+def random_walks(
+    rng: np.random.Generator,
+    start_price: float,
+    num_paths: int,
+    time_points: int,
+    sigma: float,
+) -> np.ndarray:
+    log_returns = rng.normal(0, sigma, (num_paths, time_points - 1))
+    return start_price * np.exp(
+        np.concatenate(
+            [np.zeros((num_paths, 1)), np.cumsum(log_returns, 1)], 1
+        )
+    )
+
+
+def real_price_path(
+    rng: np.random.Generator,
+    time_points: int,
+    gap_fraction: float,
+    start_price: float = 90000,
+) -> list[float]:
+    """A price path with runs of missing prices (NaN), the first price
+    is always there."""
+    prices = random_walks(rng, start_price, 1, time_points, 0.001)[0]
+
+    missing = int(gap_fraction * (time_points - 1))
+    while missing > 0:
+        length = min(int(rng.geometric(0.3)), missing)
+        start = int(rng.integers(1, time_points - length + 1))
+        prices[start : start + length] = np.nan
+        missing -= length
+
+    return prices.tolist()
+
+
+def synthetic_predictions(
+    rng: np.random.Generator,
+    prompt: prompt_config.PromptConfig,
+    num_simulations: int,
+    distinct_predictions: int,
+    start_time: datetime,
+    start_price: float = 90000,
+) -> list[list]:
+    """Predictions in the format stored in miner_predictions.prediction.
+
+    A full (miners x num_simulations x time points) set of Python lists
+    doesn't fit in memory for hundreds of miners, the miners share
+    distinct_predictions predictions instead."""
+    time_points = prompt.time_length // prompt.time_increment + 1
+    return [
+        [
+            int(start_time.timestamp()),
+            prompt.time_increment,
+            *np.round(
+                random_walks(
+                    rng,
+                    start_price,
+                    num_simulations,
+                    time_points,
+                    # each miner has its own volatility
+                    rng.uniform(0.0005, 0.002),
+                ),
+                2,
+            ).tolist(),
+        ]
+        for _ in range(distinct_predictions)
+    ]
+
+
+class SyntheticMinerDataHandler:
+    """The MinerDataHandler methods used by get_rewards, in memory."""
+
+    def __init__(self, miner_predictions: list[MinerPrediction]):
+        self.miner_predictions = {
+            prediction.miner_uid: prediction
+            for prediction in miner_predictions
+        }
+
+    def get_miner_uid_of_prediction_request(
+        self, validator_request_id: int
+    ) -> list[int]:
+        return list(self.miner_predictions)
+
+    def get_miner_prediction(
+        self, miner_uid: int, validator_request_id: int
+    ) -> typing.Optional[MinerPrediction]:
+        return self.miner_predictions.get(miner_uid)
+
+
+class SyntheticPriceDataProvider:
+    def __init__(self, real_prices: list[float]):
+        self.real_prices = real_prices
+
+    def fetch_data(self, validator_request: ValidatorRequest) -> list[float]:
+        return self.real_prices
+
+
+def time_stage(func: typing.Callable, repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": percentiles(durations),
+        "peak_allocated_mb": peak / 1024 / 1024,
+    }
+
+
+def benchmark_prompt(
+    prompt: prompt_config.PromptConfig,
+    miners: int,
+    num_simulations: int,
+    distinct_predictions: int,
+    gap_fraction: float,
+    repeat: int,
+    seed: int,
+    real_prices: typing.Optional[list[float]] = None,
+) -> dict:
+    rng = np.random.default_rng(seed)
+    start_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    time_points = prompt.time_length // prompt.time_increment + 1
+
+    if real_prices is None:
+        real_prices = real_price_path(rng, time_points, gap_fraction)
+    elif len(real_prices) != time_points:
+        raise ValueError(
+            f"{prompt.label} prompt: expected {time_points} real prices, "
+            f"got {len(real_prices)}"
+        )
+
+    predictions = synthetic_predictions(
+        rng, prompt, num_simulations, distinct_predictions, start_time
+    )
+    miner_predictions = [
+        MinerPrediction(
+            id=miner_uid,
+            miner_uid=miner_uid,
+            prediction=predictions[miner_uid % len(predictions)],
+            format_validation=response_validation_v2.CORRECT,
+            process_time=1.0,
+        )
+        for miner_uid in range(miners)
+    ]
+    validator_request = ValidatorRequest(
+        id=1,
+        start_time=start_time,
+        asset="BTC",
+        time_increment=prompt.time_increment,
+        time_length=prompt.time_length,
+        num_simulations=num_simulations,
+    )
+
+    def prepare() -> list[np.ndarray]:
+        return [
+            prediction_to_array(miner_prediction)
+            for miner_prediction in miner_predictions
+        ]
+
+    simulation_runs = prepare()
+    real_price_array = np.array(real_prices)
+
+    def crps() -> list[float]:
+        return [
+            calculate_crps_for_miner(
+                runs,
+                real_price_array,
+                prompt.time_increment,
+                prompt.scoring_intervals,
+            )[0]
+            for runs in simulation_runs
+        ]
+
+    score_values = np.array(crps())
+
+    def rewards():
+        return get_rewards(
+            SyntheticMinerDataHandler(miner_predictions),
+            SyntheticPriceDataProvider(real_prices),
+            validator_request,
+        )
+
+    stages = {
+        "prepare_predictions": time_stage(prepare, repeat),
+        "calculate_crps_for_miner": time_stage(crps, repeat),
+        "compute_prompt_scores": time_stage(
+            lambda: compute_prompt_scores(score_values), repeat
+        ),
+        "get_rewards": time_stage(rewards, repeat),
+    }
+    # per miner mean, the stages above score all the miners
+    for stage in ("prepare_predictions", "calculate_crps_for_miner"):
+        stages[stage]["seconds_per_miner"] = (
+            stages[stage]["seconds"]["mean"] / miners
+        )
+
+    return {
+        "time_points": time_points,
+        "missing_real_prices": int(np.isnan(real_price_array).sum()),
+        "scored_miners": int((score_values != -1).sum()),
+        "stages": stages,
+    }
+
+
+def run_benchmark(
+    miners: int = 64,
+    num_simulations: int | None = None,
+    distinct_predictions: int = 4,
+    gap_fraction: float = 0.05,
+    repeat: int = 3,
+    seed: int = 0,
+    prompts: tuple[prompt_config.PromptConfig, ...] = PROMPTS,
+    real_prices: typing.Optional[dict[str, list[float]]] = None,
+) -> dict:
+    """
+    Run the benchmark of each prompt config and return the results.
+
+    num_simulations defaults to the one of the prompt. real_prices
+    optionally maps a prompt label to a recorded real price path
+    replacing the synthetic one.
+    """
+    real_prices = real_prices or {}
+    results = {}
+    for prompt in prompts:
+        bt.logging.info(f"benchmarking the {prompt.label} prompt scoring")
+        results[prompt.label] = benchmark_prompt(
+            prompt,
+            miners,
+            num_simulations or prompt.num_simulations,
+            distinct_predictions,
+            gap_fraction,
+            repeat,
+            seed,
+            real_prices.get(prompt.label),
+        )
+
+    return {
+        "benchmark": "scoring",
+        "environment": environment(),
+        "config": {
+            "miners": miners,
+            "num_simulations": num_simulations,
+            "distinct_predictions": distinct_predictions,
+            "gap_fraction": gap_fraction,
+            "repeat": repeat,
+            "seed": seed,
+            "real_prices": sorted(real_prices),
+        },
+        "prompts": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_summary(results: dict):
+    for label, prompt_results in results["prompts"].items():
+        print(
+            f"{label} prompt, {results['config']['miners']} miners, "
+            f"{prompt_results['time_points']} time points, "
+            f"{prompt_results['missing_real_prices']} missing real prices"
+        )
+        for stage, stats in prompt_results["stages"].items():
+            print(
+                f"  {stage}: p50 {stats['seconds']['p50']:.4f}s "
+                f"max {stats['seconds']['max']:.4f}s, "
+                f"peak {stats['peak_allocated_mb']:.1f} MB allocated"
+            )
+    print(f"peak RSS: {results['peak_rss_mb']:.0f} MB")
+
+
+def load_real_prices(path: str) -> dict[str, list[float]]:
+    """JSON object mapping a prompt label to a real price path, e.g.
+    the real_prices of a validator request (null for a missing price)."""
+    with open(path) as f:
+        return {
+            label: [np.nan if price is None else price for price in prices]
+            for label, prices in json.load(f).items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scoring on synthetic predictions"
+    )
+    parser.add_argument(
+        "--miners", type=int, default=64, help="Number of predictions"
+    )
+    parser.add_argument(
+        "--num_simulations",
+        type=int,
+        default=None,
+        help="Override the number of paths of the predictions",
+    )
+    parser.add_argument(
+        "--distinct_predictions",
+        type=int,
+        default=4,
+        help="Number of distinct predictions shared by the miners",
+    )
+    parser.add_argument(
+        "--gap_fraction",
+        type=float,
+        default=0.05,
+        help="Fraction of the real prices missing",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs of each stage"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--prompt",
+        choices=[prompt.label for prompt in PROMPTS],
+        default=None,
+        help="Only benchmark this prompt config",
+    )
+    parser.add_argument(
+        "--real_prices",
+        type=str,
+        default=None,
+        help="JSON file of real price paths by prompt label",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write the results as JSON"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        miners=args.miners,
+        num_simulations=args.num_simulations,
+        distinct_predictions=args.distinct_predictions,
+        gap_fraction=args.gap_fraction,
+        repeat=args.repeat,
+        seed=args.seed,
+        prompts=tuple(
+            prompt
+            for prompt in PROMPTS
+            if args.prompt is None or prompt.label == args.prompt
+        ),
+        real_prices=(
+            load_real_prices(args.real_prices)
+            if args.real_prices is not None
+            else None
+        ),
+    )
+
+    print_summary(results)
+    if args.output is not None:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 # The MIT License (MIT)
 # Copyright © 2023 Yuma Rao
 # Copyright © 2023 Mode Labs
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import multiprocessing as mp
-import sched
+import sys
+import threading
 import time
+import traceback
 
 # Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
 # documentation files (the “Software”), to deal in the Software without restriction, including without limitation
@@ -25,8 +29,10 @@ from dotenv import load_dotenv
 import bittensor as bt
 
 from synth.base.validator import BaseValidatorNeuron
+from synth.db.models import get_async_engine, get_engine
 
 from synth.simulation_input import SimulationInput
+from synth.utils import metrics
 from synth.utils.helpers import (
     get_current_time,
     round_time_to_minutes,
@@ -34,12 +40,17 @@ from synth.utils.helpers import (
 from synth.utils.logging import setup_gcp_logging
 from synth.utils.opening_hours import should_skip_xau
 from synth.validator.forward import (
+    append_owner_weight,
     calculate_moving_average_and_update_rewards,
     calculate_scores,
+    calculate_scores_parallel,
+    calculate_scores_pipelined,
     get_available_miners_and_update_metagraph_history,
+    owner_uid,
     query_available_miners_and_save_responses,
     send_weights_to_bittensor_and_update_weights_history,
 )
+from synth.validator.async_miner_data_handler import AsyncMinerDataHandler
 from synth.validator.miner_data_handler import MinerDataHandler
 from synth.validator.price_data_provider import PriceDataProvider
 from synth.validator.prompt_config import (
@@ -47,6 +58,8 @@ from synth.validator.prompt_config import (
     LOW_FREQUENCY,
     HIGH_FREQUENCY,
 )
+from synth.validator.scoring_pool import create_scoring_pool
+from synth.validator.scoring_worker import ScoringWorker
 
 
 load_dotenv()
@@ -71,15 +84,66 @@ class Validator(BaseValidatorNeuron):
         bt.logging.info("load_state()")
         self.load_state()
 
-        self.miner_data_handler = MinerDataHandler()
+        self.miner_data_handler = MinerDataHandler(
+            get_engine(
+                driver=self.config.db.driver,
+                pool_size=self.config.db.pool_size,
+                max_overflow=self.config.db.max_overflow,
+                pool_recycle=self.config.db.pool_recycle,
+                pool_timeout=self.config.db.pool_timeout,
+                statement_timeout=self.config.db.statement_timeout,
+                prepare_threshold=self.config.db.prepare_threshold,
+            )
+        )
+        self.async_miner_data_handler = None
+        if self.config.scoring.pipelined:
+            self.async_miner_data_handler = AsyncMinerDataHandler(
+                get_async_engine(
+                    pool_size=self.config.db.pool_size,
+                    max_overflow=self.config.db.max_overflow,
+                    pool_recycle=self.config.db.pool_recycle,
+                    pool_timeout=self.config.db.pool_timeout,
+                    statement_timeout=self.config.db.statement_timeout,
+                )
+            )
         self.price_data_provider = PriceDataProvider()
+        # started once, its processes are reused by every scoring pass
+        self.scoring_pool = None
+        if self.config.scoring.workers > 1:
+            self.scoring_pool = create_scoring_pool(
+                self.config.scoring.workers,
+                self.miner_data_handler,
+                self.price_data_provider,
+            )
 
-        self.scheduler = sched.scheduler(time.time, time.sleep)
+        # each prompt cadence is an asyncio task, the blocking body of a
+        # cycle runs in this executor so both cadences can run at once
+        self.cycle_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="cycle"
+        )
+        # map prompt label -> {"count", "last_duration", "max_duration",
+        # "last_lateness", "max_lateness"} in seconds
+        self.cycle_stats: dict[str, dict] = {}
+        # scoring, moving averages and set_weights run in this thread,
+        # the cycles only issue the prompts
+        self.scoring_worker = ScoringWorker()
+        # the subtensor connection, the metagraph and miner_uids are shared
+        # by the threads: sync(), set_weights and the miner list update
+        # must not interleave, and the prompts read them under it
+        self.chain_lock = threading.Lock()
         self.miner_uids: list[int] = []
         HIGH_FREQUENCY.softmax_beta = self.config.softmax.beta
 
         self.assert_assets_supported()
 
+        if self.config.metrics.port is not None:
+            metrics.start_http_server(self.config.metrics.port)
+        if self.config.metrics.json_path is not None:
+            metrics.start_json_dump(
+                self.config.metrics.json_path,
+                self.config.metrics.json_interval,
+            )
+
     def assert_assets_supported(self):
         # Assert assets are all implemented in the price data provider:
         for asset in self.asset_list:
@@ -98,38 +162,91 @@ class Validator(BaseValidatorNeuron):
             base_neuron=self,
             miner_data_handler=self.miner_data_handler,
         )
-        self.schedule_cycle(get_current_time(), HIGH_FREQUENCY, True)
-        self.schedule_cycle(get_current_time(), LOW_FREQUENCY, True)
-        self.scheduler.run()
-
-    def schedule_cycle(
-        self,
-        cycle_start_time: datetime,
-        prompt_config: PromptConfig,
-        immediately: bool = False,
-    ):
-        delay = self.select_delay(
-            self.asset_list, cycle_start_time, prompt_config, immediately
-        )
-        latest_asset = self.miner_data_handler.get_latest_asset(
-            prompt_config.time_length
-        )
-        asset = self.select_asset(latest_asset, self.asset_list, delay)
-
-        bt.logging.info(
-            f"Scheduling next {prompt_config.label} frequency cycle for asset {asset} in {delay} seconds"
+        self.scoring_worker.start()
+        try:
+            self.loop.run_until_complete(self.run_cycles())
+        finally:
+            if self.scoring_pool is not None:
+                self.scoring_pool.shutdown(cancel_futures=True)
+
+    async def run_cycles(self):
+        await asyncio.gather(
+            self.run_prompt_cycle(HIGH_FREQUENCY),
+            self.run_prompt_cycle(LOW_FREQUENCY),
         )
 
+    async def run_prompt_cycle(self, prompt_config: PromptConfig):
+        """Run the cycles of a prompt cadence forever, independently of
+        the other cadence."""
         method = (
             self.cycle_low_frequency
             if prompt_config.label == LOW_FREQUENCY.label
             else self.cycle_high_frequency
         )
-        self.scheduler.enter(
-            delay=delay,
-            priority=1,
-            action=method,
-            argument=(asset,),
+        cycle_start_time = get_current_time()
+        immediately = True
+        while True:
+            delay = self.select_delay(
+                self.asset_list, cycle_start_time, prompt_config, immediately
+            )
+            latest_asset = await self.loop.run_in_executor(
+                self.cycle_executor,
+                self.miner_data_handler.get_latest_asset,
+                prompt_config.time_length,
+            )
+            asset = self.select_asset(latest_asset, self.asset_list, delay)
+
+            bt.logging.info(
+                f"Scheduling next {prompt_config.label} frequency cycle for asset {asset} in {delay} seconds"
+            )
+            planned_time = time.monotonic() + delay
+            await asyncio.sleep(delay)
+
+            cycle_start_time = get_current_time()
+            immediately = False
+            started_at = time.monotonic()
+            try:
+                await self.loop.run_in_executor(
+                    self.cycle_executor, method, asset
+                )
+            except Exception as e:
+                bt.logging.error(
+                    f"in {prompt_config.label} frequency cycle (got an exception): {e}"
+                )
+                traceback.print_exc(file=sys.stderr)
+
+            self.record_cycle_timing(
+                prompt_config.label,
+                started_at - planned_time,
+                time.monotonic() - started_at,
+            )
+
+    def record_cycle_timing(
+        self, label: str, lateness: float, duration: float
+    ):
+        stats = self.cycle_stats.setdefault(
+            label,
+            {
+                "count": 0,
+                "last_duration": 0.0,
+                "max_duration": 0.0,
+                "last_lateness": 0.0,
+                "max_lateness": 0.0,
+            },
+        )
+        stats["count"] += 1
+        stats["last_duration"] = duration
+        stats["max_duration"] = max(stats["max_duration"], duration)
+        stats["last_lateness"] = lateness
+        stats["max_lateness"] = max(stats["max_lateness"], lateness)
+        metrics.observe(f"run_prompt_cycle.{label}", duration)
+        metrics.observe(
+            f"run_prompt_cycle.{label}.lateness", max(lateness, 0.0)
+        )
+        bt.logging.debug(
+            f"{label} frequency cycle started {lateness:.1f}s late "
+            f"and took {duration:.1f}s",
+            "cycle_timing",
         )
 
     @staticmethod
@@ -171,38 +288,77 @@ class Validator(BaseValidatorNeuron):
 
     def cycle_low_frequency(self, asset: str):
         bt.logging.info(f"starting the {LOW_FREQUENCY.label} frequency cycle")
-        cycle_start_time = get_current_time()
 
         # update the miners, also for the high frequency prompt that will use the same list
-        self.miner_uids = get_available_miners_and_update_metagraph_history(
-            base_neuron=self,
-            miner_data_handler=self.miner_data_handler,
-        )
+        with self.chain_lock:
+            self.miner_uids = (
+                get_available_miners_and_update_metagraph_history(
+                    base_neuron=self,
+                    miner_data_handler=self.miner_data_handler,
+                )
+            )
         self.forward_prompt(asset, LOW_FREQUENCY)
-        self.forward_score_low_frequency()
+        self.scoring_worker.submit(
+            LOW_FREQUENCY.label, self.forward_score_low_frequency
+        )
         # self.cleanup_history()
-        self.sync()
-        self.schedule_cycle(cycle_start_time, LOW_FREQUENCY)
+        with self.chain_lock:
+            self.sync()
+        self.miner_data_handler.log_db_stats()
 
     def cycle_high_frequency(self, asset: str):
-        cycle_start_time = get_current_time()
-
         self.forward_prompt(asset, HIGH_FREQUENCY)
+        self.scoring_worker.submit(
+            HIGH_FREQUENCY.label, self.forward_score_high_frequency
+        )
 
+    def forward_score_high_frequency(self):
         current_time = get_current_time()
         scored_time: datetime = round_time_to_minutes(current_time)
         bt.logging.info(f"forward score {HIGH_FREQUENCY.label} frequency")
-        calculate_scores(
+        self.calculate_scores(scored_time, HIGH_FREQUENCY)
+
+    def calculate_scores(
+        self, scored_time: datetime, prompt_config: PromptConfig
+    ) -> bool:
+        if self.scoring_pool is not None:
+            return calculate_scores_parallel(
+                self.miner_data_handler,
+                self.price_data_provider,
+                scored_time,
+                prompt_config,
+                self.scoring_pool,
+            )
+
+        if self.async_miner_data_handler is not None:
+            # called from the scoring thread, the pipeline runs on the
+            # event loop of the cycles
+            return asyncio.run_coroutine_threadsafe(
+                calculate_scores_pipelined(
+                    self.async_miner_data_handler,
+                    self.price_data_provider,
+                    scored_time,
+                    prompt_config,
+                ),
+                self.loop,
+            ).result()
+
+        return calculate_scores(
             self.miner_data_handler,
             self.price_data_provider,
             scored_time,
-            HIGH_FREQUENCY,
+            prompt_config,
         )
-        self.schedule_cycle(cycle_start_time, HIGH_FREQUENCY)
 
     def forward_prompt(self, asset: str, prompt_config: PromptConfig):
         bt.logging.info(f"forward prompt for {prompt_config.label} frequency")
-        if len(self.miner_uids) == 0:
+        # the other cadence can update the miners or resync the metagraph
+        # while this prompt is sent, query a consistent snapshot
+        with self.chain_lock:
+            miner_uids = list(self.miner_uids)
+            axons = [self.metagraph.axons[uid] for uid in miner_uids]
+
+        if len(miner_uids) == 0:
             bt.logging.error(
                 "No miners available",
                 "forward_prompt",
@@ -232,9 +388,10 @@ class Validator(BaseValidatorNeuron):
         query_available_miners_and_save_responses(
             base_neuron=self,
             miner_data_handler=self.miner_data_handler,
-            miner_uids=self.miner_uids,
+            miner_uids=miner_uids,
             simulation_input=simulation_input,
             request_time=request_time,
+            axons=axons,
         )
 
     def forward_score_low_frequency(self):
@@ -251,12 +408,7 @@ class Validator(BaseValidatorNeuron):
         # we store the rewards in the miner_scores table
         # ========================================== #
 
-        success = calculate_scores(
-            self.miner_data_handler,
-            self.price_data_provider,
-            scored_time,
-            LOW_FREQUENCY,
-        )
+        success = self.calculate_scores(scored_time, LOW_FREQUENCY)
 
         if not success:
             return
@@ -280,30 +432,23 @@ class Validator(BaseValidatorNeuron):
         # into bittensor consensus calculation
         # ========================================== #
 
-        moving_averages_data.append(
-            {
-                "miner_id": 0,
-                "miner_uid": (
-                    23 if self.config.subtensor.network == "test" else 248
-                ),
-                "smoothed_score": 0,
-                "reward_weight": sum(
-                    [r["reward_weight"] for r in moving_averages_data]
-                ),
-                "updated_at": scored_time.isoformat(),
-            }
+        append_owner_weight(
+            moving_averages_data,
+            owner_uid(self.config.subtensor.network),
+            scored_time,
         )
 
         bt.logging.info(
             f"Moving averages data for owner: {moving_averages_data[-1]}"
         )
 
-        send_weights_to_bittensor_and_update_weights_history(
-            base_neuron=self,
-            moving_averages_data=moving_averages_data,
-            miner_data_handler=self.miner_data_handler,
-            scored_time=scored_time,
-        )
+        with self.chain_lock:
+            send_weights_to_bittensor_and_update_weights_history(
+                base_neuron=self,
+                moving_averages_data=moving_averages_data,
+                miner_data_handler=self.miner_data_handler,
+                scored_time=scored_time,
+            )
 
     async def forward_miner(self, _: bt.Synapse) -> bt.Synapse:
         pass
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from src.model.basemodel import BaseModel
 from src.model.mertonmodel import MertonModel
 from src.model.egarchmodel import EGARCHModel
+import numpy as np
 import polars as pl
 from typing import Optional
 from src.core.constants import SIMULATIONS_PER_PROMPT_BACKTESTING
@@ -23,9 +24,12 @@ class Performance:
     
     def __init__(
         self,
-        model_id: str
+        model_id: str,
+        seed: Optional[int] = Config.SEED
     ):
         self.model_id = model_id
+        # each prompt is simulated with its own spawned SeedSequence
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.simulations_per_prompt = SIMULATIONS_PER_PROMPT_BACKTESTING
         self.model_mapping = {
         "base": BaseModel,
@@ -124,7 +128,8 @@ class Performance:
             self.model,
             asset,
             time_length,
-            self.simulations_per_prompt
+            self.simulations_per_prompt,
+            seed_sequence=self.seed_sequence.spawn(1)[0]
         )['scores']
         return {
             "request_timestamp": timestamp,
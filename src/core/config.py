@@ -2,9 +2,12 @@ from src.core.constants import WEEKS_OF_DATA_3600, WEEKS_OF_DATA_86400
 
 class Config:
     NUM_SIMULATIONS = 1000
+    # root of the SeedSequences of training, evaluation and deployment, None draws fresh entropy (logged to reproduce a run)
+    SEED = None
     TIME_CONFIGS = {3600: (60, WEEKS_OF_DATA_3600), 86400: (300, WEEKS_OF_DATA_86400)}
     ASSETS = ['BTC', 'ETH', 'SOL', 'XAU']
     PARAMS_PATH = 'src/core/parameters.json'
     PERFORMANCE_PATH = 'src/core/performance.json'
+    PRICES_PATH = 'src/core/prices'
     RATE_LIMIT_CALLS = 29
     RATE_LIMIT_PERIOD = 10.1
\ No newline at end of file
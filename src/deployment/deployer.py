@@ -1,33 +1,164 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import json
+import multiprocessing as mp
+import random
+import sys
+import traceback
+import numpy as np
 from src.model.basemodel import BaseModel
 from src.model.mertonmodel import MertonModel
 from src.model.egarchmodel import EGARCHModel
+from src.deployment.response_cache import ResponseCache
+from src.deployment.simulation_pool import SimulationPool
 import bittensor as bt
+from synth.miner.price_feed import PriceFeed
 from synth.miner.price_simulation import get_asset_price
-from synth.validator.response_validation_v2 import validate_responses
-from typing import Callable, Any
+from synth.simulation_input import SimulationInput
+from synth.utils.helpers import convert_prices_to_time_format, timeout_from_start_time
+from synth.validator.response_validation_v2 import CORRECT, validate_responses
+from typing import Callable, Any, Optional
 from src.core.config import Config
 from src.training.utils import db_manager
 
+
+# self-check of the miner's own predictions: not done, on a few random paths, or on all the paths once the request's deadline passed
+SELF_CHECK_MODES = ("off", "sampled", "full")
+
+
+def generate_prediction(
+    model: Optional[BaseModel | MertonModel | EGARCHModel],
+    paths: Optional[np.ndarray],
+    current_price: float,
+    simulation_input: SimulationInput,
+    seed_sequence: Optional[np.random.SeedSequence] = None
+) -> tuple:
+    """
+    CPU bound part of a request, run in the process pool of the Deployer.
+
+    Args:
+        model: Model simulating the paths, None when they come from the simulation pool
+        paths: Paths normalized to a current price of 1 from the simulation pool, or None
+        current_price: Current price of the asset
+        simulation_input: The request
+        seed_sequence: Seeds the Generator of the model, spawned by the Deployer so that the workers draw independent streams
+
+    Returns:
+        The prediction in the synth format
+    """
+    if paths is None:
+        rng = np.random.default_rng(seed_sequence)
+        paths = model.simulate_paths(simulation_input.time_increment, simulation_input.time_length, rng)
+
+    # same as model.predict
+    return convert_prices_to_time_format(
+        current_price * paths,
+        str(simulation_input.start_time),
+        simulation_input.time_increment
+    )
+
+
+def check_prediction(prediction: tuple, simulation_input: SimulationInput, sample_size: Optional[int] = None) -> str:
+    """
+    Format validation of a prediction as the validators do it.
+
+    Args:
+        prediction: The prediction in the synth format
+        simulation_input: The request
+        sample_size: Number of random paths validated, all of them if None
+
+    Returns:
+        CORRECT or the error message
+    """
+    number_of_paths = len(prediction) - 2
+    if sample_size is not None and number_of_paths > sample_size:
+        if number_of_paths != simulation_input.num_simulations:
+            return f"Number of paths is incorrect: expected {simulation_input.num_simulations}, got {number_of_paths}"
+        sampled_paths = [prediction[2 + i] for i in random.sample(range(number_of_paths), sample_size)]
+        prediction = (prediction[0], prediction[1], *sampled_paths)
+        simulation_input = simulation_input.model_copy(update={"num_simulations": sample_size})
+
+    return validate_responses(
+        prediction,
+        simulation_input,
+        datetime.fromisoformat(simulation_input.start_time),
+        "0",
+    )
+
+
+def _warm_up() -> None:
+    """Run in each worker at start so that the first request doesn't pay for the imports."""
+
+
 class Deployer:
     """
     Production miner that responds to network requests using trained models.
     """
     
-    def __init__(self, models_filepath: str = None):
+    def __init__(self, models_filepath: str = None, use_simulation_pool: bool = True, max_workers: int = 2, max_pending: int = 8, deadline_margin: float = 1.0, response_ttl: float = 120.0, self_check: str = "sampled", self_check_paths: int = 10, seed: Optional[int] = Config.SEED):
         """
         Initialize the Production miner.
         
         Args:
             models_filepath: Path to models.json config file
+            use_simulation_pool: Serve the requests from paths simulated in the background, call start() to fill the pool
+            max_workers: Processes generating the predictions, off the axon event loop
+            max_pending: Predictions being generated or waiting for a worker, the requests above it are dropped
+            deadline_margin: Seconds before the start_time of a request after which its prediction isn't awaited anymore
+            response_ttl: Seconds the response to a simulation input is kept for the duplicate requests of other validators
+            self_check: One of SELF_CHECK_MODES, the format validation of the predictions, always done after they are returned
+            self_check_paths: Number of paths validated in the sampled self-check
+            seed: Root seed of the simulations, the simulation pool and each prediction get their own spawned SeedSequence
         """     
+        if self_check not in SELF_CHECK_MODES:
+            raise ValueError(f"Unknown self-check mode {self_check}, expected one of {SELF_CHECK_MODES}")
         self.models = db_manager.get_all_models()
         self.model_mapping = {
         "base": BaseModel,
         "merton": MertonModel,
         "egarch": EGARCHModel
         }
+        self.seed_sequence = np.random.SeedSequence(seed)
+        bt.logging.info(f"Simulating with seed {self.seed_sequence.entropy}")
+        self.price_feed = PriceFeed(assets=Config.ASSETS)
+        # spawn, the miner process runs threads (axon, price feed, simulation pool) that fork doesn't copy safely
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context("spawn"))
+        # the pool simulates in the workers too, its refreshes don't hold the GIL of the axon process
+        self.simulation_pool = SimulationPool(self.get_model, seed=self.seed_sequence.spawn(1)[0], executor=self.executor) if use_simulation_pool else None
+        self.max_pending = max_pending
+        self.deadline_margin = deadline_margin
+        self.response_cache = ResponseCache(ttl=response_ttl)
+        self.self_check = self_check
+        self.self_check_paths = self_check_paths
+        # running self-checks, referenced until they are done
+        self.self_checks: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the workers, the price feed and filling the simulation pool."""
+        for _ in range(self.max_workers):
+            self.executor.submit(_warm_up)
+        self.price_feed.start()
+        if self.simulation_pool is not None:
+            self.simulation_pool.start()
+
+    def stop(self) -> None:
+        self.price_feed.stop()
+        if self.simulation_pool is not None:
+            self.simulation_pool.stop()
+        self.executor.shutdown(cancel_futures=True)
+
+    async def get_current_price(self, asset: str) -> float | None:
+        """
+        Latest price of the price feed, fetched from Hermes in a thread when the feed has no recent price
+        (not started, or disconnected for longer than its max_age).
+        """
+        current_price = self.price_feed.get_price(asset)
+        if current_price is None:
+            bt.logging.warning(f"No recent price for {asset} in the price feed, fetching it")
+            current_price = await asyncio.to_thread(get_asset_price, asset)
+        return current_price
 
     def reload_models(self) -> None:
         """Reload models configuration from file."""
@@ -72,28 +203,86 @@ class Deployer:
             The synapse with simulation_output populated
         """
         simulation_input = synapse.simulation_input
+        key = self.response_cache.key(simulation_input)
+
+        task = self.response_cache.get(key)
+        if task is not None:
+            bt.logging.info(f"Sharing the prediction of {key}")
+        elif self.response_cache.pending >= self.max_pending:
+            bt.logging.warning(f"{self.response_cache.pending} predictions pending, dropping the request for {key}")
+            return synapse
+        else:
+            task = self.response_cache.create(key, lambda: self.generate(simulation_input))
+
+        # the validators stop collecting the responses at start_time
+        timeout = timeout_from_start_time(None, simulation_input.start_time) - self.deadline_margin
+        try:
+            # shielded, the other requests sharing the prediction may have a later deadline
+            prediction = await asyncio.wait_for(asyncio.shield(task), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            bt.logging.warning(f"Prediction for {key} not ready before the deadline")
+            return synapse
+        except Exception:
+            # logged once by the response cache
+            return synapse
+
+        synapse.simulation_output = prediction
+        
+        return synapse
+
+    async def generate(self, simulation_input: SimulationInput) -> tuple:
+        """Generate the prediction of a request in the process pool."""
         asset = simulation_input.asset
-        current_price = get_asset_price(asset)
         time_length = simulation_input.time_length
-        
-        model = self.get_model(asset, time_length)
-        
-        synapse.simulation_output = model.predict(
+        current_price = await self.get_current_price(asset)
+
+        paths = None
+        if self.simulation_pool is not None:
+            paths = self.simulation_pool.get(
+                asset,
+                simulation_input.time_increment,
+                time_length,
+                simulation_input.num_simulations
+            )
+        model = self.get_model(asset, time_length) if paths is None else None
+
+        loop = asyncio.get_running_loop()
+        prediction = await loop.run_in_executor(
+            self.executor,
+            generate_prediction,
+            model,
+            paths,
             current_price,
-            simulation_input.start_time,
-            simulation_input.time_increment,
-            time_length
-        )
-        
-        format_validation = validate_responses(
-            synapse.simulation_output,
             simulation_input,
-            datetime.fromisoformat(simulation_input.start_time),
-            "0",
+            self.seed_sequence.spawn(1)[0]
         )
-        bt.logging.info(f'Format check: {format_validation}')
-        
-        return synapse
+        # once per prediction, not per validator it is sent to
+        if self.self_check != "off":
+            task = asyncio.ensure_future(self.check(prediction, simulation_input))
+            self.self_checks.add(task)
+            task.add_done_callback(self.self_checks.discard)
+        return prediction
+
+    async def check(self, prediction: tuple, simulation_input: SimulationInput) -> None:
+        """Self-check of a prediction in the background, off the path of the response."""
+        try:
+            if self.self_check == "sampled":
+                # a few paths, cheap enough for a thread of the miner process
+                format_validation = await asyncio.to_thread(check_prediction, prediction, simulation_input, self.self_check_paths)
+            else:
+                # all the paths once the response was sent, the validators stop waiting at start_time
+                await asyncio.sleep(max(timeout_from_start_time(None, simulation_input.start_time), 0))
+                loop = asyncio.get_running_loop()
+                format_validation = await loop.run_in_executor(self.executor, check_prediction, prediction, simulation_input)
+        except Exception as e:
+            bt.logging.error(f"in Deployer.check (got an exception): {e}")
+            traceback.print_exc(file=sys.stderr)
+            return
+
+        if format_validation == CORRECT:
+            bt.logging.info(f'Format check: {format_validation}')
+        else:
+            bt.logging.error(f"Format check of {self.response_cache.key(simulation_input)} failed: {format_validation}")
 
     def create_miner_logic(self) -> Callable:
         """
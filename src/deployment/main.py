@@ -9,6 +9,7 @@ def main():
     bt.logging.info("Deploying miner...")
     
     deployer = Deployer()
+    deployer.start()
     miner = Miner(model_logic_fn=deployer.create_miner_logic())
     
     with miner:
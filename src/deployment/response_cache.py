@@ -0,0 +1,70 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+import bittensor as bt
+from synth.simulation_input import SimulationInput
+
+
+class ResponseCache:
+    """
+    Single-flight cache of the miner responses, keyed by the simulation input.
+
+    Several validators send the same SimulationInput within seconds of each other: the first
+    request starts the computation, the concurrent duplicates await the same task and the
+    duplicates arriving up to ttl seconds after it finished get its result directly.
+    """
+
+    def __init__(self, ttl: float = 120.0) -> None:
+        """
+        Args:
+            ttl: Seconds a response is kept after it was computed
+        """
+        self.ttl = ttl
+        # key -> (task, expiry time as a time.monotonic, inf while the task is running)
+        self._entries: dict[tuple, tuple[asyncio.Task, float]] = {}
+
+    @staticmethod
+    def key(simulation_input: SimulationInput) -> tuple:
+        return (
+            simulation_input.asset,
+            simulation_input.start_time,
+            simulation_input.time_increment,
+            simulation_input.time_length,
+            simulation_input.num_simulations
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of responses being computed."""
+        return sum(not task.done() for task, _ in self._entries.values())
+
+    def get(self, key: tuple) -> asyncio.Task | None:
+        """Return the task computing or having computed the response of the key, None if there is none."""
+        self.purge()
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def create(self, key: tuple, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start computing the response of the key, the duplicates get the task until it expires."""
+        task = asyncio.ensure_future(compute())
+        self._entries[key] = (task, float("inf"))
+        task.add_done_callback(lambda task: self._finish(key, task))
+        return task
+
+    def purge(self) -> None:
+        """Drop the expired responses."""
+        now = time.monotonic()
+        for key in [key for key, (_, expiry) in self._entries.items() if expiry <= now]:
+            del self._entries[key]
+
+    def _finish(self, key: tuple, task: asyncio.Task) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not task:
+            return
+        if task.cancelled() or task.exception() is not None:
+            # not cached, the next duplicate computes it again
+            del self._entries[key]
+            if not task.cancelled():
+                bt.logging.error(f"in ResponseCache (got an exception): {task.exception()}")
+            return
+        self._entries[key] = (task, time.monotonic() + self.ttl)
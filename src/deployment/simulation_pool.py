@@ -0,0 +1,102 @@
+from concurrent.futures import Executor
+import threading
+import time
+from typing import Callable, Optional
+import numpy as np
+import bittensor as bt
+from src.core.config import Config
+
+
+def simulate_model_paths(model, time_increment: int, time_length: int, seed_sequence: np.random.SeedSequence) -> np.ndarray:
+    """Simulate the normalized paths of a model, picklable to run in a worker process."""
+    return model.simulate_paths(time_increment, time_length, np.random.default_rng(seed_sequence))
+
+
+class SimulationPool:
+    """
+    Background generator of price paths normalized to a current price of 1, kept per
+    (asset, time_increment, time_length) of the prompts the validators send.
+
+    The models' returns don't depend on the current price, so at request time the pooled paths
+    only have to be scaled by it and formatted instead of running the Monte Carlo simulation.
+    """
+
+    def __init__(self, get_model: Callable, assets: list[str] = Config.ASSETS, time_configs: dict = Config.TIME_CONFIGS, refresh_seconds: float = 30.0, seed: Optional[int | np.random.SeedSequence] = None, executor: Optional[Executor] = None) -> None:
+        """
+        Args:
+            get_model: Returns the model of an (asset, time_length), e.g. Deployer.get_model
+            assets: Assets to keep paths for
+            time_configs: Time increment of each time length, as Config.TIME_CONFIGS
+            refresh_seconds: Seconds between two refreshes of all the paths
+            seed: Seed or SeedSequence of the simulations, each refresh gets its own spawned child
+            executor: Process pool running the simulations, e.g. the Deployer's, so that they don't hold
+                the GIL of the miner process; in the refreshing thread if None
+        """
+        self.get_model = get_model
+        self.keys = [
+            (asset, time_increment, time_length)
+            for asset in assets
+            for time_length, (time_increment, _) in time_configs.items()
+        ]
+        self.refresh_seconds = refresh_seconds
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.executor = executor
+        self._paths: dict[tuple[str, int, int], np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start refreshing the paths in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="simulation-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self, asset: str, time_increment: int, time_length: int) -> None:
+        """Simulate new paths for one key, they replace the previous ones atomically."""
+        model = self.get_model(asset, time_length)
+        seed_sequence = self.seed_sequence.spawn(1)[0]
+        if self.executor is None:
+            paths = simulate_model_paths(model, time_increment, time_length, seed_sequence)
+        else:
+            # the refreshing thread only waits for the worker, it doesn't hold the GIL meanwhile
+            paths = self.executor.submit(simulate_model_paths, model, time_increment, time_length, seed_sequence).result()
+        with self._lock:
+            self._paths[(asset, time_increment, time_length)] = paths
+
+    def refresh_all(self) -> None:
+        for key in self.keys:
+            if self._stop_event.is_set():
+                return
+            try:
+                self.refresh(*key)
+            except Exception as e:
+                bt.logging.error(f"Simulation pool failed to refresh {key}: {e}")
+
+    def get(self, asset: str, time_increment: int, time_length: int, num_simulations: int) -> Optional[np.ndarray]:
+        """
+        Return the latest normalized paths of the key, None if there are none yet or fewer than num_simulations.
+
+        Returns:
+            np.ndarray: (num_simulations, time_length / time_increment + 1) paths starting at 1
+        """
+        with self._lock:
+            paths = self._paths.get((asset, time_increment, time_length))
+        if paths is None or paths.shape[0] < num_simulations:
+            return None
+        return paths[:num_simulations]
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            start_time = time.perf_counter()
+            self.refresh_all()
+            bt.logging.debug(f"Simulation pool refreshed {len(self.keys)} keys in {time.perf_counter() - start_time:.2f}s")
+            self._stop_event.wait(self.refresh_seconds)
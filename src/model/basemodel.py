@@ -1,11 +1,11 @@
 from datetime import datetime
 import numpy as np
-import scipy.stats as stats
 from synth.utils.helpers import convert_prices_to_time_format, adjust_predictions
 import bittensor as bt
 import matplotlib.pyplot as plt
 import seaborn as sns
 from src.core.config import Config
+from src.model.distributions import standardized_innovations
 
 class BaseModel():
     NAME = "base"
@@ -25,8 +25,25 @@ class BaseModel():
         current_price: float,
         current_time: datetime,
         time_increment: int,
-        time_length: int
+        time_length: int,
+        rng: np.random.Generator | None = None
     ) -> np.ndarray:
+        price_paths = current_price * self.simulate_paths(time_increment, time_length, rng)
+
+        # Convert numpy array to list format to get the format synth evaluation functions want
+        predictions = convert_prices_to_time_format(
+        price_paths, str(current_time), time_increment
+    )
+        return predictions
+
+    def simulate_paths(self, time_increment: int, time_length: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        """
+        Simulate the price paths normalized to a current price of 1.
+
+        Args:
+            rng: Generator drawing all the random numbers, a freshly seeded one if None
+        """
+        rng = np.random.default_rng() if rng is None else rng
         num_simulations = Config.NUM_SIMULATIONS
         one_hour = 3600
         dt = time_increment / one_hour
@@ -34,40 +51,12 @@ class BaseModel():
         sigma = self.volatility * np.sqrt(1/24)  # Convert daily volatility to hourly volatility
         num_steps = int(time_length / time_increment)
         std_dev = sigma * np.sqrt(dt)
-        scale = std_dev # Default scale, overwritten if necessary
+        scale = std_dev
         size = (num_simulations, num_steps)
-        
-        if self.distribution == 'normal':
-            simulated_values = np.random.normal(0, 1, size=size)
+        simulated_values = standardized_innovations(self.distribution, self.dist_parameters[1:], size, rng)
 
-        elif self.distribution == 't':
-            nu = self.dist_parameters[1]
-            scale = std_dev * np.sqrt((nu - 2) / nu)
-            simulated_values = np.random.standard_t(nu, size=size)
-        
-        elif self.distribution == 'genhyperbolic':
-            p = self.dist_parameters[1]
-            a = self.dist_parameters[2]
-            b = self.dist_parameters[3]
-            r = stats.genhyperbolic.rvs(p, a, b, size=size)
-            m, v = stats.genhyperbolic.stats(p, a, b, moments="mv")
-            m = float(m)
-            v = float(v)
-            if not np.isfinite(m) or not np.isfinite(v) or v <= 0:
-                raise ValueError("Invalid GH moments")
-
-            # Standardize and scale to desired std_dev
-            simulated_values = (r - m) / np.sqrt(v)
-            
         price_change_pcts = simulated_values * scale
         cumulative_returns = np.cumprod(1 + price_change_pcts, axis=1)
-        cumulative_returns = np.insert(cumulative_returns, 0, 1.0, axis=1)
-        price_paths = current_price * cumulative_returns
-
-        # Convert numpy array to list format to get the format synth evaluation functions want
-        predictions = convert_prices_to_time_format(
-        price_paths.tolist(), str(current_time), time_increment
-    )
-        return predictions
+        return np.insert(cumulative_returns, 0, 1.0, axis=1)
 
     
\ No newline at end of file
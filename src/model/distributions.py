@@ -0,0 +1,142 @@
+from functools import lru_cache
+import numpy as np
+import scipy.stats as stats
+from scipy import integrate, special
+
+# number of parameter sets whose precomputation is kept, the models of all the assets and time lengths fit
+CACHE_SIZE = 128
+# points of the quantile table of the GIG mixing variable, regular in logit(u) from u = 1e-12 to 1 - 1e-12
+GIG_TABLE_POINTS = 8193
+GIG_TABLE_LOGITS = np.linspace(special.logit(1e-12), special.logit(1 - 1e-12), GIG_TABLE_POINTS)
+# the GIG table covers log W where its density is above exp(-GIG_TABLE_LOG_RANGE) times the mode density
+GIG_TABLE_LOG_RANGE = 40.0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def genhyperbolic_moments(p: float, a: float, b: float) -> tuple[float, float]:
+    """
+    Mean and variance of the generalized hyperbolic distribution.
+
+    Returns:
+        tuple[float, float]: The mean and the variance.
+    """
+    m, v = stats.genhyperbolic.stats(p, a, b, moments="mv")
+    m = float(m)
+    v = float(v)
+    if not np.isfinite(m) or not np.isfinite(v) or v <= 0:
+        raise ValueError("Invalid GH moments")
+    return m, v
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def genhyperbolic_mean_abs(p: float, a: float, b: float) -> float:
+    """
+    E|X| of the standardized generalized hyperbolic distribution, integrated numerically.
+
+    Returns:
+        float: The mean absolute value.
+    """
+    m, v = genhyperbolic_moments(p, a, b)
+
+    def integrand(x):
+        return abs(x - m) * stats.genhyperbolic.pdf(x, p, a, b)
+
+    lower, _ = integrate.quad(integrand, -np.inf, m)
+    upper, _ = integrate.quad(integrand, m, np.inf)
+    return (lower + upper) / np.sqrt(v)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _gig_log_quantile_table(p: float, b: float) -> np.ndarray:
+    """
+    Quantiles of log W, W following the generalized inverse Gaussian geninvgauss(p, b), at the
+    probabilities of a grid regular in logit(u) so that the tails are as finely resolved as the center.
+
+    log W has the log-concave density exp(p * y - b * cosh(y)) up to a constant, its CDF is integrated
+    on a grid spanning it until the density drops to exp(-GIG_TABLE_LOG_RANGE) times its mode.
+
+    Returns:
+        np.ndarray: The quantiles at expit(GIG_TABLE_LOGITS).
+    """
+    def log_density(y):
+        return p * y - b * np.cosh(y)
+
+    mode = np.arcsinh(p / b)
+    cutoff = log_density(mode) - GIG_TABLE_LOG_RANGE
+    lower = upper = mode
+    while log_density(lower) > cutoff:
+        lower -= 1.0
+    while log_density(upper) > cutoff:
+        upper += 1.0
+
+    grid = np.linspace(lower, upper, 8 * GIG_TABLE_POINTS)
+    density = np.exp(log_density(grid) - log_density(mode))
+    cdf = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2)))
+    cdf /= cdf[-1]
+    return np.interp(special.expit(GIG_TABLE_LOGITS), cdf, grid)
+
+
+def _gig_log_quantiles(table: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Interpolate the quantile table at the probabilities u, indexed directly on its logit grid."""
+    logits = np.log(u) - np.log1p(-u)
+    position = (logits - GIG_TABLE_LOGITS[0]) / (GIG_TABLE_LOGITS[1] - GIG_TABLE_LOGITS[0])
+    np.clip(position, 0, len(table) - 1, out=position)
+    index = np.minimum(position.astype(np.intp), len(table) - 2)
+    position -= index
+    return table[index] + position * (table[index + 1] - table[index])
+
+
+def genhyperbolic_rvs(p: float, a: float, b: float, size, random_state=None) -> np.ndarray:
+    """
+    Sample the generalized hyperbolic distribution scipy.stats.genhyperbolic(p, a, b).
+
+    Same normal variance-mean mixture as scipy, X = b * W + sqrt(W) * Z with Z standard normal,
+    but W is drawn from the cached quantile table of its logarithm instead of rejection sampling.
+
+    Args:
+        random_state: np.random.Generator or RandomState, the global numpy random state if None.
+
+    Returns:
+        np.ndarray: The samples.
+    """
+    random_state = np.random if random_state is None else random_state
+    if not abs(b) < a:
+        raise ValueError("Invalid GH parameters, |b| < a is required")
+
+    # W = geninvgauss(p, sqrt(a**2 - b**2)) / sqrt(a**2 - b**2), see scipy's genhyperbolic
+    gig_b = np.sqrt(a**2 - b**2)
+    table = _gig_log_quantile_table(p, float(gig_b))
+    w = np.exp(_gig_log_quantiles(table, random_state.uniform(size=size))) / gig_b
+    return b * w + np.sqrt(w) * random_state.normal(size=size)
+
+
+def standardized_innovations(distribution: str, shape_parameters, size, random_state=None) -> np.ndarray:
+    """
+    Sample innovations of mean 0 and variance 1.
+
+    Args:
+        distribution: normal, t or genhyperbolic.
+        shape_parameters: () for normal, (nu,) for t, (p, a, b) for genhyperbolic.
+        size: Shape of the samples.
+        random_state: np.random.Generator or RandomState, the global numpy random state if None.
+
+    Returns:
+        np.ndarray: The innovations.
+    """
+    random_state = np.random if random_state is None else random_state
+
+    if distribution == 'normal':
+        return random_state.normal(0, 1, size=size)
+
+    elif distribution == 't':
+        nu = shape_parameters[0]
+        return random_state.standard_t(nu, size=size) * np.sqrt((nu - 2) / nu)
+
+    elif distribution == 'genhyperbolic':
+        p, a, b = (float(parameter) for parameter in shape_parameters[:3])
+        m, v = genhyperbolic_moments(p, a, b)
+        r = genhyperbolic_rvs(p, a, b, size, random_state)
+        # Standardize and scale to desired std_dev
+        return (r - m) / np.sqrt(v)
+
+    raise ValueError(f"Unknown distribution {distribution}")
@@ -1,14 +1,40 @@
 from datetime import datetime
 import numpy as np
-import scipy.stats as stats
+from numba import njit
 from synth.utils.helpers import convert_prices_to_time_format, adjust_predictions
 import bittensor as bt
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 import seaborn as sns
 from src.core.config import Config
+from src.model.distributions import genhyperbolic_mean_abs, standardized_innovations
 from scipy.special import gamma
 
+
+@njit(cache=True, nogil=True)
+def _egarch_returns(innovations, initial_std_dev, omega, alpha, beta, gamma, constant):
+    """
+    EGARCH recursion over the (num_simulations, num_steps) standardized innovations.
+
+    Returns:
+        np.ndarray: The returns, innovations scaled by the volatility of each step.
+    """
+    num_simulations, num_steps = innovations.shape
+    returns = np.empty_like(innovations)
+    initial_log_variance = np.log(initial_std_dev**2)
+    for i in range(num_simulations):
+        std_dev = initial_std_dev
+        log_variance = initial_log_variance
+        for t in range(num_steps):
+            # z = returns / previous volatility is the innovation itself
+            z = innovations[i, t]
+            returns[i, t] = z * std_dev
+            # update volatility for next step, same as EGARCHModel._EGARCH
+            log_variance = omega + beta * log_variance + alpha * (np.abs(z) - constant) + gamma * z
+            std_dev = np.exp(0.5 * log_variance)
+    return returns
+
+
 class EGARCHModel():
     NAME = "egarch"
     
@@ -25,7 +51,21 @@ class EGARCHModel():
             self.parameters_bounds += [(-2, 1), (0.001, 3), (-1, 1)]
         self.constant = None # calculate in EGARCH function if None (so it is only done once)
 
-    def predict(self, current_price: float, current_time: datetime, time_increment: int, time_length: int) -> np.ndarray:
+    def predict(self, current_price: float, current_time: datetime, time_increment: int, time_length: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        price_paths = current_price * self.simulate_paths(time_increment, time_length, rng)
+        predictions = convert_prices_to_time_format(
+            price_paths, str(current_time), time_increment
+        )
+        return predictions
+
+    def simulate_paths(self, time_increment: int, time_length: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        """
+        Simulate the price paths normalized to a current price of 1.
+
+        Args:
+            rng: Generator drawing all the random numbers, a freshly seeded one if None
+        """
+        rng = np.random.default_rng() if rng is None else rng
         num_simulations = Config.NUM_SIMULATIONS
         initial_volatility = self.dist_parameters[0]  
         omega = self.dist_parameters[1]
@@ -36,28 +76,21 @@ class EGARCHModel():
         one_hour = 3600
         dt = time_increment / one_hour
         num_steps = int(time_length / time_increment)
-        std_dev = np.full((num_simulations, 1), initial_volatility * np.sqrt(dt))
-        
-        price_change_pcts = np.zeros((num_simulations, num_steps))
+        std_dev = initial_volatility * np.sqrt(dt)
 
         if self.constant is None:
             self._calculate_constant()
 
-        for timestep in range(num_steps):
-            simulated_values = self._simulate_values((num_simulations, 1))
-            returns = simulated_values * std_dev
-            price_change_pcts[:, timestep] = returns.flatten()
-            # update volatility for next step
-            std_dev = self._EGARCH(std_dev, returns, omega, alpha, beta, gamma)
-            
+        # draw the innovations of all the steps at once, then run the recursion compiled
+        simulated_values = self._simulate_values((num_simulations, num_steps), rng)
+        price_change_pcts = _egarch_returns(
+            np.ascontiguousarray(simulated_values, dtype=np.float64),
+            float(std_dev), float(omega), float(alpha), float(beta), float(gamma), float(self.constant)
+        )
+
         cumulative_returns = np.cumprod(1 + price_change_pcts, axis=1)
-        cumulative_returns = np.insert(cumulative_returns, 0, 1.0, axis=1)
         # insert current price at the beginning of each simulation (synth wants this)
-        price_paths = current_price * cumulative_returns
-        predictions = convert_prices_to_time_format(
-            price_paths.tolist(), str(current_time), time_increment
-        )
-        return predictions
+        return np.insert(cumulative_returns, 0, 1.0, axis=1)
 
     
     def _EGARCH(self, previous_volatility: float, previous_return: float, omega: float, alpha: float, beta: float, gamma: float) -> float:
@@ -71,28 +104,8 @@ class EGARCHModel():
         return volatility
 
     
-    def _simulate_values(self, size):
-        if self.distribution == 'normal':
-            simulated_values = np.random.normal(0, 1, size=size)
-
-        elif self.distribution == 't':
-            nu = self.dist_parameters[5]
-            simulated_values = np.random.standard_t(nu, size=size) * np.sqrt((nu - 2) / nu)
-        
-        elif self.distribution == 'genhyperbolic':
-            p = self.dist_parameters[5]
-            a = self.dist_parameters[6]
-            b = self.dist_parameters[7]
-            r = stats.genhyperbolic.rvs(p, a, b, size=size)
-            m, v = stats.genhyperbolic.stats(p, a, b, moments="mv")
-            m = float(m)
-            v = float(v)
-            if not np.isfinite(m) or not np.isfinite(v) or v <= 0:
-                raise ValueError("Invalid GH moments")
-
-            # Standardize and scale to desired std_dev
-            simulated_values = (r - m) / np.sqrt(v)
-        return simulated_values
+    def _simulate_values(self, size, rng: np.random.Generator | None = None):
+        return standardized_innovations(self.distribution, self.dist_parameters[5:], size, rng)
     
 
     def _calculate_constant(self) -> float:
@@ -102,6 +115,6 @@ class EGARCHModel():
             nu = self.dist_parameters[5]
             self.constant = (2 * np.sqrt(nu - 2) * gamma((nu + 1) / 2))/(nu - 1) * np.sqrt(np.pi) * gamma(nu / 2)
         elif self.distribution == 'genhyperbolic':
-            self.constant = np.mean(np.abs((self._simulate_values(10000))))
-            print(self.constant)
+            p, a, b = self.dist_parameters[5:8]
+            self.constant = genhyperbolic_mean_abs(float(p), float(a), float(b))
       
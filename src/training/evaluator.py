@@ -4,18 +4,20 @@ import polars as pl
 from src.model.basemodel import BaseModel
 from src.model.mertonmodel import MertonModel
 from src.model.egarchmodel import EGARCHModel
-from datetime import datetime
+from datetime import datetime, timedelta
 from synth.utils.helpers import adjust_predictions
 from synth.validator import prompt_config
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import time
 from src.training.price_data_provider import PriceDataProvider
+from src.training.price_store import PriceStore
 from synth.validator.crps_calculation import calculate_crps_for_miner
 
 
 _price_data_provider = PriceDataProvider()
+_price_store = PriceStore()
 
 
 class Evaluator:
@@ -31,8 +33,14 @@ class Evaluator:
         start_time: str,
         end_time: str,
         simulations_per_prompt: int,
-        max_workers: int = None
+        max_workers: int = None,
+        seed: Optional[int | np.random.SeedSequence] = None
     ):
+        """
+        Args:
+            seed: Seed or SeedSequence of the simulations, each timestamp gets its own spawned child so that the
+                parallel workers draw independent streams and a run is reproduced exactly by its seed
+        """
         self.model = model
         self.asset = asset
         self.time_length = time_length
@@ -40,6 +48,7 @@ class Evaluator:
         self.end_time = end_time
         self.simulations_per_prompt = simulations_per_prompt
         self.max_workers = max_workers if max_workers else min(os.cpu_count(), 8)
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
         
         # Results storage
         self.results_table: pl.DataFrame = None
@@ -54,11 +63,12 @@ class Evaluator:
         time_length: int,
         simulations_per_prompt: int,
         lock=None,
-        request_history=None
+        request_history=None,
+        seed_sequence: Optional[np.random.SeedSequence] = None
     ) -> Dict[str, Any]:
         """
         Process a single timestamp: fetch real price data, run simulations, and calculate scores.
-        This function is designed to be called in parallel.
+        This function is designed to be called in parallel, seed_sequence seeds the Generator of its simulations.
         """
         # only two time lengths & increments exist, 3600 together with 60 and 86400 with 300
         if time_length == 3600:
@@ -73,15 +83,19 @@ class Evaluator:
             else prompt_config.LOW_FREQUENCY.scoring_intervals
         )
         
-        # data is only available for time_length 3600 and 86400, so is fetched here
-        real_price = _price_data_provider.fetch_data(asset, timestamp, time_length, time_increment, lock, request_history)
+        # data is only available for time_length 3600 and 86400, so is sliced here from the synced prices,
+        # or fetched if the window isn't synced (see python -m src.training.price_store)
+        real_price = _price_store.window(asset, timestamp, time_length, time_increment)
+        if real_price is None:
+            real_price = _price_data_provider.fetch_data(asset, timestamp, time_length, time_increment, lock, request_history)
         current_price = real_price[0]
         
+        rng = np.random.default_rng(seed_sequence)
         scores = []
         
         # possibility of having several simulations per day to get average score
         for _ in range(simulations_per_prompt):
-            simulation_runs = model.predict(current_price, timestamp, time_increment, time_length)
+            simulation_runs = model.predict(current_price, timestamp, time_increment, time_length, rng)
             
             # changing format of simulation runs for synth function calculate_crps_for_miner
             simulation_runs = adjust_predictions(list(simulation_runs))
@@ -121,11 +135,21 @@ class Evaluator:
         """
         timestamps = self._generate_timestamps()
         results_data = []
+        # one child per timestamp, whichever worker processes it
+        seed_sequences = self.seed_sequence.spawn(len(timestamps))
         
-        # needed for rate limiting
-        manager = multiprocessing.Manager()
-        shared_lock = manager.Lock()
-        shared_history = manager.list()
+        # loaded before the workers are forked so that they share it
+        _price_store.load(self.asset)
+        offline = _price_store.covers(
+            self.asset, timestamps[0], timestamps[-1] + timedelta(seconds=self.time_length)
+        )
+
+        # needed for rate limiting, only when prices are fetched
+        shared_lock = shared_history = None
+        if not offline:
+            manager = multiprocessing.Manager()
+            shared_lock = manager.Lock()
+            shared_history = manager.list()
 
         with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
             futures = [
@@ -137,9 +161,10 @@ class Evaluator:
                     self.time_length,
                     self.simulations_per_prompt,
                     shared_lock,
-                    shared_history
+                    shared_history,
+                    seed_sequence
                 )
-                for ts in timestamps
+                for ts, seed_sequence in zip(timestamps, seed_sequences)
             ]
             
             try:
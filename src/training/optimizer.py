@@ -2,7 +2,9 @@ from src.training.evaluator import Evaluator
 from src.model.basemodel import BaseModel
 from src.model.mertonmodel import MertonModel
 from src.model.egarchmodel import EGARCHModel
+import numpy as np
 import optuna
+from typing import Optional
 from src.core.config import Config
 from src.core.constants import SIMULATIONS_PER_PROMPT_TRAINING, NUM_TRIALS
 
@@ -17,7 +19,8 @@ class Optimizer:
         asset: str,
         time_length: int,
         start_time: str,
-        end_time: str
+        end_time: str,
+        seed: Optional[int | np.random.SeedSequence] = None
     ):
         self.model = model
         self.asset = asset
@@ -26,6 +29,8 @@ class Optimizer:
         self.end_time = end_time
         self.simulations_per_prompt = SIMULATIONS_PER_PROMPT_TRAINING
         self.n_trials = NUM_TRIALS
+        # seeds the Optuna sampler and spawns the SeedSequence of each trial's Evaluator
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
         
         # Results storage
         self.study: optuna.Study = None
@@ -75,7 +80,8 @@ class Optimizer:
             time_length=self.time_length,
             start_time=self.start_time,
             end_time=self.end_time,
-            simulations_per_prompt=self.simulations_per_prompt
+            simulations_per_prompt=self.simulations_per_prompt,
+            seed=self.seed_sequence.spawn(1)[0]
         )
         score, _, _ = evaluator.run()
         
@@ -83,7 +89,8 @@ class Optimizer:
 
     def optimize(self) -> list:
         """ Run the Optuna optimization and return the best parameters. """
-        self.study = optuna.create_study(direction="minimize")
+        sampler = optuna.samplers.TPESampler(seed=int(self.seed_sequence.generate_state(1)[0]))
+        self.study = optuna.create_study(direction="minimize", sampler=sampler)
         
         self._set_initial_parameters()
         
@@ -95,6 +95,35 @@ class PriceDataProvider:
 
         return transformed_data
         
+    @retry(
+    stop=stop_after_attempt(8), 
+    wait=wait_random_exponential(multiplier=2, max=30), 
+    reraise=True,
+    before_sleep=before_log(logger, logging.WARNING),
+    )
+    def fetch_candles(self, asset: str, start_time_int: int, end_time_int: int) -> dict:
+        """
+        Fetch the raw 1-minute candles of a time range, used to sync the PriceStore.
+
+        Args:
+            asset: Asset symbol (BTC, ETH, SOL, XAU) from config
+            start_time_int: Start unix time
+            end_time_int: End unix time, included
+        Returns:
+            The TradingView history response, with the candle times in "t" and close prices in "c"
+        """
+        params = {
+            "symbol": self._get_token_mapping(str(asset)),
+            "resolution": 1,
+            "from": start_time_int,
+            "to": end_time_int,
+        }
+
+        response = requests.get(self.BASE_URL, params=params)
+        response.raise_for_status()
+
+        return response.json()
+
     @staticmethod
     def _transform_data(
         data, start_time_int: int, time_increment: int, time_length: int
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, date, timedelta
+from datetime import time as dt_time
+import numpy as np
+import polars as pl
+from src.core.config import Config
+from src.training.price_data_provider import PriceDataProvider
+from synth.utils.helpers import from_iso_to_unix_time
+
+
+class PriceStore:
+    """
+    Local store of the 1-minute close prices of each asset, one Parquet file per asset with
+    the candle times "t" (unix seconds) and close prices "c", and a JSON file with the synced
+    time range (candles can be missing, so it isn't the range of the candles).
+
+    sync downloads the missing candles from Pyth once, then the Evaluator slices its windows
+    from the prices loaded in memory instead of requesting them for every timestamp of every trial.
+    """
+
+    # seconds of candles per Pyth request
+    CHUNK_SECONDS = 86400
+
+    def __init__(self, path: str = Config.PRICES_PATH) -> None:
+        """
+        Args:
+            path: Directory of the Parquet files
+        """
+        self.path = path
+        # asset -> (sorted candle times, close prices), loaded once per process
+        self._candles: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        # asset -> (start, end) unix times of the synced range
+        self._synced: dict[str, tuple[int, int] | None] = {}
+
+    def _file(self, asset: str) -> str:
+        return os.path.join(self.path, f"{asset}.parquet")
+
+    def _range_file(self, asset: str) -> str:
+        return os.path.join(self.path, f"{asset}.json")
+
+    def load(self, asset: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return the candle times and close prices of the asset, empty arrays if it was never synced."""
+        if asset not in self._candles:
+            if os.path.exists(self._file(asset)) and os.path.exists(self._range_file(asset)):
+                df = pl.read_parquet(self._file(asset))
+                with open(self._range_file(asset), 'r') as f:
+                    synced = json.load(f)
+                self._candles[asset] = (df["t"].to_numpy(), df["c"].to_numpy())
+                self._synced[asset] = (synced["start"], synced["end"])
+            else:
+                self._candles[asset] = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+                self._synced[asset] = None
+        return self._candles[asset]
+
+    def covers(self, asset: str, start_time: datetime, end_time: datetime) -> bool:
+        """Whether the synced range of the asset includes [start_time, end_time]."""
+        self.load(asset)
+        synced = self._synced[asset]
+        if synced is None:
+            return False
+        return synced[0] <= from_iso_to_unix_time(start_time.isoformat()) and from_iso_to_unix_time(end_time.isoformat()) <= synced[1]
+
+    def window(self, asset: str, start_time: datetime, time_length: int, time_increment: int) -> list | None:
+        """
+        Prices of a window in the format of PriceDataProvider.fetch_data, NaN where a candle is missing.
+
+        Returns:
+            List of prices at each time increment, None if the window isn't synced
+        """
+        end_time = start_time + timedelta(seconds=time_length)
+        if not self.covers(asset, start_time, end_time):
+            return None
+
+        t, c = self.load(asset)
+        start_time_int = from_iso_to_unix_time(start_time.isoformat())
+        timestamps = np.arange(start_time_int, start_time_int + time_length + time_increment, time_increment)
+        if len(t) == 0:
+            return [np.nan] * len(timestamps)
+        index = np.minimum(np.searchsorted(t, timestamps), len(t) - 1)
+        prices = np.where(t[index] == timestamps, c[index], np.nan)
+        return prices.tolist()
+
+    def sync(self, asset: str, start_time: datetime, end_time: datetime, provider: PriceDataProvider = None) -> int:
+        """
+        Download the candles of [start_time, end_time] not in the store yet and save them.
+
+        Only the parts before and after the synced range are requested, so syncing again
+        regularly only fetches the new candles. end_time must be far enough in the past for
+        Pyth to have published its candles, the synced range is never requested again.
+
+        Returns:
+            Number of candles added
+        """
+        provider = provider if provider is not None else PriceDataProvider()
+        t, c = self.load(asset)
+        start_time_int = from_iso_to_unix_time(start_time.isoformat())
+        end_time_int = from_iso_to_unix_time(end_time.isoformat())
+
+        synced = self._synced[asset]
+        if synced is None:
+            ranges = [(start_time_int, end_time_int)]
+            synced = (start_time_int, end_time_int)
+        else:
+            ranges = [(start_time_int, synced[0] - 60), (synced[1] + 60, end_time_int)]
+            synced = (min(start_time_int, synced[0]), max(end_time_int, synced[1]))
+
+        new_t, new_c = [], []
+        for range_start, range_end in ranges:
+            for chunk_start in range(range_start, range_end + 1, self.CHUNK_SECONDS):
+                chunk_end = min(chunk_start + self.CHUNK_SECONDS - 60, range_end)
+                data = provider.fetch_candles(asset, chunk_start, chunk_end)
+                new_t.extend(data.get("t", []))
+                new_c.extend(data.get("c", []))
+                # same rate limit as the Evaluator's requests
+                time.sleep(Config.RATE_LIMIT_PERIOD / Config.RATE_LIMIT_CALLS)
+
+        df = pl.DataFrame(
+            {
+                "t": np.concatenate([t, np.asarray(new_t, dtype=np.int64)]),
+                "c": np.concatenate([c, np.asarray(new_c, dtype=np.float64)]),
+            }
+        ).unique(subset="t", keep="last").sort("t")
+        added = df.height - len(t)
+
+        os.makedirs(self.path, exist_ok=True)
+        # written next to the files then renamed, a reader never sees a partial file
+        df.write_parquet(self._file(asset) + ".tmp")
+        with open(self._range_file(asset) + ".tmp", 'w') as f:
+            json.dump({"start": synced[0], "end": synced[1]}, f)
+        os.replace(self._file(asset) + ".tmp", self._file(asset))
+        os.replace(self._range_file(asset) + ".tmp", self._range_file(asset))
+        self._candles[asset] = (df["t"].to_numpy(), df["c"].to_numpy())
+        self._synced[asset] = synced
+
+        return added
+
+
+def main():
+    """Sync the prices of the assets for the training periods of Config.TIME_CONFIGS, up to today midnight as the Trainer."""
+    parser = argparse.ArgumentParser(description="Download the 1-minute prices used by the training")
+    parser.add_argument("--assets", nargs="+", default=Config.ASSETS, help="Assets to sync")
+    parser.add_argument(
+        "--weeks",
+        type=int,
+        default=max(weeks for _, weeks in Config.TIME_CONFIGS.values()),
+        help="Weeks of prices before today midnight, as the Trainer uses",
+    )
+    args = parser.parse_args()
+
+    # the Trainer's end_time, its candles are all published
+    end_time = datetime.combine(date.today(), dt_time())
+    start_time = end_time - timedelta(weeks=args.weeks)
+
+    store = PriceStore()
+    for asset in args.assets:
+        added = store.sync(asset, start_time, end_time)
+        t, _ = store.load(asset)
+        print(f"{asset}: {added} candles added, {len(t)} candles stored")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import json
+import numpy as np
+from typing import Optional
 from src.training.optimizer import Optimizer
 from src.model.basemodel import BaseModel
 from src.model.mertonmodel import MertonModel
@@ -11,13 +13,15 @@ from src.training.utils import db_manager
 class Trainer:
     def __init__(
         self,
-        model: BaseModel | MertonModel | EGARCHModel
+        model: BaseModel | MertonModel | EGARCHModel,
+        seed: Optional[int] = Config.SEED
     ):
         """
         Initialize the Trainer.
         
         Args:
             model: The model to optimize
+            seed: Root seed of the training, each asset and time length optimizes with its own spawned SeedSequence
             params_filepath: Path to parameters JSON file
             assets: List of assets to optimize (default: BTC, ETH, SOL, XAU)
             time_configs: 3600: (60, WEEKS_OF_DATA_3600), 86400: (300, WEEKS_OF_DATA_86400) 
@@ -27,6 +31,7 @@ class Trainer:
         self.assets = Config.ASSETS
         self.time_configs = Config.TIME_CONFIGS
         self.results: dict = {}
+        self.seed_sequence = np.random.SeedSequence(seed)
 
 
     def _calculate_step(self, asset: str, time_length: int) -> str:
@@ -51,6 +56,8 @@ class Trainer:
         """
         today_midnight = datetime.combine(date.today(), time())
         end_time = today_midnight.isoformat()
+        # Config.SEED = this entropy reproduces the run
+        print(f"Training with seed {self.seed_sequence.entropy}")
         
         for asset in self.assets:
             for time_length, (time_increment, weeks) in self.time_configs.items():
@@ -61,7 +68,8 @@ class Trainer:
                     asset=asset,
                     time_length=time_length,
                     start_time=start_time,
-                    end_time=end_time
+                    end_time=end_time,
+                    seed=self.seed_sequence.spawn(1)[0]
                 )
                 best_params = optimizer.optimize()
                 
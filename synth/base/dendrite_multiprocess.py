@@ -1,3 +1,4 @@
+import json
 import sys
 import threading
 import logging.handlers
@@ -5,7 +6,7 @@ import time
 from typing import Union
 import asyncio
 import concurrent.futures
-from itertools import repeat
+from datetime import datetime
 
 
 import bittensor as bt
@@ -17,6 +18,7 @@ import uvloop
 from synth.base.dendrite import process_error_message
 from synth.protocol import Simulation
 from synth.simulation_input import SimulationInput
+from synth.utils import metrics
 from synth.utils.logging import setup_log_filter
 
 
@@ -88,49 +90,57 @@ def preprocess_synapse_for_request(
     return synapse
 
 
-def process_server_response(
-    status: int,
-    headers: httpx.Headers,
-    json_response: dict,
-    local_synapse: Simulation,
-):
-    # Check if the server responded with a successful status code
-    if status == 200:
-        # If the response is successful, overwrite local synapse state with
-        # server's state only if the protocol allows mutation. To prevent overwrites,
-        # the protocol must set Frozen = True
-        server_synapse = local_synapse.__class__(**json_response)
-        key = "simulation_output"
-        setattr(local_synapse, key, getattr(server_synapse, key))
-    else:
-        # If the server responded with an error, update the local synapse state
-        if local_synapse.axon is None:
-            local_synapse.axon = bt.TerminalInfo()
-        local_synapse.axon.status_code = status
-        local_synapse.axon.status_message = json_response.get("message")
-
-    # Extract server headers and overwrite None values in local synapse headers
-    server_headers = bt.Synapse.from_headers(headers)
-
-    # Merge dendrite headers
-    local_synapse.dendrite.__dict__.update(
-        {
-            **local_synapse.dendrite.model_dump(exclude_none=True),
-            **server_headers.dendrite.model_dump(exclude_none=True),
-        }
-    )
+def serialize_body(synapse_body: dict) -> bytes:
+    # same encoding as httpx for json=
+    return json.dumps(
+        synapse_body,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode("utf-8")
 
-    # Merge axon headers
-    local_synapse.axon.__dict__.update(
-        {
-            **local_synapse.axon.model_dump(exclude_none=True),
-            **server_headers.axon.model_dump(exclude_none=True),
-        }
+
+def request_headers(
+    ss58_address: str,
+    nonce: int,
+    uuid: str,
+    external_ip: str,
+    synapse_headers: dict,
+    timeout: float,
+) -> dict:
+    """Headers of the request sent to every axon, the axon and signature
+    headers are left empty and filled in by axon_headers."""
+    synapse = Simulation(simulation_input=SimulationInput()).from_headers(
+        synapse_headers
+    )
+    synapse = preprocess_synapse_for_request(
+        ss58_address,
+        nonce,
+        uuid,
+        external_ip,
+        bt.AxonInfo(
+            version=0, ip="", port=0, ip_type=4, hotkey="", coldkey=""
+        ),
+        synapse,
+        timeout,
     )
+    synapse.dendrite.signature = ""
 
-    # Update the status code and status message of the dendrite to match the axon
-    local_synapse.dendrite.status_code = local_synapse.axon.status_code
-    local_synapse.dendrite.status_message = local_synapse.axon.status_message
+    headers = synapse.to_headers()
+    headers["content-type"] = "application/json"
+    return headers
+
+
+def axon_headers(
+    headers: dict, target_axon: bt.AxonInfo, signature: str
+) -> dict:
+    return {
+        **headers,
+        "bt_header_axon_ip": str(target_axon.ip),
+        "bt_header_axon_port": str(target_axon.port),
+        "bt_header_axon_hotkey": str(target_axon.hotkey),
+        "bt_header_dendrite_signature": signature,
+    }
 
 
 async def call(
@@ -141,8 +151,8 @@ async def call(
     external_ip: str,
     client: httpx.AsyncClient,
     target_axon: Union[bt.AxonInfo, bt.Axon],
-    synapse_headers: dict,
-    synapse_body: dict,
+    headers: dict,
+    body: bytes,
     timeout: float,
 ):
     start_time = time.time()
@@ -152,48 +162,33 @@ async def call(
 
     url = get_endpoint_url(external_ip, target_axon)
 
-    synapse = Simulation(simulation_input=SimulationInput()).from_headers(
-        synapse_headers
-    )
-
-    # Preprocess synapse for making a request
-    synapse = preprocess_synapse_for_request(
-        ss58_address,
-        nonce,
-        uuid,
-        external_ip,
-        target_axon,
-        synapse,
-        timeout,
-    )
-    synapse.dendrite.signature = signature
-
     try:
-        # bt.logging.trace(
-        #     f"dendrite | --> | {synapse.get_total_size()} B | {synapse.name} | {synapse.axon.hotkey} | {synapse.axon.ip}:{str(synapse.axon.port)} | 0 | Success"
-        # )
         response = await client.post(
             url=url,
-            headers=synapse.to_headers(),
-            json=synapse_body,
+            headers=axon_headers(headers, target_axon, signature),
+            content=body,
         )
         response.raise_for_status()
-        json_response = response.json()
-        process_server_response(
-            response.status_code, response.headers, json_response, synapse
-        )
-
-        synapse.dendrite.process_time = str(time.time() - start_time)
+        server_synapse = Simulation(**response.json())
 
+        return [
+            server_synapse.simulation_output,
+            str(time.time() - start_time),
+        ]
     except Exception as e:
-        synapse = process_error_message(synapse, REQUEST_NAME, e)
-
-    finally:
-        # bt.logging.trace(
-        #     f"dendrite | <-- | {synapse.get_total_size()} B | {synapse.name} | {synapse.axon.hotkey} | {synapse.axon.ip}:{str(synapse.axon.port)} | {synapse.dendrite.status_code} | {synapse.dendrite.status_message}"
-        # )
+        # the synapse is only built for the error message
+        synapse = preprocess_synapse_for_request(
+            ss58_address,
+            nonce,
+            uuid,
+            external_ip,
+            target_axon,
+            Simulation(simulation_input=SimulationInput()),
+            timeout,
+        )
+        process_error_message(synapse, REQUEST_NAME, e)
 
-        return [synapse.simulation_output, synapse.dendrite.process_time]
+        return [None, None]
 
 
 async def worker(
@@ -201,10 +196,11 @@ async def worker(
     nonce: int,
     uuid: str,
     external_ip: str,
-    synapse_headers: dict,
-    synapse_body: dict,
+    headers: dict,
+    body: bytes,
     axon_sig_pairs: list,
     timeout: float,
+    deadline: float,
 ):
     async with httpx.AsyncClient(
         http2=True,
@@ -213,8 +209,8 @@ async def worker(
         ),
         timeout=timeout,
     ) as client:
-        return await asyncio.gather(
-            *(
+        tasks = [
+            asyncio.create_task(
                 call(
                     ss58_address=ss58_address,
                     nonce=nonce,
@@ -225,13 +221,28 @@ async def worker(
                     target_axon=bt.AxonInfo.from_parameter_dict(
                         axon_dict,
                     ),
-                    synapse_headers=synapse_headers,
-                    synapse_body=synapse_body,
+                    headers=headers,
+                    body=body,
                     timeout=timeout,
                 )
-                for axon_dict, signature in axon_sig_pairs
             )
+            for axon_dict, signature in axon_sig_pairs
+        ]
+        if len(tasks) == 0:
+            return []
+
+        # a response received after the deadline is rejected by the
+        # validation anyway, don't wait for it
+        _, pending = await asyncio.wait(
+            tasks, timeout=max(deadline - time.time(), 0)
         )
+        for task in pending:
+            task.cancel()
+
+        return [
+            [None, None] if task in pending else task.result()
+            for task in tasks
+        ]
 
 
 def run_chunk(
@@ -239,10 +250,11 @@ def run_chunk(
     nonce: int,
     uuid: str,
     external_ip: str,
-    synapse_headers: dict,
-    synapse_body: dict,
+    headers: dict,
+    body: bytes,
     axon_sig_pairs: list,
     timeout: float,
+    deadline: float,
 ):
     try:
         return asyncio.run(
@@ -251,19 +263,32 @@ def run_chunk(
                 nonce,
                 uuid,
                 external_ip,
-                synapse_headers,
-                synapse_body,
+                headers,
+                body,
                 axon_sig_pairs,
                 timeout,
+                deadline,
             )
         )
     except EOFError:
         pass
 
 
+def signing_message(
+    nonce: int, ss58_address: str, axon_hotkey: str, uuid: str, body_hash: str
+) -> str:
+    return f"{nonce}.{ss58_address}.{axon_hotkey}.{uuid}.{body_hash}"
+
+
 def sign(synapse: Simulation, keypair: bt.Keypair):
     # Sign the request using the dendrite, axon info, and the synapse body hash
-    message = f"{synapse.dendrite.nonce}.{synapse.dendrite.hotkey}.{synapse.axon.hotkey}.{synapse.dendrite.uuid}.{synapse.body_hash}"
+    message = signing_message(
+        synapse.dendrite.nonce,
+        synapse.dendrite.hotkey,
+        synapse.axon.hotkey,
+        synapse.dendrite.uuid,
+        synapse.body_hash,
+    )
     signature = f"0x{keypair.sign(message).hex()}"
     return signature
 
@@ -278,23 +303,18 @@ def sign_axons(
     keypair: bt.Keypair,
     nonce: int,
     uuid: str,
-    external_ip: str,
     axons: list[bt.AxonInfo],
-    synapse: Simulation,
-    timeout: float,
-):
-    synapse = synapse.model_copy()
-    for axon in axons:
-        synapse = preprocess_synapse_for_request(
-            keypair.ss58_address,
-            nonce,
-            uuid,
-            external_ip,
-            axon,
-            synapse,
-            timeout,
+    body_hash: str,
+) -> list[str]:
+    # the body is the same for every axon, only the axon hotkey
+    # changes in the signed message
+    messages = [
+        signing_message(
+            nonce, keypair.ss58_address, axon.hotkey, uuid, body_hash
         )
-        yield sign(synapse, keypair)
+        for axon in axons
+    ]
+    return [f"0x{keypair.sign(message).hex()}" for message in messages]
 
 
 def sync_forward_multiprocess(
@@ -312,34 +332,61 @@ def sync_forward_multiprocess(
     ss58_address = keypair.ss58_address
     synapse = synapse.model_copy()
     nonce = time.time_ns()
-    axon_dicts = [ax.to_parameter_dict() for ax in axons]
-    signatures = list(
-        sign_axons(keypair, nonce, uuid, external_ip, axons, synapse, timeout)
+    # the responses must be received before the simulation start time
+    deadline = datetime.fromisoformat(
+        synapse.simulation_input.start_time
+    ).timestamp()
+    synapse_headers = synapse.to_headers()
+    body_hash = synapse.body_hash
+    # the body and headers are the same for every axon, they are
+    # serialized once and only the AXON_HEADERS are set per call
+    body = serialize_body(synapse.model_dump())
+    headers = request_headers(
+        ss58_address, nonce, uuid, external_ip, synapse_headers, timeout
     )
-    axon_sig_pairs = list(zip(axon_dicts, signatures))
-    chunks = list(chunkify(axon_sig_pairs, nprocs))
+    chunks = list(chunkify(axons, nprocs))
     results = []
 
     with concurrent.futures.ProcessPoolExecutor(nprocs) as executor:
-        intermediate_results = executor.map(
-            run_chunk,
-            repeat(ss58_address),
-            repeat(nonce),
-            repeat(uuid),
-            repeat(external_ip),
-            repeat(synapse.to_headers()),
-            repeat(synapse.model_dump()),
-            chunks,
-            repeat(timeout),
+        # The keypair cannot be sent to the worker processes, so the
+        # signatures are made here, one chunk at a time: the first
+        # worker starts while the next chunks are being signed.
+        sign_time = 0.0
+        futures = []
+        for chunk in chunks:
+            start_time = time.perf_counter()
+            signatures = sign_axons(keypair, nonce, uuid, chunk, body_hash)
+            sign_time += time.perf_counter() - start_time
+            futures.append(
+                executor.submit(
+                    run_chunk,
+                    ss58_address,
+                    nonce,
+                    uuid,
+                    external_ip,
+                    headers,
+                    body,
+                    [
+                        (axon.to_parameter_dict(), signature)
+                        for axon, signature in zip(chunk, signatures)
+                    ],
+                    timeout,
+                    deadline,
+                )
+            )
+        metrics.observe(
+            "query_available_miners_and_save_responses.sign", sign_time
         )
-        for chunk_results in intermediate_results:
-            for simulation_output, process_time in chunk_results:
-                synapse_result = Simulation(
-                    simulation_input=SimulationInput()
-                ).from_headers(synapse.to_headers())
+
+        result_template = Simulation(
+            simulation_input=SimulationInput()
+        ).from_headers(synapse_headers)
+        for future in futures:
+            for simulation_output, process_time in future.result():
+                synapse_result = result_template.model_copy(deep=True)
                 synapse_result.simulation_output = simulation_output
                 synapse_result.dendrite.process_time = process_time
-                results.append(synapse_result.model_copy())
+                results.append(synapse_result)
 
     return results
 
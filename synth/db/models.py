@@ -16,6 +16,8 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, relationship, Session
 
 
@@ -25,10 +27,11 @@ class Base(DeclarativeBase):
     pass
 
 
-def get_database_url():
+def get_database_url(driver: str | None = None):
     load_dotenv()
+    dialect = f"postgresql+{driver}" if driver else "postgresql"
     return (
-        f"postgresql://{os.getenv('POSTGRES_USER')}:"
+        f"{dialect}://{os.getenv('POSTGRES_USER')}:"
         f"{os.getenv('POSTGRES_PASSWORD')}@"
         f"{os.getenv('POSTGRES_HOST')}:"
         f"{os.getenv('POSTGRES_PORT')}/"
@@ -36,17 +39,90 @@ def get_database_url():
     )
 
 
-def create_engine_and_session():
+def get_connect_args(
+    database_url: str,
+    statement_timeout: int = 0,
+    prepare_threshold: int | None = None,
+) -> dict:
+    """
+    Build the DBAPI connect arguments for the given database url.
+
+    :param statement_timeout: server side statement timeout in milliseconds, 0 disables it.
+    :param prepare_threshold: number of executions of a query before psycopg (v3)
+        turns it into a server-side prepared statement, ignored for other drivers.
+    """
+    connect_args: dict = {}
+    driver = make_url(database_url).get_dialect().driver
+
+    if statement_timeout > 0:
+        if driver == "asyncpg":
+            connect_args["server_settings"] = {
+                "statement_timeout": str(statement_timeout)
+            }
+        else:
+            connect_args["options"] = (
+                f"-c statement_timeout={statement_timeout}"
+            )
+
+    if driver == "psycopg" and prepare_threshold is not None:
+        connect_args["prepare_threshold"] = prepare_threshold
+
+    return connect_args
+
+
+def create_engine_and_session(
+    driver: str | None = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_recycle: int = -1,
+    pool_timeout: float = 30,
+    statement_timeout: int = 0,
+    prepare_threshold: int | None = None,
+):
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-    engine = create_engine(get_database_url(), echo=False, pool_pre_ping=True)
+    database_url = get_database_url(driver)
+    engine = create_engine(
+        database_url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        connect_args=get_connect_args(
+            database_url, statement_timeout, prepare_threshold
+        ),
+    )
     return engine, Session(engine)
 
 
-def get_engine():
-    engine, _ = create_engine_and_session()
+def get_engine(**kwargs):
+    engine, _ = create_engine_and_session(**kwargs)
     return engine
 
 
+def get_async_engine(
+    driver: str = "asyncpg",
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_recycle: int = -1,
+    pool_timeout: float = 30,
+    statement_timeout: int = 0,
+) -> AsyncEngine:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    database_url = get_database_url(driver)
+    return create_async_engine(
+        database_url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        connect_args=get_connect_args(database_url, statement_timeout),
+    )
+
+
 class ValidatorRequest(Base):
     __tablename__ = "validator_requests"
 
@@ -0,0 +1,163 @@
+"""
+Latest prices of the TOKEN_MAP assets for the miner.
+
+PriceFeed subscribes to the Hermes price stream in the background and
+keeps the latest price of each asset in memory, the requests read it
+with get_price instead of calling Hermes.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+import traceback
+import typing
+
+
+import bittensor as bt
+import httpx
+
+
+from synth.miner.price_simulation import TOKEN_MAP
+
+
+HERMES_URL = "https://hermes.pyth.network"
+
+
+class PriceFeed:
+    def __init__(
+        self,
+        assets: typing.Optional[list[str]] = None,
+        max_age: float = 60,
+        base_url: str = HERMES_URL,
+        reconnect_seconds: float = 5,
+        read_timeout: float = 30,
+    ):
+        """
+        assets defaults to all the TOKEN_MAP assets. get_price returns
+        None for a price published more than max_age seconds ago. The
+        stream is reopened when no update is received for read_timeout
+        seconds.
+        """
+        self.assets = list(TOKEN_MAP) if assets is None else assets
+        self.max_age = max_age
+        self.base_url = base_url
+        self.reconnect_seconds = reconnect_seconds
+        self.read_timeout = read_timeout
+        # asset -> (price, publish time as a unix timestamp)
+        self.prices: dict[str, tuple[float, float]] = {}
+        self._asset_by_id = {TOKEN_MAP[asset]: asset for asset in self.assets}
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._task: typing.Optional[asyncio.Task] = None
+        self._thread: typing.Optional[threading.Thread] = None
+
+    def get_price(
+        self, asset: str, max_age: typing.Optional[float] = None
+    ) -> typing.Optional[float]:
+        """Latest price of the asset, None if there is none or it is
+        stale. Doesn't block, safe to call from any thread."""
+        entry = self.prices.get(asset)
+        if entry is None:
+            return None
+
+        price, publish_time = entry
+        if max_age is None:
+            max_age = self.max_age
+        if time.time() - publish_time > max_age:
+            return None
+
+        return price
+
+    def update(self, parsed: list[dict]):
+        """Store the prices of a Hermes "parsed" price update list."""
+        for item in parsed:
+            asset = self._asset_by_id.get(item["id"].removeprefix("0x"))
+            if asset is None:
+                continue
+
+            price_data = item["price"]
+            publish_time = float(price_data["publish_time"])
+            current = self.prices.get(asset)
+            if current is not None and current[1] > publish_time:
+                continue
+
+            price = int(price_data["price"]) * (10 ** int(price_data["expo"]))
+            self.prices[asset] = (price, publish_time)
+
+    def _params(self) -> list[tuple[str, str]]:
+        return [("ids[]", TOKEN_MAP[asset]) for asset in self.assets] + [
+            ("parsed", "true")
+        ]
+
+    async def poll(self, client: httpx.AsyncClient):
+        response = await client.get(
+            f"{self.base_url}/v2/updates/price/latest", params=self._params()
+        )
+        response.raise_for_status()
+        self.update(response.json().get("parsed", []))
+
+    async def stream(self, client: httpx.AsyncClient):
+        """Apply the updates of the server-sent events stream until it
+        is closed."""
+        async with client.stream(
+            "GET",
+            f"{self.base_url}/v2/updates/price/stream",
+            params=self._params(),
+            timeout=httpx.Timeout(10, read=self.read_timeout),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    self.update(json.loads(line[5:]).get("parsed", []))
+
+    async def run(self):
+        """Keep the prices up to date until cancelled."""
+        async with httpx.AsyncClient(timeout=10) as client:
+            while True:
+                try:
+                    # the latest prices right away, the stream only sends
+                    # the next updates
+                    await self.poll(client)
+                    await self.stream(client)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    bt.logging.error(
+                        f"in PriceFeed.run (got an exception): {e}"
+                    )
+                    traceback.print_exc(file=sys.stderr)
+
+                await asyncio.sleep(self.reconnect_seconds)
+
+    def start(self):
+        """Run the feed in a background thread with its own event loop."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        started = threading.Event()
+
+        def run_loop():
+            self._loop = asyncio.new_event_loop()
+            self._task = self._loop.create_task(self.run())
+            started.set()
+            try:
+                self._loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(
+            target=run_loop, name="price-feed", daemon=True
+        )
+        self._thread.start()
+        started.wait()
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join()
+        self._thread = None
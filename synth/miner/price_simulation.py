@@ -46,25 +46,41 @@ def get_asset_price(asset="BTC") -> float | None:
 
     return live_price
 
+
 def simulate_crypto_price_paths(
     current_price: float,
     time_increment: int,
     time_length: int,
     num_simulations: int,
     sigma: float,
+    rng: np.random.Generator | None = None,
 ) -> np.ndarray:
     """
-    Simulate multiple crypto asset price paths.
-    """
+    Simulate multiple crypto asset price paths with a driftless geometric
+    Brownian motion, sigma being the hourly volatility. The returns are
+    drawn from rng, a fresh default_rng() if None.
 
-    price_paths = []
-    for _ in range(num_simulations):
-        price_path = simulate_single_price_path(
-            current_price, time_increment, time_length, sigma
-        )
-        price_paths.append(price_path)
-    
-    return np.array(price_paths)
+    Return an array of shape (num_simulations, time_length // time_increment + 1)
+    starting at current_price.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    dt = time_increment / 3600
+    num_steps = int(time_length / time_increment)
+
+    # all the paths at once, the -sigma**2 / 2 drift keeps the expected
+    # price at current_price
+    log_returns = rng.normal(
+        -0.5 * sigma**2 * dt,
+        sigma * np.sqrt(dt),
+        size=(num_simulations, num_steps),
+    )
+    price_paths = np.empty((num_simulations, num_steps + 1))
+    price_paths[:, 0] = 0.0
+    np.cumsum(log_returns, axis=1, out=price_paths[:, 1:])
+    np.exp(price_paths, out=price_paths)
+    price_paths *= current_price
+
+    return price_paths
 
 
 def plot_price_paths(price_paths: np.ndarray, filename: str | None = None, show: bool = False) -> None:
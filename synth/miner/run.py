@@ -4,8 +4,6 @@ from synth.simulation_input import SimulationInput
 from synth.utils.helpers import get_current_time, round_time_to_minutes
 from synth.validator.response_validation_v2 import validate_responses
 
-import matplotlib.pyplot as plt
-
 # python synth/miner/run.py
 
 
@@ -29,6 +27,7 @@ if __name__ == "__main__":
         time_increment=simulation_input.time_increment,
         time_length=simulation_input.time_length,
         num_simulations=simulation_input.num_simulations,
+        debug=True,
     )
 
     format_validation = validate_responses(
@@ -15,6 +15,7 @@ def generate_simulations(
     time_length=86400,
     num_simulations=1,
     sigma=0.000832373203, # original value 0.01 but this is hourly volatility so should be lower. currently 16% annualized volatility
+    debug: bool = False,
 ):
     """
     Generate simulated price paths.
@@ -26,11 +27,13 @@ def generate_simulations(
         time_length (int): Total time length in seconds.
         num_simulations (int): Number of simulation runs.
         sigma (float): Standard deviation of the simulated price path.
+        debug (bool): Plot the paths to plot_pricepaths.png and print the prediction.
 
     Returns:
-        numpy.ndarray: Simulated price paths.
+        tuple: The prediction in the expected predictions format.
     """
-    print(f"Generating simulations for asset: {asset}")
+    if debug:
+        print(f"Generating simulations for asset: {asset}")
     if start_time == "":
         raise ValueError("Start time must be provided.")
 
@@ -54,18 +57,15 @@ def generate_simulations(
         num_simulations=num_simulations,
         sigma=sigma,
     )
-    plot_price_paths(simulations, filename='plot_pricepaths.png', show=False)
 
     predictions = convert_prices_to_time_format(
-        simulations.tolist(), start_time, time_increment
+        simulations, start_time, time_increment
     )
-    print('simulations', simulations.tolist(), start_time, time_increment)
-    print('predictions', predictions)
-    return predictions
 
-generate_simulations(
-    asset="BTC",
-    start_time="2025-12-07T00:00:00",
-    time_increment=300,
-    time_length=86400,
-    num_simulations=1)
+    if debug:
+        plot_price_paths(
+            simulations, filename="plot_pricepaths.png", show=False
+        )
+        print("predictions", predictions)
+
+    return predictions
@@ -45,6 +45,12 @@ def check_config(_, config: "bt.Config"):
     r"""Checks/validates the config namespace object."""
     bt.logging.check_config(config)
 
+    scoring = getattr(config, "scoring", None)
+    if scoring is not None and scoring.workers > 1 and scoring.pipelined:
+        raise ValueError(
+            "--scoring.workers > 1 and --scoring.pipelined are two scoring modes, choose one"
+        )
+
     full_path = os.path.expanduser(
         "{}/{}/{}/netuid{}/{}".format(
             config.logging.logging_dir,  # TODO: change from ~/.bittensor/miners to ~/.bittensor/neurons
@@ -245,6 +251,90 @@ def add_validator_args(_, parser: argparse.ArgumentParser):
         default=-0.2,
     )
 
+    parser.add_argument(
+        "--db.driver",
+        type=str,
+        help="The SQLAlchemy postgresql driver, e.g. psycopg2 or psycopg. Defaults to the SQLAlchemy default driver.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--db.pool_size",
+        type=int,
+        help="The number of connections kept open in the database pool.",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--db.max_overflow",
+        type=int,
+        help="The number of connections allowed above the pool size.",
+        default=10,
+    )
+
+    parser.add_argument(
+        "--db.pool_recycle",
+        type=int,
+        help="Recycle database connections older than this number of seconds, -1 to disable.",
+        default=-1,
+    )
+
+    parser.add_argument(
+        "--db.pool_timeout",
+        type=float,
+        help="Seconds to wait for a connection from the pool before giving up.",
+        default=30,
+    )
+
+    parser.add_argument(
+        "--db.statement_timeout",
+        type=int,
+        help="Server side statement timeout in milliseconds, 0 to disable.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--db.prepare_threshold",
+        type=int,
+        help="Executions of a query before it is server-side prepared (psycopg driver only).",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--scoring.pipelined",
+        action="store_true",
+        help="Score the validator requests with the asyncio pipeline, overlapping database I/O and CRPS computation.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--scoring.workers",
+        type=int,
+        help="The number of processes scoring the pending validator requests in parallel, 1 to score them in the validator process.",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--metrics.port",
+        type=int,
+        help="Serve the stage latency histograms in the Prometheus text format on this port (/metrics).",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--metrics.json_path",
+        type=str,
+        help="Periodically dump the stage latency histograms to this JSON file.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--metrics.json_interval",
+        type=float,
+        help="Seconds between two dumps of the metrics JSON file.",
+        default=60,
+    )
+
 
 def config(cls):
     """
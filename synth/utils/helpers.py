@@ -1,5 +1,13 @@
 from typing import Optional
 from datetime import datetime, timedelta, timezone
+from math import floor, log10
+
+
+import numpy as np
+
+
+# powers of 10 exactly representable as float64
+_EXACT_POWERS_OF_10 = np.array([float(10**k) for k in range(23)])
 
 
 def get_current_time() -> datetime:
@@ -11,7 +19,6 @@ def round_to_8_significant_digits(num: float) -> float:
     """Round a float to 8 significant digits."""
     if num == 0:
         return 0.0
-    from math import log10, floor
 
     digits = 8
     # calculate the order of magnitude of the number
@@ -22,6 +29,54 @@ def round_to_8_significant_digits(num: float) -> float:
     return round(num, decimal_places)
 
 
+def round_to_8_significant_digits_array(prices) -> np.ndarray:
+    """
+    Round an array of floats to 8 significant digits, bit-identical to
+    round_to_8_significant_digits applied to each element.
+
+    round(num, decimal_places) is correctly rounded: num * 10**decimal_places
+    rounded to an integer, divided by the power of 10, gives the same float
+    as long as the product isn't within its rounding error of a .5 tie. The
+    few elements that are, whose order of magnitude is within the error of
+    log10 of an integer, or that are zero or not finite, are rounded by
+    round_to_8_significant_digits.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    rounded = np.empty_like(prices)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        log_magnitude = np.log10(np.abs(prices))
+        magnitude = np.floor(log_magnitude)
+        decimal_places = 8 - magnitude - 1
+        vectorized = (
+            np.isfinite(log_magnitude)
+            & (np.abs(decimal_places) < len(_EXACT_POWERS_OF_10))
+            & (log_magnitude - magnitude > 1e-9)
+            & (magnitude + 1 - log_magnitude > 1e-9)
+        )
+
+        power = _EXACT_POWERS_OF_10[
+            np.where(vectorized, np.abs(decimal_places), 0).astype(np.intp)
+        ]
+        positive = decimal_places >= 0
+        scaled = np.where(positive, prices * power, prices / power)
+        # |scaled| < 10**8, its rounding error is below 1.5e-8
+        vectorized &= np.abs(scaled - np.floor(scaled) - 0.5) > 1e-7
+
+        integers = np.rint(scaled)
+        np.copyto(
+            rounded,
+            np.where(positive, integers / power, integers * power),
+        )
+
+    for index in np.flatnonzero(~vectorized):
+        rounded.flat[index] = round_to_8_significant_digits(
+            float(prices.flat[index])
+        )
+
+    return rounded
+
+
 def convert_prices_to_time_format(
     prices: list, start_time_str: str, time_increment: int
 ):
@@ -37,12 +92,7 @@ def convert_prices_to_time_format(
         tzinfo=timezone.utc
     )
     result = [int(start_time.timestamp()), time_increment]
-
-    for price_item in prices:
-        single_prediction = []
-        for price in price_item:
-            single_prediction.append(round_to_8_significant_digits(price))
-        result.append(single_prediction)
+    result.extend(round_to_8_significant_digits_array(prices).tolist())
 
     return tuple(result)
 
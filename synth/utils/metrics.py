@@ -0,0 +1,215 @@
+"""
+Latency histograms of the validator stages.
+
+A stage is named after the function it belongs to, mostly the ones of
+synth/validator/forward.py, e.g.
+"query_available_miners_and_save_responses.dendrite".
+The histograms are exposed in the Prometheus text format over HTTP
+(--metrics.port) and/or dumped periodically to a JSON file
+(--metrics.json_path).
+
+Only the stages of the validator process are recorded: with
+--scoring.workers > 1 the price fetch and CRPS of the worker processes
+are not collected.
+"""
+
+from contextlib import contextmanager
+import functools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+
+
+import bittensor as bt
+
+
+# seconds, from the per-miner validation to a full scoring pass
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    60,
+    120,
+    300,
+    600,
+)
+
+METRIC_NAME = "synth_validator_stage_seconds"
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # counts[i] is the number of observations <= buckets[i],
+        # the last one is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "buckets": {
+                str(bound): count
+                for bound, count in zip(
+                    list(self.buckets) + ["+Inf"], self.counts
+                )
+            },
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, stage: str, value: float):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start_time)
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                stage: histogram.to_dict()
+                for stage, histogram in sorted(self.histograms.items())
+            }
+
+    def render_prometheus(self) -> str:
+        lines = [
+            f"# HELP {METRIC_NAME} Duration of the validator stages.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for stage, histogram in self.to_dict().items():
+            for bound, count in histogram["buckets"].items():
+                lines.append(
+                    f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'{METRIC_NAME}_sum{{stage="{stage}"}} {histogram["sum"]}'
+            )
+            lines.append(
+                f'{METRIC_NAME}_count{{stage="{stage}"}} {histogram["count"]}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+# registry used by the validator
+registry = MetricsRegistry()
+
+
+def observe(stage: str, value: float):
+    registry.observe(stage, value)
+
+
+def timer(stage: str):
+    return registry.timer(stage)
+
+
+def timed(stage: str):
+    """Decorator recording the duration of each call of the function."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with registry.timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def start_http_server(
+    port: int, metrics_registry: MetricsRegistry = registry
+) -> ThreadingHTTPServer:
+    """Serve the histograms in the Prometheus text format on /metrics."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics_registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    bt.logging.info(f"serving the metrics on port {server.server_port}")
+    return server
+
+
+def dump_json(path: str, metrics_registry: MetricsRegistry = registry):
+    # write then rename so a reader never sees a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {"timestamp": time.time(), "stages": metrics_registry.to_dict()},
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def start_json_dump(
+    path: str, interval: float, metrics_registry: MetricsRegistry = registry
+) -> threading.Thread:
+    """Dump the histograms to path every interval seconds."""
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                dump_json(path, metrics_registry)
+            except Exception as e:
+                bt.logging.error(f"in dump_json (got an exception): {e}")
+                traceback.print_exc(file=sys.stderr)
+
+    thread = threading.Thread(target=run, name="metrics-json", daemon=True)
+    thread.start()
+    return thread
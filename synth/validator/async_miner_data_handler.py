@@ -0,0 +1,309 @@
+from datetime import datetime
+import traceback
+import sys
+import typing
+import logging
+
+
+import bittensor as bt
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncEngine
+from tenacity import (
+    before_log,
+    retry,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+
+from synth.db.models import MinerPrediction, ValidatorRequest, get_async_engine
+from synth.simulation_input import SimulationInput
+from synth.validator import prompt_config
+from synth.validator.miner_data_handler import (
+    MinerDataHandler,
+    assign_miner_uids,
+    timed_db_operation,
+)
+
+
+class AsyncMinerDataHandler:
+    """asyncio counterpart of MinerDataHandler on an asyncpg engine.
+
+    The methods have the same names, arguments and return values as the
+    MinerDataHandler ones but are coroutines, so the database round trips
+    can overlap with the CRPS computation (see calculate_scores_pipelined).
+    The SQL statements and the miners/metagraph snapshots are shared with
+    a MinerDataHandler bound to the synchronous facade of the engine.
+    """
+
+    def __init__(self, engine: typing.Optional[AsyncEngine] = None):
+        self.engine = engine or get_async_engine()
+        self.handler = MinerDataHandler(self.engine.sync_engine)
+
+    def record_db_latency(self, operation: str, elapsed: float):
+        self.handler.record_db_latency(operation, elapsed)
+
+    def log_db_stats(self):
+        self.handler.log_db_stats()
+
+    @timed_db_operation
+    async def get_latest_asset(self, time_length: int) -> str | None:
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(
+                    self.handler.fetch_latest_asset, time_length
+                )
+        except Exception as e:
+            bt.logging.error(f"in get_next_asset (got an exception): {e}")
+            traceback.print_exc(file=sys.stderr)
+            return None
+
+    @timed_db_operation
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=7),
+        reraise=True,
+        before=before_log(bt.logging._logger, logging.DEBUG),
+    )
+    async def save_responses(
+        self,
+        miner_predictions: dict,
+        simulation_input: SimulationInput,
+        request_time: datetime,
+    ):
+        """Save miner predictions and simulation input."""
+        try:
+            async with self.engine.begin() as connection:
+                return await connection.run_sync(
+                    self.handler.insert_responses,
+                    miner_predictions,
+                    simulation_input,
+                    request_time,
+                )
+        except Exception as e:
+            bt.logging.error(f"in save_responses (got an exception): {e}")
+            traceback.print_exc(file=sys.stderr)
+
+    @timed_db_operation
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=7),
+        reraise=True,
+        before=before_log(bt.logging._logger, logging.DEBUG),
+    )
+    async def set_miner_scores(
+        self,
+        real_prices: list[dict],
+        validator_requests_id: int,
+        reward_details: list[dict],
+        scored_time: datetime,
+    ):
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(
+                    self.handler.write_miner_scores,
+                    real_prices,
+                    validator_requests_id,
+                    reward_details,
+                    scored_time,
+                )
+        except Exception as e:
+            bt.logging.error(f"in set_miner_scores (got an exception): {e}")
+            traceback.print_exc(file=sys.stderr)
+
+    @timed_db_operation
+    async def get_miner_uid_of_prediction_request(
+        self, validator_request_id: int
+    ) -> typing.Optional[list[int]]:
+        """Retrieve the miner_uid of the given validator_request_id."""
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(
+                    self.handler.fetch_miner_uid_of_prediction_request,
+                    validator_request_id,
+                )
+        except Exception as e:
+            bt.logging.error(
+                f"in get_miner_uid_of_prediction_request (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
+            return None
+
+    @timed_db_operation
+    async def get_miner_prediction(
+        self, miner_uid: int, validator_request_id: int
+    ) -> typing.Optional[MinerPrediction]:
+        """Retrieve the record with the longest valid interval for the given miner_id."""
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(
+                    self.handler.fetch_miner_prediction,
+                    miner_uid,
+                    validator_request_id,
+                )
+        except Exception as e:
+            bt.logging.error(
+                f"in get_miner_prediction (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
+            return None
+
+    @timed_db_operation
+    async def get_validator_requests_to_score(
+        self,
+        scored_time: datetime,
+        window_days: int,
+        time_length: int | None = None,
+    ) -> typing.Optional[list[ValidatorRequest]]:
+        """See MinerDataHandler.get_validator_requests_to_score."""
+        if time_length is None:
+            time_length = prompt_config.LOW_FREQUENCY.time_length
+
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(
+                    self.handler.fetch_validator_requests_to_score,
+                    scored_time,
+                    window_days,
+                    time_length,
+                )
+        except Exception as e:
+            bt.logging.error(
+                f"in get_latest_prediction_request (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
+            return None
+
+    @timed_db_operation
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=7),
+        reraise=True,
+        before=before_log(bt.logging._logger, logging.DEBUG),
+    )
+    async def insert_new_miners(self, metagraph_info: list):
+        """Insert or update miners table with the provided data."""
+        changed_miners = self.handler.changed_miners(metagraph_info)
+
+        if len(changed_miners) == 0:
+            bt.logging.debug("miners unchanged, skipping insert_new_miners")
+            return
+
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(
+                    self.handler.upsert_miners, changed_miners
+                )
+
+            self.handler.record_miners_snapshot(changed_miners)
+        except Exception as e:
+            bt.logging.error(f"in insert_new_miners (got an exception): {e}")
+            traceback.print_exc(file=sys.stderr)
+
+    @timed_db_operation
+    async def update_metagraph_history(self, metagraph_info: list):
+        changed_items = self.handler.changed_metagraph_items(metagraph_info)
+
+        if len(changed_items) == 0:
+            bt.logging.debug(
+                "metagraph unchanged, skipping update_metagraph_history"
+            )
+            return
+
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(
+                    self.handler.insert_metagraph_history, changed_items
+                )
+
+            self.handler.record_metagraph_snapshot(changed_items)
+        except Exception as e:
+            bt.logging.error(
+                f"in update_metagraph_history (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
+
+    @timed_db_operation
+    async def get_miner_scores(
+        self,
+        scored_time: datetime,
+        window_days: int,
+        time_length: int | None = None,
+    ):
+        if time_length is None:
+            time_length = prompt_config.LOW_FREQUENCY.time_length
+
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(
+                    self.handler.fetch_miner_scores,
+                    scored_time,
+                    window_days,
+                    time_length,
+                )
+        except Exception as e:
+            bt.logging.error(f"in get_miner_scores (got an exception): {e}")
+            traceback.print_exc(file=sys.stderr)
+            return pd.DataFrame()
+
+    @timed_db_operation
+    async def populate_miner_uid_in_miner_data(self, miner_data: list[dict]):
+        try:
+            async with self.engine.connect() as connection:
+                miner_uid_map = await connection.run_sync(
+                    self.handler.get_miner_ids_map
+                )
+        except Exception as e:
+            bt.logging.error(
+                f"in populate_miner_uid_in_miner_data (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
+            return None
+
+        return assign_miner_uids(miner_data, miner_uid_map)
+
+    @timed_db_operation
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=7),
+        reraise=True,
+        before=before_log(bt.logging._logger, logging.DEBUG),
+    )
+    async def update_miner_rewards(self, miner_rewards_data: list[dict]):
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(
+                    self.handler.insert_miner_rewards, miner_rewards_data
+                )
+        except Exception as e:
+            bt.logging.error(
+                f"in update_miner_rewards (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
+
+    @timed_db_operation
+    async def update_weights_history(
+        self,
+        miner_uids: list[int],
+        miner_weights: list[float],
+        norm_miner_uids: list[str],
+        norm_miner_weights: list[str],
+        update_result: str,
+        scored_time: datetime,
+    ):
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(
+                    self.handler.insert_weights_history,
+                    miner_uids,
+                    miner_weights,
+                    norm_miner_uids,
+                    norm_miner_weights,
+                    update_result,
+                    scored_time,
+                )
+        except Exception as e:
+            bt.logging.error(
+                f"in update_weights_history (got an exception): {e}"
+            )
+            traceback.print_exc(file=sys.stderr)
@@ -1,7 +1,18 @@
+import threading
+
+
 import numpy as np
 from properscoring import crps_ensemble
 
 
+# dtype of the decoded predictions, float32 halves the memory of the
+# (num_simulations x time points) arrays. The CRPS itself is computed in
+# float64 by properscoring, one column at a time.
+PREDICTION_DTYPE = np.float32
+
+_work_buffers = threading.local()
+
+
 def get_interval_steps(scoring_interval: int, time_increment: int) -> int:
     """
     Calculate the number of steps in the given scoring interval based on the time increment.
@@ -9,6 +20,28 @@ def get_interval_steps(scoring_interval: int, time_increment: int) -> int:
     return int(scoring_interval / time_increment)
 
 
+def get_work_buffer(shape: tuple[int, int], dtype: np.dtype) -> np.ndarray:
+    """
+    Return an uninitialized array of the given shape, backed by a buffer
+    reused by the next calls of the same thread.
+
+    The buffer grows to the largest shape requested, the price changes of
+    the longest prompt config, and is then reused from one miner to the
+    next instead of allocating new arrays for each interval.
+    """
+    dtype = np.dtype(dtype)
+    buffers = getattr(_work_buffers, "buffers", None)
+    if buffers is None:
+        buffers = _work_buffers.buffers = {}
+
+    size = shape[0] * shape[1]
+    buffer = buffers.get(dtype)
+    if buffer is None or buffer.size < size:
+        buffer = buffers[dtype] = np.empty(size, dtype=dtype)
+
+    return buffer[:size].reshape(shape)
+
+
 def calculate_crps_for_miner(
     simulation_runs: np.ndarray,
     real_price_path: np.ndarray,
@@ -33,6 +66,10 @@ def calculate_crps_for_miner(
     # Sum of all scores
     sum_all_scores = 0.0
 
+    # Make sure there are no zero prices in the simulation runs because it will cause a division by zero error
+    if len(scoring_intervals) > 0 and np.any(simulation_runs == 0):
+        return -1.0, [{"error": "Zero price encountered in simulation runs"}]
+
     for interval_name, interval_seconds in scoring_intervals.items():
         interval_steps = get_interval_steps(interval_seconds, time_increment)
         absolute_price = interval_name.endswith("_abs")
@@ -47,18 +84,13 @@ def calculate_crps_for_miner(
             ):
                 interval_steps -= 1
 
-        # Make sure there are no zero prices in the simulation runs because it will cause a division by zero error
-        if np.any(simulation_runs == 0):
-            return -1.0, [
-                {"error": "Zero price encountered in simulation runs"}
-            ]
-
         # Calculate price changes over intervals
         simulated_changes = calculate_price_changes_over_intervals(
             simulation_runs,
             interval_steps,
             absolute_price,
             is_gap,
+            reuse_buffer=True,
         )
         real_changes = calculate_price_changes_over_intervals(
             real_price_path.reshape(1, -1),
@@ -80,10 +112,11 @@ def calculate_crps_for_miner(
             if block == -1:
                 continue
 
-            simulated_changes_block = simulated_changes[
-                :, data_blocks == block
-            ]
-            real_changes_block = real_changes[:, data_blocks == block]
+            # the blocks are contiguous, slice views instead of copies
+            block_columns = np.flatnonzero(data_blocks == block)
+            block_slice = slice(block_columns[0], block_columns[-1] + 1)
+            simulated_changes_block = simulated_changes[:, block_slice]
+            real_changes_block = real_changes[:, block_slice]
             num_intervals = simulated_changes_block.shape[1]
             crps_values_block = np.zeros(num_intervals)
             for t in range(num_intervals):
@@ -146,6 +179,7 @@ def calculate_price_changes_over_intervals(
     interval_steps: int,
     absolute_price=False,
     is_gap=False,
+    reuse_buffer=False,
 ) -> np.ndarray:
     """
     Calculate price changes over specified intervals.
@@ -154,6 +188,7 @@ def calculate_price_changes_over_intervals(
         price_paths (numpy.ndarray): Array of simulated price paths.
         interval_steps (int): Number of steps that make up the interval.
         absolute_price (bool): If True, absolute price values (rather than price changes) are returned.
+        reuse_buffer (bool): If True, the price changes are written to the work buffer of the thread, valid until the next call.
 
     Returns:
         numpy.ndarray: Array of price changes over intervals.
@@ -169,6 +204,18 @@ def calculate_price_changes_over_intervals(
     if absolute_price:
         return interval_prices[:, 1:]
 
-    return (
-        np.diff(interval_prices, axis=1) / interval_prices[:, :-1]
-    ) * 10_000
+    if not reuse_buffer:
+        return (
+            np.diff(interval_prices, axis=1) / interval_prices[:, :-1]
+        ) * 10_000
+
+    # same operations as above, on the strided views and in place: float32
+    # prices give float32 changes, integer prices float64 ones
+    out = get_work_buffer(
+        (interval_prices.shape[0], interval_prices.shape[1] - 1),
+        np.result_type(interval_prices.dtype, np.float32),
+    )
+    np.subtract(interval_prices[:, 1:], interval_prices[:, :-1], out=out)
+    np.divide(out, interval_prices[:, :-1], out=out)
+    np.multiply(out, 10_000, out=out)
+    return out
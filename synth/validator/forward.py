@@ -16,11 +16,14 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import asyncio
+from concurrent.futures import Executor
 from datetime import datetime, timedelta
 import random
 import time
 import sys
 import traceback
+import typing
 
 import bittensor as bt
 import numpy as np
@@ -30,6 +33,7 @@ from synth.base.dendrite_multiprocess import sync_forward_multiprocess
 from synth.base.validator import BaseValidatorNeuron
 from synth.protocol import Simulation
 from synth.simulation_input import SimulationInput
+from synth.utils import metrics
 from synth.utils.helpers import (
     get_current_time,
     timeout_from_start_time,
@@ -37,6 +41,7 @@ from synth.utils.helpers import (
 )
 from synth.utils.uids import check_uid_availability
 from synth.validator import prompt_config
+from synth.validator.async_miner_data_handler import AsyncMinerDataHandler
 from synth.validator.miner_data_handler import MinerDataHandler
 from synth.validator.moving_average import (
     combine_moving_averages,
@@ -45,10 +50,19 @@ from synth.validator.moving_average import (
     print_rewards_df,
 )
 from synth.validator.price_data_provider import PriceDataProvider
+from synth.validator.scoring_pool import (
+    score_validator_request,
+    validator_request_to_dict,
+)
 from synth.validator.response_validation_v2 import (
     validate_responses as validate_responses_v2,
 )
-from synth.validator.reward import get_rewards, print_scores_df
+from synth.validator.reward import (
+    get_rewards,
+    get_rewards_async,
+    load_reward_inputs,
+    print_scores_df,
+)
 
 
 def send_weights_to_bittensor_and_update_weights_history(
@@ -63,7 +77,10 @@ def send_weights_to_bittensor_and_update_weights_history(
     base_neuron.update_scores(np.array(miner_weights), miner_uids)
 
     base_neuron.resync_metagraph()
-    result, msg, uint_uids, uint_weights = base_neuron.set_weights()
+    with metrics.timer(
+        "send_weights_to_bittensor_and_update_weights_history.set_weights"
+    ):
+        result, msg, uint_uids, uint_weights = base_neuron.set_weights()
 
     if result:
         bt.logging.success("set_weights on chain successfully!")
@@ -85,6 +102,28 @@ def send_weights_to_bittensor_and_update_weights_history(
     )
 
 
+def owner_uid(network: str) -> int:
+    return 23 if network == "test" else 248
+
+
+def append_owner_weight(
+    moving_averages_data: list[dict], uid: int, scored_time: datetime
+):
+    """The owner gets as much weight as all the miners together."""
+    moving_averages_data.append(
+        {
+            "miner_id": 0,
+            "miner_uid": uid,
+            "smoothed_score": 0,
+            "reward_weight": sum(
+                [r["reward_weight"] for r in moving_averages_data]
+            ),
+            "updated_at": scored_time.isoformat(),
+        }
+    )
+
+
+@metrics.timed("calculate_moving_average_and_update_rewards")
 def calculate_moving_average_and_update_rewards(
     miner_data_handler: MinerDataHandler,
     scored_time: datetime,
@@ -168,13 +207,199 @@ def calculate_scores(
     return fail_count != len(validator_requests)
 
 
+def calculate_scores_parallel(
+    miner_data_handler: MinerDataHandler,
+    price_data_provider: PriceDataProvider,
+    scored_time: datetime,
+    prompt: prompt_config.PromptConfig,
+    executor: Executor,
+) -> bool:
+    """
+    Same as calculate_scores but the validator requests are scored by a
+    pool of worker processes (see create_scoring_pool), each one loading
+    the predictions, fetching the real prices and computing the CRPS of a
+    request.
+
+    The results are written by this process in start_time order, so the
+    moving average sees the same rows as calculate_scores.
+    """
+    validator_requests = miner_data_handler.get_validator_requests_to_score(
+        scored_time, prompt.window_days, prompt.time_length
+    )
+
+    if validator_requests is None or len(validator_requests) == 0:
+        bt.logging.warning("No prediction requests found")
+        return False
+
+    bt.logging.debug(f"found {len(validator_requests)} prediction requests")
+
+    # a single request is not worth the round trip to the workers
+    use_pool = len(validator_requests) > 1
+    futures = []
+    if use_pool:
+        futures = [
+            executor.submit(
+                score_validator_request,
+                validator_request_to_dict(validator_request),
+            )
+            for validator_request in validator_requests
+        ]
+
+    fail_count = 0
+    try:
+        for index, validator_request in enumerate(validator_requests):
+            bt.logging.debug(f"validator_request_id: {validator_request.id}")
+
+            try:
+                if not use_pool:
+                    prompt_scores, detailed_info, real_prices = get_rewards(
+                        miner_data_handler=miner_data_handler,
+                        price_data_provider=price_data_provider,
+                        validator_request=validator_request,
+                    )
+                else:
+                    prompt_scores, detailed_info, real_prices = futures[
+                        index
+                    ].result()
+            except Exception as e:
+                bt.logging.error(
+                    f"in calculate_scores_parallel, scoring validator request {validator_request.id} failed: {e}"
+                )
+                traceback.print_exc(file=sys.stderr)
+                prompt_scores, detailed_info, real_prices = None, [], []
+
+            print_scores_df(prompt_scores, detailed_info)
+
+            if prompt_scores is None:
+                bt.logging.warning("No rewards calculated")
+                fail_count += 1
+                continue
+
+            miner_score_time = validator_request.start_time + timedelta(
+                seconds=int(validator_request.time_length)
+            )
+
+            miner_data_handler.set_miner_scores(
+                real_prices,
+                int(validator_request.id),
+                detailed_info,
+                miner_score_time,
+            )
+    finally:
+        # the pool is reused, don't leave this pass's requests in it
+        for future in futures:
+            future.cancel()
+
+    # Success if at least one request succeed
+    return fail_count != len(validator_requests)
+
+
+async def calculate_scores_pipelined(
+    miner_data_handler: AsyncMinerDataHandler,
+    price_data_provider: PriceDataProvider,
+    scored_time: datetime,
+    prompt: prompt_config.PromptConfig,
+    executor: typing.Optional[Executor] = None,
+) -> bool:
+    """
+    Same as calculate_scores but the stages of consecutive validator
+    requests overlap: while the CRPS of request N is computed in the
+    executor, the miner uids and real prices of request N+1 are loaded
+    and the scores of request N-1 are written.
+
+    The scores are still written one request at a time in start_time
+    order, so the moving average sees the same rows as calculate_scores.
+    """
+    validator_requests = (
+        await miner_data_handler.get_validator_requests_to_score(
+            scored_time, prompt.window_days, prompt.time_length
+        )
+    )
+
+    if validator_requests is None or len(validator_requests) == 0:
+        bt.logging.warning("No prediction requests found")
+        return False
+
+    bt.logging.debug(f"found {len(validator_requests)} prediction requests")
+
+    fail_count = 0
+    pending_write: typing.Optional[asyncio.Task] = None
+    next_inputs = asyncio.ensure_future(
+        load_reward_inputs(
+            miner_data_handler,
+            price_data_provider,
+            validator_requests[0],
+            executor,
+        )
+    )
+    for index, validator_request in enumerate(validator_requests):
+        bt.logging.debug(f"validator_request_id: {validator_request.id}")
+
+        reward_inputs = await next_inputs
+        if index + 1 < len(validator_requests):
+            next_inputs = asyncio.ensure_future(
+                load_reward_inputs(
+                    miner_data_handler,
+                    price_data_provider,
+                    validator_requests[index + 1],
+                    executor,
+                )
+            )
+
+        if reward_inputs is None:
+            prompt_scores, detailed_info, real_prices = None, [], []
+        else:
+            miner_uids, real_prices = reward_inputs
+            prompt_scores, detailed_info, real_prices = (
+                await get_rewards_async(
+                    miner_data_handler,
+                    validator_request,
+                    miner_uids,
+                    real_prices,
+                    executor,
+                )
+            )
+
+        print_scores_df(prompt_scores, detailed_info)
+
+        if prompt_scores is None:
+            bt.logging.warning("No rewards calculated")
+            fail_count += 1
+            continue
+
+        miner_score_time = validator_request.start_time + timedelta(
+            seconds=int(validator_request.time_length)
+        )
+
+        # keep the writes ordered: at most one in flight
+        if pending_write is not None:
+            await pending_write
+        pending_write = asyncio.ensure_future(
+            miner_data_handler.set_miner_scores(
+                real_prices,
+                int(validator_request.id),
+                detailed_info,
+                miner_score_time,
+            )
+        )
+
+    if pending_write is not None:
+        await pending_write
+
+    # Success if at least one request succeed
+    return fail_count != len(validator_requests)
+
+
 def query_available_miners_and_save_responses(
     base_neuron: BaseValidatorNeuron,
     miner_data_handler: MinerDataHandler,
     miner_uids: list,
     simulation_input: SimulationInput,
     request_time: datetime,
+    axons: typing.Optional[list] = None,
 ):
+    """axons are the ones of miner_uids, read from the metagraph if None;
+    pass a snapshot when the metagraph can be resynced concurrently."""
     timeout = timeout_from_start_time(
         base_neuron.config.neuron.timeout, simulation_input.start_time
     )
@@ -192,19 +417,21 @@ def query_available_miners_and_save_responses(
     # axon is a server application that accepts requests on the miner side
     # ======================================================
 
-    axons = [base_neuron.metagraph.axons[uid] for uid in miner_uids]
+    if axons is None:
+        axons = [base_neuron.metagraph.axons[uid] for uid in miner_uids]
 
     start_time = time.time()
 
-    synapses = sync_forward_multiprocess(
-        base_neuron.dendrite.keypair,
-        base_neuron.dendrite.uuid,
-        base_neuron.dendrite.external_ip,
-        axons,
-        synapse,
-        timeout,
-        base_neuron.config.neuron.nprocs,
-    )
+    with metrics.timer("query_available_miners_and_save_responses.dendrite"):
+        synapses = sync_forward_multiprocess(
+            base_neuron.dendrite.keypair,
+            base_neuron.dendrite.uuid,
+            base_neuron.dendrite.external_ip,
+            axons,
+            synapse,
+            timeout,
+            base_neuron.config.neuron.nprocs,
+        )
 
     total_process_time = str(time.time() - start_time)
     bt.logging.debug(
@@ -216,10 +443,18 @@ def query_available_miners_and_save_responses(
     for i, synapse in enumerate(synapses):
         response = synapse.deserialize()
         process_time = synapse.dendrite.process_time
-        try:
-            format_validation = validate_responses_v2(
-                response, simulation_input, request_time, process_time
+        if process_time is not None:
+            metrics.observe(
+                "query_available_miners_and_save_responses.miner_response",
+                float(process_time),
             )
+        try:
+            with metrics.timer(
+                "query_available_miners_and_save_responses.validation"
+            ):
+                format_validation = validate_responses_v2(
+                    response, simulation_input, request_time, process_time
+                )
         except Exception:
             format_validation = "error during validation"
             traceback.print_exc(file=sys.stderr)
@@ -231,9 +466,12 @@ def query_available_miners_and_save_responses(
         )
 
     if len(miner_predictions) > 0:
-        miner_data_handler.save_responses(
-            miner_predictions, simulation_input, request_time
-        )
+        with metrics.timer(
+            "query_available_miners_and_save_responses.save_responses"
+        ):
+            miner_data_handler.save_responses(
+                miner_predictions, simulation_input, request_time
+            )
     else:
         bt.logging.info("skip saving because no prediction")
 
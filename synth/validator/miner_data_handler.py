@@ -1,6 +1,10 @@
 from datetime import datetime, timedelta
+import functools
+import inspect
 import traceback
 import sys
+import threading
+import time
 import typing
 import logging
 import math
@@ -43,12 +47,115 @@ from synth.db.models import (
 from synth.simulation_input import SimulationInput
 from synth.validator import prompt_config, response_validation_v2
 
+# metagraph_history columns compared against the last persisted snapshot,
+# "updated_at" is left out because it changes on every cycle
+METAGRAPH_HISTORY_TRACKED_FIELDS = (
+    "incentive",
+    "rank",
+    "stake",
+    "trust",
+    "emission",
+    "pruning_score",
+    "coldkey",
+    "hotkey",
+    "ip_address",
+)
+
+
+def timed_db_operation(func):
+    """Record the wall time of a MinerDataHandler database operation."""
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                self.record_db_latency(
+                    func.__name__, time.perf_counter() - start_time
+                )
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.record_db_latency(
+                func.__name__, time.perf_counter() - start_time
+            )
+
+    return wrapper
+
+
+def metagraph_history_key(metagraph_item: dict) -> tuple:
+    return tuple(
+        metagraph_item.get(field) for field in METAGRAPH_HISTORY_TRACKED_FIELDS
+    )
+
+
+def as_datetime(value: datetime | str) -> datetime:
+    # the validator passes most timestamps around as ISO strings,
+    # asyncpg only binds datetime objects to timestamp columns
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def assign_miner_uids(miner_data: list[dict], miner_uid_map: dict):
+    for row in miner_data:
+        miner_id = row["miner_id"]
+        row["miner_uid"] = (
+            miner_uid_map[miner_id] if miner_id in miner_uid_map else None
+        )
+
+    return miner_data
+
 
 class MinerDataHandler:
     def __init__(self, engine: typing.Optional[Engine] = None):
         # Use the provided engine or fall back to the default engine
         self.engine = engine or get_engine()
 
+        # Last persisted state of the miners and metagraph_history tables,
+        # used to skip the writes when nothing changed since the last cycle.
+        # map miner_uid -> (coldkey, hotkey)
+        self.miners_snapshot: dict[int, tuple] = {}
+        # map neuron_uid -> values of METAGRAPH_HISTORY_TRACKED_FIELDS
+        self.metagraph_snapshot: dict[int, tuple] = {}
+
+        # map operation name -> {"count", "total", "max"} in seconds
+        self.db_latency: dict[str, dict] = {}
+        # the operations run in the cycle executor and the scoring worker
+        # threads, guards db_latency
+        self.db_latency_lock = threading.Lock()
+
+    def record_db_latency(self, operation: str, elapsed: float):
+        with self.db_latency_lock:
+            stats = self.db_latency.setdefault(
+                operation, {"count": 0, "total": 0.0, "max": 0.0}
+            )
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    def log_db_stats(self):
+        """Log the per-operation latency since the last call and the pool status."""
+        with self.db_latency_lock:
+            db_latency, self.db_latency = self.db_latency, {}
+        for operation, stats in sorted(db_latency.items()):
+            bt.logging.debug(
+                f"db {operation}: count={stats['count']} "
+                f"avg={stats['total'] / stats['count']:.3f}s "
+                f"max={stats['max']:.3f}s",
+                "db_latency",
+            )
+        bt.logging.debug(self.engine.pool.status(), "db_pool")
+
     def get_miner_uids(self, connection: Connection):
         ranked_miners = select(
             Miner,
@@ -84,28 +191,419 @@ class MinerDataHandler:
 
         return miner_Uid_map
 
-    def get_latest_asset(self, time_length: int) -> str | None:
-        try:
-            with self.engine.connect() as connection:
-                query = (
-                    select(
-                        ValidatorRequest.asset,
-                    )
-                    .where(ValidatorRequest.time_length == time_length)
-                    .limit(1)
-                    .order_by(ValidatorRequest.start_time.desc())
+    def changed_miners(self, metagraph_info: list) -> list:
+        return [
+            miner
+            for miner in metagraph_info
+            if self.miners_snapshot.get(miner["neuron_uid"])
+            != (miner["coldkey"], miner["hotkey"])
+        ]
+
+    def record_miners_snapshot(self, miners: list):
+        for miner in miners:
+            self.miners_snapshot[miner["neuron_uid"]] = (
+                miner["coldkey"],
+                miner["hotkey"],
+            )
+
+    def changed_metagraph_items(self, metagraph_info: list) -> list:
+        return [
+            item
+            for item in metagraph_info
+            if self.metagraph_snapshot.get(item["neuron_uid"])
+            != metagraph_history_key(item)
+        ]
+
+    def record_metagraph_snapshot(self, metagraph_items: list):
+        for item in metagraph_items:
+            self.metagraph_snapshot[item["neuron_uid"]] = (
+                metagraph_history_key(item)
+            )
+
+    # Connection level statements, shared with AsyncMinerDataHandler
+    # which runs them through AsyncConnection.run_sync.
+
+    def fetch_latest_asset(
+        self, connection: Connection, time_length: int
+    ) -> str | None:
+        query = (
+            select(
+                ValidatorRequest.asset,
+            )
+            .where(ValidatorRequest.time_length == time_length)
+            .limit(1)
+            .order_by(ValidatorRequest.start_time.desc())
+        )
+
+        result = connection.execute(query).fetchall()
+        if len(result) == 0:
+            return None
+
+        return str(result[0].asset)
+
+    def insert_responses(
+        self,
+        connection: Connection,
+        miner_predictions: dict,
+        simulation_input: SimulationInput,
+        request_time: datetime,
+    ):
+        # Prepare the ValidatorRequest row from the simulation input:
+        validator_requests_row = {
+            "start_time": as_datetime(simulation_input.start_time),
+            "asset": simulation_input.asset,
+            "time_increment": simulation_input.time_increment,
+            "time_length": simulation_input.time_length,
+            "num_simulations": simulation_input.num_simulations,
+            "request_time": request_time,
+        }
+
+        # Insert into ValidatorRequest and get its ID
+        insert_stmt_validator = insert(ValidatorRequest).values(
+            validator_requests_row
+        )
+        result = connection.execute(insert_stmt_validator)
+        validator_requests_id = result.inserted_primary_key[0]
+
+        # Create the records to insert
+        miner_id_map = self.get_miner_uids_map(connection)
+        miner_prediction_records = []
+
+        for miner_uid, (
+            prediction,
+            format_validation,
+            process_time,
+        ) in miner_predictions.items():
+            if miner_uid not in miner_id_map:
+                bt.logging.error(
+                    f"in save_responses, miner_uid {miner_uid} not found in miners table"
+                )
+                continue
+            miner_id = miner_id_map[miner_uid]
+            miner_prediction_records.append(
+                {
+                    "validator_requests_id": validator_requests_id,
+                    "miner_uid": miner_uid,  # deprecated
+                    "miner_id": miner_id,
+                    "prediction": (
+                        prediction
+                        if format_validation == response_validation_v2.CORRECT
+                        else []
+                    ),
+                    "format_validation": format_validation,
+                    "process_time": process_time,
+                }
+            )
+
+        # 4. Insert into miners table
+        if len(miner_prediction_records) == 0:
+            return None
+        insert_stmt_miner_predictions = insert(MinerPrediction).values(
+            miner_prediction_records
+        )
+        connection.execute(insert_stmt_miner_predictions)
+        return validator_requests_id  # TODO: finish this: refactor to add the validator_requests_id in the score and reward table
+
+    def write_miner_scores(
+        self,
+        connection: Connection,
+        real_prices: list[dict],
+        validator_requests_id: int,
+        reward_details: list[dict],
+        scored_time: datetime,
+    ):
+        # update validator request with the real paths
+        if real_prices is not None and len(real_prices) > 0:
+            real_prices = [
+                (None if (isinstance(x, float) and math.isnan(x)) else x)
+                for x in real_prices
+            ]
+            update_stmt_validator = (
+                update(ValidatorRequest)
+                .where(ValidatorRequest.id == validator_requests_id)
+                .values(
+                    {
+                        "real_prices": real_prices,
+                    }
+                )
+            )
+            connection.execute(update_stmt_validator)
+
+        rows_to_insert = []
+        for row in reward_details:
+            rows_to_insert.append(
+                {
+                    "miner_uid": row["miner_uid"],  # deprecated
+                    "scored_time": scored_time,
+                    "miner_predictions_id": row["miner_prediction_id"],
+                    "score_details_v3": {
+                        "total_crps": row["total_crps"],
+                        "percentile90": row["percentile90"],
+                        "lowest_score": row["lowest_score"],
+                        "prompt_score_v3": row["prompt_score_v3"],
+                        "crps_data": row["crps_data"],
+                    },
+                    "prompt_score_v3": row["prompt_score_v3"],
+                }
+            )
+        insert_stmt_miner_scores = (
+            insert(MinerScore)
+            .values(rows_to_insert)
+            .on_conflict_do_update(
+                constraint="uq_miner_scores_miner_predictions_id",
+                set_={
+                    "score_details_v3": {
+                        "total_crps": row["total_crps"],
+                        "percentile90": row["percentile90"],
+                        "lowest_score": row["lowest_score"],
+                        "prompt_score_v3": row["prompt_score_v3"],
+                        "crps_data": row["crps_data"],
+                    },
+                    "prompt_score_v3": row["prompt_score_v3"],
+                },
+            )
+        )
+        connection.execute(insert_stmt_miner_scores)
+
+    def fetch_miner_uid_of_prediction_request(
+        self, connection: Connection, validator_request_id: int
+    ) -> list[int]:
+        query = (
+            select(
+                Miner.miner_uid,
+            )
+            .select_from(MinerPrediction)
+            .join(
+                Miner,
+                Miner.id == MinerPrediction.miner_id,
+            )
+            .where(
+                MinerPrediction.validator_requests_id == validator_request_id
+            )
+        )
+
+        data = connection.execute(query).fetchall()
+        result = []
+        for row in data:
+            result.append(row.miner_uid)
+
+        return result
+
+    def fetch_miner_prediction(
+        self,
+        connection: Connection,
+        miner_uid: int,
+        validator_request_id: int,
+    ) -> MinerPrediction:
+        query = (
+            select(
+                MinerPrediction.id,
+                MinerPrediction.prediction,
+                MinerPrediction.format_validation,
+                MinerPrediction.process_time,
+            )
+            .select_from(MinerPrediction)
+            .join(
+                Miner,
+                Miner.id == MinerPrediction.miner_id,
+            )
+            .where(
+                Miner.miner_uid == miner_uid,
+                MinerPrediction.validator_requests_id == validator_request_id,
+            )
+            .limit(1)
+        )
+
+        result = MinerPrediction()
+        row = connection.execute(query).fetchone()
+        if row is not None:
+            result.id = row.id
+            result.prediction = row.prediction
+            result.format_validation = row.format_validation
+            result.process_time = row.process_time
+
+        return result
+
+    def fetch_validator_requests_to_score(
+        self,
+        connection: Connection,
+        scored_time: datetime,
+        window_days: int,
+        time_length: int,
+    ) -> list[ValidatorRequest]:
+        subq = (
+            select(1)
+            .select_from(
+                join(
+                    MinerPrediction,
+                    MinerScore,
+                    MinerPrediction.id == MinerScore.miner_predictions_id,
                 )
+            )
+            .where(
+                and_(
+                    MinerPrediction.validator_requests_id
+                    == ValidatorRequest.id,
+                    MinerScore.prompt_score_v3.isnot(None),
+                )
+            )
+        )
+
+        window_start = (
+            ValidatorRequest.start_time
+            + literal_column("INTERVAL '1 second'")
+            * ValidatorRequest.time_length
+        )
 
-                result = connection.execute(query).fetchall()
-                if len(result) == 0:
-                    return None
+        query = (
+            select(
+                ValidatorRequest.id,
+                ValidatorRequest.start_time,
+                ValidatorRequest.asset,
+                ValidatorRequest.time_length,
+                ValidatorRequest.time_increment,
+            )
+            .where(
+                and_(
+                    # Compare start_time plus an interval (in seconds) to the scored_time.
+                    window_start < scored_time,
+                    # Compare start_time plus an interval (in seconds) to the window_days.
+                    # This is to ensure that we only get requests that are within the window_days.
+                    # Because we want to include in the moving average only the requests that are within the window_days.
+                    window_start >= scored_time - timedelta(days=window_days),
+                    # Exclude records that have a matching miner_prediction via the NOT EXISTS clause.
+                    not_(exists(subq)),
+                    ValidatorRequest.time_length == time_length,
+                )
+            )
+            .order_by(ValidatorRequest.start_time.asc())
+        )
 
-                return str(result[0].asset)
+        results: list[ValidatorRequest] = []
+        for row in connection.execute(query).fetchall():
+            vr = ValidatorRequest()
+            vr.id = row.id
+            vr.start_time = row.start_time
+            vr.asset = row.asset
+            vr.time_length = row.time_length
+            vr.time_increment = row.time_increment
+            results.append(vr)
+
+        return results
+
+    def upsert_miners(self, connection: Connection, miners: list):
+        insert_stmt = (
+            insert(Miner)
+            .values(
+                [
+                    {
+                        "miner_uid": miner["neuron_uid"],
+                        "coldkey": miner["coldkey"],
+                        "hotkey": miner["hotkey"],
+                    }
+                    for miner in miners
+                ]
+            )
+            .on_conflict_do_update(
+                # index_elements=["miner_uid", "coldkey", "hotkey"],
+                constraint="uq_miners_miner_uid_coldkey_hotkey",
+                # update the updated_at column
+                set_={"updated_at": datetime.now()},
+            )
+        )
+        connection.execute(insert_stmt)
+
+    def insert_metagraph_history(
+        self, connection: Connection, metagraph_items: list
+    ):
+        insert_stmt = insert(MetagraphHistory).values(
+            [
+                {**item, "updated_at": as_datetime(item["updated_at"])}
+                for item in metagraph_items
+            ]
+        )
+        connection.execute(insert_stmt)
+
+    def fetch_miner_scores(
+        self,
+        connection: Connection,
+        scored_time: datetime,
+        window_days: int,
+        time_length: int,
+    ) -> pd.DataFrame:
+        min_scored_time = scored_time - timedelta(days=window_days)
+        query = (
+            select(
+                MinerPrediction.miner_id,
+                MinerScore.prompt_score_v3,
+                MinerScore.scored_time,
+                MinerScore.score_details_v3,
+                ValidatorRequest.asset,
+            )
+            .select_from(MinerScore)
+            .join(
+                MinerPrediction,
+                MinerPrediction.id == MinerScore.miner_predictions_id,
+            )
+            .join(
+                ValidatorRequest,
+                ValidatorRequest.id == MinerPrediction.validator_requests_id,
+            )
+            .where(
+                and_(
+                    MinerScore.scored_time > min_scored_time,
+                    ValidatorRequest.time_length == time_length,
+                )
+            )
+        )
+
+        result = connection.execute(query)
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    def insert_miner_rewards(
+        self, connection: Connection, miner_rewards_data: list[dict]
+    ):
+        insert_stmt = insert(MinerReward).values(
+            [
+                {**row, "updated_at": as_datetime(row["updated_at"])}
+                for row in miner_rewards_data
+            ]
+        )
+        connection.execute(insert_stmt)
+
+    def insert_weights_history(
+        self,
+        connection: Connection,
+        miner_uids: list[int],
+        miner_weights: list[float],
+        norm_miner_uids: list[str],
+        norm_miner_weights: list[str],
+        update_result: str,
+        scored_time: datetime,
+    ):
+        update_weights_rows = {
+            "miner_uids": miner_uids,
+            "miner_weights": miner_weights,
+            "norm_miner_uids": norm_miner_uids,
+            "norm_miner_weights": norm_miner_weights,
+            "update_result": update_result,
+            "updated_at": scored_time,
+        }
+
+        insert_stmt = insert(WeightsUpdateHistory).values(update_weights_rows)
+        connection.execute(insert_stmt)
+
+    @timed_db_operation
+    def get_latest_asset(self, time_length: int) -> str | None:
+        try:
+            with self.engine.connect() as connection:
+                return self.fetch_latest_asset(connection, time_length)
         except Exception as e:
             bt.logging.error(f"in get_next_asset (got an exception): {e}")
             traceback.print_exc(file=sys.stderr)
             return None
 
+    @timed_db_operation
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_random_exponential(multiplier=7),
@@ -119,70 +617,20 @@ class MinerDataHandler:
         request_time: datetime,
     ):
         """Save miner predictions and simulation input."""
-
-        # Prepare the ValidatorRequest row from the simulation input:
-        validator_requests_row = {
-            "start_time": simulation_input.start_time,
-            "asset": simulation_input.asset,
-            "time_increment": simulation_input.time_increment,
-            "time_length": simulation_input.time_length,
-            "num_simulations": simulation_input.num_simulations,
-            "request_time": request_time.isoformat(),
-        }
-
         try:
             with self.engine.connect() as connection:
                 with connection.begin():
-                    # Insert into ValidatorRequest and get its ID
-                    insert_stmt_validator = insert(ValidatorRequest).values(
-                        validator_requests_row
+                    return self.insert_responses(
+                        connection,
+                        miner_predictions,
+                        simulation_input,
+                        request_time,
                     )
-                    result = connection.execute(insert_stmt_validator)
-                    validator_requests_id = result.inserted_primary_key[0]
-
-                    # Create the records to insert
-                    miner_id_map = self.get_miner_uids_map(connection)
-                    miner_prediction_records = []
-
-                    for miner_uid, (
-                        prediction,
-                        format_validation,
-                        process_time,
-                    ) in miner_predictions.items():
-                        if miner_uid not in miner_id_map:
-                            bt.logging.error(
-                                f"in save_responses, miner_uid {miner_uid} not found in miners table"
-                            )
-                            continue
-                        miner_id = miner_id_map[miner_uid]
-                        miner_prediction_records.append(
-                            {
-                                "validator_requests_id": validator_requests_id,
-                                "miner_uid": miner_uid,  # deprecated
-                                "miner_id": miner_id,
-                                "prediction": (
-                                    prediction
-                                    if format_validation
-                                    == response_validation_v2.CORRECT
-                                    else []
-                                ),
-                                "format_validation": format_validation,
-                                "process_time": process_time,
-                            }
-                        )
-
-                    # 4. Insert into miners table
-                    if len(miner_prediction_records) == 0:
-                        return None
-                    insert_stmt_miner_predictions = insert(
-                        MinerPrediction
-                    ).values(miner_prediction_records)
-                    connection.execute(insert_stmt_miner_predictions)
-            return validator_requests_id  # TODO: finish this: refactor to add the validator_requests_id in the score and reward table
         except Exception as e:
             bt.logging.error(f"in save_responses (got an exception): {e}")
             traceback.print_exc(file=sys.stderr)
 
+    @timed_db_operation
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_random_exponential(multiplier=7),
@@ -199,97 +647,27 @@ class MinerDataHandler:
         try:
             with self.engine.connect() as connection:
                 with connection.begin():
-                    # update validator request with the real paths
-                    if real_prices is not None and len(real_prices) > 0:
-                        real_prices = [
-                            (
-                                None
-                                if (isinstance(x, float) and math.isnan(x))
-                                else x
-                            )
-                            for x in real_prices
-                        ]
-                        update_stmt_validator = (
-                            update(ValidatorRequest)
-                            .where(
-                                ValidatorRequest.id == validator_requests_id
-                            )
-                            .values(
-                                {
-                                    "real_prices": real_prices,
-                                }
-                            )
-                        )
-                        connection.execute(update_stmt_validator)
-
-                    rows_to_insert = []
-                    for row in reward_details:
-                        rows_to_insert.append(
-                            {
-                                "miner_uid": row["miner_uid"],  # deprecated
-                                "scored_time": scored_time.isoformat(),
-                                "miner_predictions_id": row[
-                                    "miner_prediction_id"
-                                ],
-                                "score_details_v3": {
-                                    "total_crps": row["total_crps"],
-                                    "percentile90": row["percentile90"],
-                                    "lowest_score": row["lowest_score"],
-                                    "prompt_score_v3": row["prompt_score_v3"],
-                                    "crps_data": row["crps_data"],
-                                },
-                                "prompt_score_v3": row["prompt_score_v3"],
-                            }
-                        )
-                    insert_stmt_miner_scores = (
-                        insert(MinerScore)
-                        .values(rows_to_insert)
-                        .on_conflict_do_update(
-                            constraint="uq_miner_scores_miner_predictions_id",
-                            set_={
-                                "score_details_v3": {
-                                    "total_crps": row["total_crps"],
-                                    "percentile90": row["percentile90"],
-                                    "lowest_score": row["lowest_score"],
-                                    "prompt_score_v3": row["prompt_score_v3"],
-                                    "crps_data": row["crps_data"],
-                                },
-                                "prompt_score_v3": row["prompt_score_v3"],
-                            },
-                        )
+                    self.write_miner_scores(
+                        connection,
+                        real_prices,
+                        validator_requests_id,
+                        reward_details,
+                        scored_time,
                     )
-                    connection.execute(insert_stmt_miner_scores)
         except Exception as e:
             bt.logging.error(f"in set_miner_scores (got an exception): {e}")
             traceback.print_exc(file=sys.stderr)
 
+    @timed_db_operation
     def get_miner_uid_of_prediction_request(
         self, validator_request_id: int
     ) -> typing.Optional[list[int]]:
         """Retrieve the miner_uid of the given validator_request_id."""
         try:
             with self.engine.connect() as connection:
-                query = (
-                    select(
-                        Miner.miner_uid,
-                    )
-                    .select_from(MinerPrediction)
-                    .join(
-                        Miner,
-                        Miner.id == MinerPrediction.miner_id,
-                    )
-                    .where(
-                        MinerPrediction.validator_requests_id
-                        == validator_request_id
-                    )
+                return self.fetch_miner_uid_of_prediction_request(
+                    connection, validator_request_id
                 )
-
-                data = connection.execute(query).fetchall()
-                result = []
-                for row in data:
-                    result.append(row.miner_uid)
-
-            return result
         except Exception as e:
             bt.logging.error(
                 f"in get_miner_uid_of_prediction_request (got an exception): {e}"
@@ -297,41 +675,16 @@ class MinerDataHandler:
             traceback.print_exc(file=sys.stderr)
             return None
 
+    @timed_db_operation
     def get_miner_prediction(
         self, miner_uid: int, validator_request_id: int
     ) -> typing.Optional[MinerPrediction]:
         """Retrieve the record with the longest valid interval for the given miner_id."""
         try:
             with self.engine.connect() as connection:
-                query = (
-                    select(
-                        MinerPrediction.id,
-                        MinerPrediction.prediction,
-                        MinerPrediction.format_validation,
-                        MinerPrediction.process_time,
-                    )
-                    .select_from(MinerPrediction)
-                    .join(
-                        Miner,
-                        Miner.id == MinerPrediction.miner_id,
-                    )
-                    .where(
-                        Miner.miner_uid == miner_uid,
-                        MinerPrediction.validator_requests_id
-                        == validator_request_id,
-                    )
-                    .limit(1)
+                return self.fetch_miner_prediction(
+                    connection, miner_uid, validator_request_id
                 )
-
-                result = MinerPrediction()
-                row = connection.execute(query).fetchone()
-                if row is not None:
-                    result.id = row.id
-                    result.prediction = row.prediction
-                    result.format_validation = row.format_validation
-                    result.process_time = row.process_time
-
-            return result
         except Exception as e:
             bt.logging.error(
                 f"in get_miner_prediction (got an exception): {e}"
@@ -339,6 +692,7 @@ class MinerDataHandler:
             traceback.print_exc(file=sys.stderr)
             return None
 
+    @timed_db_operation
     def get_validator_requests_to_score(
         self,
         scored_time: datetime,
@@ -356,67 +710,9 @@ class MinerDataHandler:
 
         try:
             with self.engine.connect() as connection:
-                subq = (
-                    select(1)
-                    .select_from(
-                        join(
-                            MinerPrediction,
-                            MinerScore,
-                            MinerPrediction.id
-                            == MinerScore.miner_predictions_id,
-                        )
-                    )
-                    .where(
-                        and_(
-                            MinerPrediction.validator_requests_id
-                            == ValidatorRequest.id,
-                            MinerScore.prompt_score_v3.isnot(None),
-                        )
-                    )
-                )
-
-                window_start = (
-                    ValidatorRequest.start_time
-                    + literal_column("INTERVAL '1 second'")
-                    * ValidatorRequest.time_length
+                return self.fetch_validator_requests_to_score(
+                    connection, scored_time, window_days, time_length
                 )
-
-                query = (
-                    select(
-                        ValidatorRequest.id,
-                        ValidatorRequest.start_time,
-                        ValidatorRequest.asset,
-                        ValidatorRequest.time_length,
-                        ValidatorRequest.time_increment,
-                    )
-                    .where(
-                        and_(
-                            # Compare start_time plus an interval (in seconds) to the scored_time.
-                            window_start < scored_time,
-                            # Compare start_time plus an interval (in seconds) to the window_days.
-                            # This is to ensure that we only get requests that are within the window_days.
-                            # Because we want to include in the moving average only the requests that are within the window_days.
-                            window_start
-                            >= scored_time - timedelta(days=window_days),
-                            # Exclude records that have a matching miner_prediction via the NOT EXISTS clause.
-                            not_(exists(subq)),
-                            ValidatorRequest.time_length == time_length,
-                        )
-                    )
-                    .order_by(ValidatorRequest.start_time.asc())
-                )
-
-                results: list[ValidatorRequest] = []
-                for row in connection.execute(query).fetchall():
-                    vr = ValidatorRequest()
-                    vr.id = row.id
-                    vr.start_time = row.start_time
-                    vr.asset = row.asset
-                    vr.time_length = row.time_length
-                    vr.time_increment = row.time_increment
-                    results.append(vr)
-
-                return results
         except Exception as e:
             bt.logging.error(
                 f"in get_latest_prediction_request (got an exception): {e}"
@@ -424,6 +720,7 @@ class MinerDataHandler:
             traceback.print_exc(file=sys.stderr)
             return None
 
+    @timed_db_operation
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_random_exponential(multiplier=7),
@@ -431,94 +728,78 @@ class MinerDataHandler:
         before=before_log(bt.logging._logger, logging.DEBUG),
     )
     def insert_new_miners(self, metagraph_info: list):
-        """Insert or update miners table with the provided data."""
+        """Insert or update miners table with the provided data.
+
+        Only the miners whose (uid, coldkey, hotkey) changed since the
+        last successful write are sent to the database.
+        """
+        changed_miners = self.changed_miners(metagraph_info)
+
+        if len(changed_miners) == 0:
+            bt.logging.debug("miners unchanged, skipping insert_new_miners")
+            return
+
         try:
             with self.engine.connect() as connection:
                 with connection.begin():
-                    insert_stmt = (
-                        insert(Miner)
-                        .values(
-                            [
-                                {
-                                    "miner_uid": miner["neuron_uid"],
-                                    "coldkey": miner["coldkey"],
-                                    "hotkey": miner["hotkey"],
-                                }
-                                for miner in metagraph_info
-                            ]
-                        )
-                        .on_conflict_do_update(
-                            # index_elements=["miner_uid", "coldkey", "hotkey"],
-                            constraint="uq_miners_miner_uid_coldkey_hotkey",
-                            # update the updated_at column
-                            set_={"updated_at": datetime.now()},
-                        )
-                    )
-                    connection.execute(insert_stmt)
+                    self.upsert_miners(connection, changed_miners)
+
+            self.record_miners_snapshot(changed_miners)
+            bt.logging.debug(
+                f"insert_new_miners: {len(changed_miners)} of {len(metagraph_info)} miners changed"
+            )
         except Exception as e:
             bt.logging.error(f"in insert_new_miners (got an exception): {e}")
             traceback.print_exc(file=sys.stderr)
 
+    @timed_db_operation
     def update_metagraph_history(self, metagraph_info: list):
+        """Insert a metagraph_history row for each neuron that changed
+        since the last successful write."""
+        changed_items = self.changed_metagraph_items(metagraph_info)
+
+        if len(changed_items) == 0:
+            bt.logging.debug(
+                "metagraph unchanged, skipping update_metagraph_history"
+            )
+            return
+
         try:
             with self.engine.connect() as connection:
                 with connection.begin():
-                    insert_stmt = insert(MetagraphHistory).values(
-                        metagraph_info
-                    )
-                    connection.execute(insert_stmt)
+                    self.insert_metagraph_history(connection, changed_items)
+
+            self.record_metagraph_snapshot(changed_items)
+            bt.logging.debug(
+                f"update_metagraph_history: {len(changed_items)} of {len(metagraph_info)} neurons changed"
+            )
         except Exception as e:
             bt.logging.error(
                 f"in update_metagraph_history (got an exception): {e}"
             )
             traceback.print_exc(file=sys.stderr)
 
+    @timed_db_operation
     def get_miner_scores(
         self,
         scored_time: datetime,
         window_days: int,
         time_length: int | None = None,
     ):
-        min_scored_time = scored_time - timedelta(days=window_days)
         if time_length is None:
             time_length = prompt_config.LOW_FREQUENCY.time_length
 
         try:
             with self.engine.connect() as connection:
-                query = (
-                    select(
-                        MinerPrediction.miner_id,
-                        MinerScore.prompt_score_v3,
-                        MinerScore.scored_time,
-                        MinerScore.score_details_v3,
-                        ValidatorRequest.asset,
-                    )
-                    .select_from(MinerScore)
-                    .join(
-                        MinerPrediction,
-                        MinerPrediction.id == MinerScore.miner_predictions_id,
-                    )
-                    .join(
-                        ValidatorRequest,
-                        ValidatorRequest.id
-                        == MinerPrediction.validator_requests_id,
-                    )
-                    .where(
-                        and_(
-                            MinerScore.scored_time > min_scored_time,
-                            ValidatorRequest.time_length == time_length,
-                        )
-                    )
+                return self.fetch_miner_scores(
+                    connection, scored_time, window_days, time_length
                 )
-
-                result = connection.execute(query)
-
-            return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
         except Exception as e:
             bt.logging.error(f"in get_miner_scores (got an exception): {e}")
             traceback.print_exc(file=sys.stderr)
             return pd.DataFrame()
 
+    @timed_db_operation
     def populate_miner_uid_in_miner_data(self, miner_data: list[dict]):
         try:
             with self.engine.connect() as connection:
@@ -531,14 +812,9 @@ class MinerDataHandler:
             traceback.print_exc(file=sys.stderr)
             return None
 
-        for row in miner_data:
-            miner_id = row["miner_id"]
-            row["miner_uid"] = (
-                miner_uid_map[miner_id] if miner_id in miner_uid_map else None
-            )
-
-        return miner_data
+        return assign_miner_uids(miner_data, miner_uid_map)
 
+    @timed_db_operation
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_random_exponential(multiplier=7),
@@ -549,16 +825,14 @@ class MinerDataHandler:
         try:
             with self.engine.connect() as connection:
                 with connection.begin():
-                    insert_stmt = insert(MinerReward).values(
-                        miner_rewards_data
-                    )
-                    connection.execute(insert_stmt)
+                    self.insert_miner_rewards(connection, miner_rewards_data)
         except Exception as e:
             bt.logging.error(
                 f"in update_miner_rewards (got an exception): {e}"
             )
             traceback.print_exc(file=sys.stderr)
 
+    @timed_db_operation
     def update_weights_history(
         self,
         miner_uids: list[int],
@@ -568,22 +842,18 @@ class MinerDataHandler:
         update_result: str,
         scored_time: datetime,
     ):
-        update_weights_rows = {
-            "miner_uids": miner_uids,
-            "miner_weights": miner_weights,
-            "norm_miner_uids": norm_miner_uids,
-            "norm_miner_weights": norm_miner_weights,
-            "update_result": update_result,
-            "updated_at": scored_time.isoformat(),
-        }
-
         try:
             with self.engine.connect() as connection:
                 with connection.begin():
-                    insert_stmt = insert(WeightsUpdateHistory).values(
-                        update_weights_rows
+                    self.insert_weights_history(
+                        connection,
+                        miner_uids,
+                        miner_weights,
+                        norm_miner_uids,
+                        norm_miner_weights,
+                        update_result,
+                        scored_time,
                     )
-                    connection.execute(insert_stmt)
         except Exception as e:
             bt.logging.error(
                 f"in update_weights_history (got an exception): {e}"
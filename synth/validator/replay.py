@@ -0,0 +1,351 @@
+"""
+Offline replay of the validator scoring.
+
+Re-runs calculate_scores and calculate_moving_average_and_update_rewards
+over a past period on a snapshot of the validator database, without the
+chain, the price provider or the miners: the real prices are the ones
+cached in validator_requests.real_prices when the requests were scored.
+At each replayed time the weights that
+send_weights_to_bittensor_and_update_weights_history would have sent
+are compared to the ones recorded in weights_update_history.
+
+The scores and rewards of the period are deleted and recomputed, so run
+it on a copy of the database:
+
+    python -m synth.validator.replay --database_url postgresql://... \\
+        --start 2025-06-01T00:00:00+00:00 --end 2025-06-02T00:00:00+00:00
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import json
+import sys
+import time
+import traceback
+import typing
+
+
+import bittensor as bt
+import numpy as np
+from sqlalchemy import Engine, and_, create_engine, delete, select
+
+
+from synth.db.models import (
+    MinerReward,
+    MinerScore,
+    ValidatorRequest,
+    WeightsUpdateHistory,
+)
+from synth.validator import prompt_config
+from synth.validator.forward import (
+    append_owner_weight,
+    calculate_moving_average_and_update_rewards,
+    calculate_scores,
+    owner_uid,
+)
+from synth.validator.miner_data_handler import MinerDataHandler
+
+
+class CachedPriceDataProvider:
+    """PriceDataProvider returning the real prices stored in
+    validator_requests.real_prices."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def fetch_data(self, validator_request: ValidatorRequest) -> list:
+        with self.engine.connect() as connection:
+            real_prices = connection.execute(
+                select(ValidatorRequest.real_prices).where(
+                    ValidatorRequest.id == validator_request.id
+                )
+            ).scalar_one_or_none()
+
+        if real_prices is None or len(real_prices) == 0:
+            raise ValueError(
+                f"no cached real prices for validator request {validator_request.id}"
+            )
+
+        # missing prices are stored as null, see write_miner_scores
+        return [np.nan if price is None else price for price in real_prices]
+
+
+def reset_period(engine: Engine, start: datetime, end: datetime):
+    """Delete the scores and rewards the replay recomputes."""
+    with engine.begin() as connection:
+        result = connection.execute(
+            delete(MinerScore).where(
+                and_(
+                    MinerScore.scored_time > start,
+                    MinerScore.scored_time <= end,
+                )
+            )
+        )
+        bt.logging.info(f"deleted {result.rowcount} miner scores")
+
+        result = connection.execute(
+            delete(MinerReward).where(
+                and_(
+                    MinerReward.updated_at >= start,
+                    MinerReward.updated_at <= end,
+                )
+            )
+        )
+        bt.logging.info(f"deleted {result.rowcount} miner rewards")
+
+
+def get_weights_history(
+    engine: Engine, start: datetime, end: datetime
+) -> list[dict]:
+    with engine.connect() as connection:
+        result = connection.execute(
+            select(
+                WeightsUpdateHistory.updated_at,
+                WeightsUpdateHistory.miner_uids,
+                WeightsUpdateHistory.miner_weights,
+                WeightsUpdateHistory.update_result,
+            )
+            .where(
+                and_(
+                    WeightsUpdateHistory.updated_at >= start,
+                    WeightsUpdateHistory.updated_at <= end,
+                )
+            )
+            .order_by(WeightsUpdateHistory.updated_at)
+        )
+        return [dict(row._mapping) for row in result]
+
+
+def compare_weights(
+    replayed: dict[int, float],
+    recorded: typing.Optional[dict[int, float]],
+    tolerance: float,
+) -> dict:
+    if recorded is None:
+        return {"recorded": False}
+
+    uids = sorted(set(replayed) | set(recorded))
+    differences = {
+        uid: abs(replayed.get(uid, 0.0) - recorded.get(uid, 0.0))
+        for uid in uids
+    }
+    max_difference = max(differences.values(), default=0.0)
+    return {
+        "recorded": True,
+        "identical": max_difference <= tolerance,
+        "max_difference": max_difference,
+        "missing_uids": sorted(set(recorded) - set(replayed)),
+        "extra_uids": sorted(set(replayed) - set(recorded)),
+    }
+
+
+def replay_times(
+    weights_history: list[dict],
+    start: datetime,
+    end: datetime,
+    interval_minutes: typing.Optional[int],
+) -> list[datetime]:
+    """The times of weights_update_history, or a regular grid."""
+    if interval_minutes is None and len(weights_history) > 0:
+        return [row["updated_at"] for row in weights_history]
+
+    interval = timedelta(
+        minutes=interval_minutes
+        or prompt_config.LOW_FREQUENCY.total_cycle_minutes
+    )
+    times = []
+    scored_time = start + interval
+    while scored_time <= end:
+        times.append(scored_time)
+        scored_time += interval
+    return times
+
+
+def replay_step(
+    miner_data_handler: MinerDataHandler,
+    price_data_provider: CachedPriceDataProvider,
+    scored_time: datetime,
+    network: str,
+) -> typing.Optional[dict[int, float]]:
+    """What forward_score_high_frequency and forward_score_low_frequency
+    do at scored_time, return the weights by miner uid or None when no
+    weights would have been sent."""
+    calculate_scores(
+        miner_data_handler,
+        price_data_provider,
+        scored_time,
+        prompt_config.HIGH_FREQUENCY,
+    )
+    success = calculate_scores(
+        miner_data_handler,
+        price_data_provider,
+        scored_time,
+        prompt_config.LOW_FREQUENCY,
+    )
+    if not success:
+        return None
+
+    moving_averages_data = calculate_moving_average_and_update_rewards(
+        miner_data_handler=miner_data_handler,
+        scored_time=scored_time,
+    )
+    if len(moving_averages_data) == 0:
+        return None
+
+    append_owner_weight(moving_averages_data, owner_uid(network), scored_time)
+
+    return {
+        int(item["miner_uid"]): float(item["reward_weight"])
+        for item in moving_averages_data
+    }
+
+
+def replay(
+    engine: Engine,
+    start: datetime,
+    end: datetime,
+    network: str = "finney",
+    interval_minutes: typing.Optional[int] = None,
+    tolerance: float = 1e-9,
+) -> dict:
+    weights_history = get_weights_history(engine, start, end)
+    recorded_weights = {
+        row["updated_at"]: {
+            int(uid): float(weight)
+            for uid, weight in zip(row["miner_uids"], row["miner_weights"])
+        }
+        for row in weights_history
+    }
+    times = replay_times(weights_history, start, end, interval_minutes)
+
+    reset_period(engine, start, end)
+
+    miner_data_handler = MinerDataHandler(engine)
+    price_data_provider = CachedPriceDataProvider(engine)
+
+    replay_start = time.perf_counter()
+    steps = []
+    for scored_time in times:
+        step_start = time.perf_counter()
+        weights = replay_step(
+            miner_data_handler, price_data_provider, scored_time, network
+        )
+        step = {
+            "scored_time": scored_time.isoformat(),
+            "seconds": time.perf_counter() - step_start,
+            "weights": (
+                None
+                if weights is None
+                else {str(uid): weight for uid, weight in weights.items()}
+            ),
+        }
+        if weights is not None:
+            step["comparison"] = compare_weights(
+                weights, recorded_weights.get(scored_time), tolerance
+            )
+        steps.append(step)
+        bt.logging.info(
+            f"replayed {scored_time.isoformat()}: {step.get('comparison')}"
+        )
+
+    replay_seconds = time.perf_counter() - replay_start
+    compared = [
+        step["comparison"]
+        for step in steps
+        if step.get("comparison", {}).get("recorded")
+    ]
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "steps": steps,
+        "summary": {
+            "replayed_steps": len(steps),
+            "steps_with_weights": sum(
+                step["weights"] is not None for step in steps
+            ),
+            "compared_steps": len(compared),
+            "identical_steps": sum(
+                comparison["identical"] for comparison in compared
+            ),
+            "max_difference": max(
+                (comparison["max_difference"] for comparison in compared),
+                default=0.0,
+            ),
+            "replay_seconds": replay_seconds,
+            # simulated seconds per wall clock second
+            "speedup": (end - start).total_seconds()
+            / max(replay_seconds, 1e-9),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay the validator scoring on a database snapshot"
+    )
+    parser.add_argument(
+        "--database_url",
+        type=str,
+        required=True,
+        help="Copy of the validator database, its scores are rewritten",
+    )
+    parser.add_argument("--start", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.fromisoformat, required=True)
+    parser.add_argument(
+        "--network",
+        type=str,
+        default="finney",
+        help="Network of the snapshot, gives the owner uid",
+    )
+    parser.add_argument(
+        "--interval_minutes",
+        type=int,
+        default=None,
+        help="Replay every interval instead of at the weights_update_history times",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-9,
+        help="Largest weight difference considered identical",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write the results as JSON"
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    try:
+        results = replay(
+            engine,
+            args.start,
+            args.end,
+            args.network,
+            args.interval_minutes,
+            args.tolerance,
+        )
+    except Exception as e:
+        bt.logging.error(f"in replay (got an exception): {e}")
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
+    finally:
+        engine.dispose()
+
+    summary = results["summary"]
+    print(
+        f"replayed {summary['replayed_steps']} steps in "
+        f"{summary['replay_seconds']:.1f}s ({summary['speedup']:.0f}x real time), "
+        f"{summary['identical_steps']}/{summary['compared_steps']} identical "
+        f"to weights_update_history, max difference {summary['max_difference']:.3g}"
+    )
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(
+        0 if summary["identical_steps"] == summary["compared_steps"] else 2
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,12 @@
 # The above copyright notice and this permission notice shall be included in all copies or substantial portions of
 # the Software.
 
+import asyncio
+from concurrent.futures import Executor
 import typing
 import traceback
 import sys
+import time
 
 # THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
 # THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
@@ -25,9 +28,14 @@ import pandas as pd
 import bittensor as bt
 
 
-from synth.db.models import ValidatorRequest
+from synth.db.models import MinerPrediction, ValidatorRequest
+from synth.utils import metrics
 from synth.utils.helpers import adjust_predictions
-from synth.validator.crps_calculation import calculate_crps_for_miner
+from synth.validator.async_miner_data_handler import AsyncMinerDataHandler
+from synth.validator.crps_calculation import (
+    PREDICTION_DTYPE,
+    calculate_crps_for_miner,
+)
 from synth.validator.miner_data_handler import MinerDataHandler
 from synth.validator.price_data_provider import PriceDataProvider
 from synth.validator import response_validation_v2
@@ -51,6 +59,25 @@ def reward(
         miner_uid, int(validator_request.id)
     )
 
+    return score_prediction(
+        miner_prediction, miner_uid, validator_request, real_prices
+    )
+
+
+def prediction_to_array(miner_prediction: MinerPrediction) -> np.ndarray:
+    """The simulated price paths of a stored prediction, decoded straight
+    to PREDICTION_DTYPE without an intermediate float64 array."""
+    predictions_path = adjust_predictions(list(miner_prediction.prediction))
+    return np.array(predictions_path, dtype=PREDICTION_DTYPE)
+
+
+def score_prediction(
+    miner_prediction: typing.Optional[MinerPrediction],
+    miner_uid: int,
+    validator_request: ValidatorRequest,
+    real_prices: list[float],
+):
+    """CPU bound part of reward, once the miner prediction is loaded."""
     if miner_prediction is None:
         return -1, [], None
 
@@ -61,8 +88,7 @@ def reward(
     if len(real_prices) == 0:
         return -1, [], miner_prediction
 
-    predictions_path = adjust_predictions(list(miner_prediction.prediction))
-    simulation_runs = np.array(predictions_path).astype(float)
+    simulation_runs = prediction_to_array(miner_prediction)
 
     scoring_intervals = (
         prompt_config.HIGH_FREQUENCY.scoring_intervals
@@ -119,7 +145,8 @@ def get_rewards(
         return None, [], []
 
     try:
-        real_prices = price_data_provider.fetch_data(validator_request)
+        with metrics.timer("calculate_scores.price_fetch"):
+            real_prices = price_data_provider.fetch_data(validator_request)
     except Exception as e:
         bt.logging.warning(
             f"Error fetching data for validator request {validator_request.id}: {e}"
@@ -129,25 +156,154 @@ def get_rewards(
     scores = []
     detailed_crps_data_list = []
     miner_prediction_list = []
-    for miner_uid in miner_uids:
-        # function that calculates a score for an individual miner
-        score, detailed_crps_data, miner_prediction = reward(
-            miner_data_handler,
-            miner_uid,
-            validator_request,
-            real_prices,
+    crps_duration = 0.0
+    # the prediction reads and the CRPS of the miners
+    with metrics.timer("calculate_scores.rewards"):
+        for miner_uid in miner_uids:
+            miner_prediction = miner_data_handler.get_miner_prediction(
+                miner_uid, int(validator_request.id)
+            )
+            start_time = time.perf_counter()
+            # function that calculates a score for an individual miner
+            score, detailed_crps_data, miner_prediction = score_prediction(
+                miner_prediction,
+                miner_uid,
+                validator_request,
+                real_prices,
+            )
+            crps_duration += time.perf_counter() - start_time
+            scores.append(score)
+            detailed_crps_data_list.append(detailed_crps_data)
+            miner_prediction_list.append(miner_prediction)
+    # the CRPS of the request alone, without the prediction reads
+    metrics.observe("calculate_scores.crps", crps_duration)
+
+    prompt_scores, detailed_info = summarize_rewards(
+        miner_uids, scores, detailed_crps_data_list, miner_prediction_list
+    )
+
+    if prompt_scores is None:
+        return None, [], []
+
+    return prompt_scores, detailed_info, real_prices
+
+
+async def load_reward_inputs(
+    miner_data_handler: AsyncMinerDataHandler,
+    price_data_provider: PriceDataProvider,
+    validator_request: ValidatorRequest,
+    executor: typing.Optional[Executor] = None,
+) -> typing.Optional[tuple[list[int], list]]:
+    """
+    Load the miner uids and the real prices of a validator request,
+    the I/O bound part of get_rewards.
+
+    Returns None when the request cannot be scored.
+    """
+    miner_uids = await miner_data_handler.get_miner_uid_of_prediction_request(
+        int(validator_request.id)
+    )
+
+    if miner_uids is None:
+        return None
+
+    try:
+        # PriceDataProvider is blocking (requests + tenacity)
+        with metrics.timer("calculate_scores.price_fetch"):
+            real_prices = await asyncio.get_running_loop().run_in_executor(
+                executor, price_data_provider.fetch_data, validator_request
+            )
+    except Exception as e:
+        bt.logging.warning(
+            f"Error fetching data for validator request {validator_request.id}: {e}"
+        )
+        return None
+
+    return miner_uids, real_prices
+
+
+async def get_rewards_async(
+    miner_data_handler: AsyncMinerDataHandler,
+    validator_request: ValidatorRequest,
+    miner_uids: list[int],
+    real_prices: list,
+    executor: typing.Optional[Executor] = None,
+) -> tuple[typing.Optional[np.ndarray], list, list[dict]]:
+    """
+    Same result as get_rewards, the CRPS of a miner is computed in the
+    executor while the prediction of the next miner is read from the
+    database.
+    """
+    loop = asyncio.get_running_loop()
+    validator_request_id = int(validator_request.id)
+
+    scores = []
+    detailed_crps_data_list = []
+    miner_prediction_list = []
+    next_prediction = None
+    crps_duration = 0.0
+    start_time = time.perf_counter()
+    if len(miner_uids) > 0:
+        next_prediction = asyncio.ensure_future(
+            miner_data_handler.get_miner_prediction(
+                miner_uids[0], validator_request_id
+            )
+        )
+
+    for index, miner_uid in enumerate(miner_uids):
+        miner_prediction = await next_prediction
+        if index + 1 < len(miner_uids):
+            next_prediction = asyncio.ensure_future(
+                miner_data_handler.get_miner_prediction(
+                    miner_uids[index + 1], validator_request_id
+                )
+            )
+
+        crps_start_time = time.perf_counter()
+        score, detailed_crps_data, miner_prediction = (
+            await loop.run_in_executor(
+                executor,
+                score_prediction,
+                miner_prediction,
+                miner_uid,
+                validator_request,
+                real_prices,
+            )
         )
+        crps_duration += time.perf_counter() - crps_start_time
         scores.append(score)
         detailed_crps_data_list.append(detailed_crps_data)
         miner_prediction_list.append(miner_prediction)
+    # same stages as get_rewards: the prediction reads and the CRPS, then
+    # the CRPS alone (the reads overlapping it aren't counted)
+    metrics.observe(
+        "calculate_scores.rewards", time.perf_counter() - start_time
+    )
+    metrics.observe("calculate_scores.crps", crps_duration)
+
+    prompt_scores, detailed_info = summarize_rewards(
+        miner_uids, scores, detailed_crps_data_list, miner_prediction_list
+    )
+
+    if prompt_scores is None:
+        return None, [], []
+
+    return prompt_scores, detailed_info, real_prices
 
+
+def summarize_rewards(
+    miner_uids: list[int],
+    scores: list[float],
+    detailed_crps_data_list: list,
+    miner_prediction_list: list,
+) -> tuple[typing.Optional[np.ndarray], list[dict]]:
     score_values = np.array(scores)
     prompt_scores, percentile90, lowest_score = compute_prompt_scores(
         score_values
     )
 
     if prompt_scores is None:
-        return None, [], []
+        return None, []
 
     # gather all the detailed information
     # for log and debug purposes
@@ -180,7 +336,7 @@ def get_rewards(
         )
     ]
 
-    return prompt_scores, detailed_info, real_prices
+    return prompt_scores, detailed_info
 
 
 def compute_prompt_scores(score_values: np.ndarray):
@@ -0,0 +1,77 @@
+"""Process pool workers used by calculate_scores_parallel.
+
+Each worker process owns its database engine, the engines of the
+parent cannot be shared across processes. The pool is created once by
+create_scoring_pool and reused by every scoring pass.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import typing
+
+import numpy as np
+from sqlalchemy import create_engine
+
+
+from synth.db.models import ValidatorRequest
+from synth.validator.miner_data_handler import MinerDataHandler
+from synth.validator.price_data_provider import PriceDataProvider
+from synth.validator.reward import get_rewards
+
+
+# set by init_scoring_process in each worker
+_miner_data_handler: typing.Optional[MinerDataHandler] = None
+_price_data_provider: typing.Optional[PriceDataProvider] = None
+
+
+def init_scoring_process(
+    database_url: str, price_data_provider: PriceDataProvider
+):
+    global _miner_data_handler, _price_data_provider
+
+    # a worker scores one request at a time
+    engine = create_engine(
+        database_url, pool_pre_ping=True, pool_size=1, max_overflow=1
+    )
+    _miner_data_handler = MinerDataHandler(engine)
+    _price_data_provider = price_data_provider
+
+
+def create_scoring_pool(
+    workers: int,
+    miner_data_handler: MinerDataHandler,
+    price_data_provider: PriceDataProvider,
+) -> ProcessPoolExecutor:
+    """Start the scoring processes, each one connected to the database of
+    miner_data_handler. Shut it down when the validator exits."""
+    database_url = miner_data_handler.engine.url.render_as_string(
+        hide_password=False
+    )
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_scoring_process,
+        initargs=(database_url, price_data_provider),
+    )
+
+
+def validator_request_to_dict(validator_request: ValidatorRequest) -> dict:
+    return {
+        "id": validator_request.id,
+        "start_time": validator_request.start_time,
+        "asset": validator_request.asset,
+        "time_length": validator_request.time_length,
+        "time_increment": validator_request.time_increment,
+    }
+
+
+def score_validator_request(
+    validator_request_fields: dict,
+) -> tuple[typing.Optional[np.ndarray], list, list[dict]]:
+    """Load the predictions, fetch the real prices and compute the CRPS
+    of one validator request, see get_rewards."""
+    validator_request = ValidatorRequest(**validator_request_fields)
+
+    return get_rewards(
+        miner_data_handler=_miner_data_handler,
+        price_data_provider=_price_data_provider,
+        validator_request=validator_request,
+    )
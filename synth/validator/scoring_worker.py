@@ -0,0 +1,77 @@
+import queue
+import sys
+import threading
+import time
+import traceback
+import typing
+
+
+import bittensor as bt
+
+
+class ScoringWorker(threading.Thread):
+    """
+    Runs the scoring jobs submitted by the prompt cycles in a dedicated
+    thread, so a slow scoring pass doesn't delay the next prompt.
+
+    Jobs are identified by a key (the prompt label). A scoring pass
+    scores every pending validator request of its prompt, so a job
+    submitted while another job with the same key is still waiting in
+    the queue is dropped: the queued job will cover it.
+    """
+
+    def __init__(self):
+        super().__init__(name="scoring-worker", daemon=True)
+        self.jobs: queue.Queue = queue.Queue()
+        self.queued_keys: set[str] = set()
+        self.lock = threading.Lock()
+
+    def submit(self, key: str, job: typing.Callable[[], typing.Any]) -> bool:
+        """Queue the job, return False if a job with the same key is
+        already waiting."""
+        with self.lock:
+            if key in self.queued_keys:
+                bt.logging.debug(
+                    f"{key} scoring job already queued, skipping",
+                    "scoring_worker",
+                )
+                return False
+            self.queued_keys.add(key)
+
+        self.jobs.put((key, job, time.monotonic()))
+        bt.logging.debug(
+            f"{key} scoring job queued, {self.jobs.qsize()} job(s) waiting",
+            "scoring_worker",
+        )
+        return True
+
+    def stop(self, timeout: float | None = None):
+        self.jobs.put(None)
+        self.join(timeout)
+
+    def run(self):
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                return
+
+            key, job, submitted_at = item
+            # from now on a new submission must be queued again, this job
+            # may have already read the requests to score
+            with self.lock:
+                self.queued_keys.discard(key)
+
+            started_at = time.monotonic()
+            try:
+                job()
+            except Exception as e:
+                bt.logging.error(
+                    f"in {key} scoring job (got an exception): {e}"
+                )
+                traceback.print_exc(file=sys.stderr)
+
+            bt.logging.debug(
+                f"{key} scoring job waited {started_at - submitted_at:.1f}s "
+                f"and ran {time.monotonic() - started_at:.1f}s",
+                "scoring_worker",
+            )
@@ -0,0 +1,64 @@
+import os
+
+
+import numpy as np
+
+
+from benchmarks import formatting, scoring
+from benchmarks.ingest import (
+    LATENCY_DISTRIBUTIONS,
+    run_benchmark,
+    sample_latency,
+)
+from synth.validator import prompt_config
+
+
+def test_sample_latency_mean():
+    rng = np.random.default_rng(0)
+    for distribution in LATENCY_DISTRIBUTIONS:
+        latencies = [
+            sample_latency(rng, distribution, 0.5) for _ in range(20000)
+        ]
+        assert abs(np.mean(latencies) - 0.5) < 0.02, distribution
+        assert min(latencies) >= 0
+
+
+def test_ingest_benchmark():
+    results = run_benchmark(
+        os.environ["DB_URL_TEST"],
+        miners=4,
+        rounds=1,
+        prompt=prompt_config.HIGH_FREQUENCY,
+        num_simulations=10,
+        deadline=60,
+        latency_mean=0.01,
+    )
+
+    assert len(results["rounds"]) == 1
+    assert results["rounds"][0]["valid"] == 4
+    assert results["summary"]["miner_response_seconds"]["count"] == 4
+    assert results["summary"]["peak_rss_mb"] > 0
+
+
+def test_scoring_benchmark():
+    results = scoring.run_benchmark(miners=3, num_simulations=20, repeat=1)
+
+    for prompt in scoring.PROMPTS:
+        prompt_results = results["prompts"][prompt.label]
+        assert prompt_results["scored_miners"] == 3
+        assert prompt_results["missing_real_prices"] > 0
+        assert set(prompt_results["stages"]) == {
+            "prepare_predictions",
+            "calculate_crps_for_miner",
+            "compute_prompt_scores",
+            "get_rewards",
+        }
+
+
+def test_formatting_benchmark():
+    results = formatting.run_benchmark(
+        num_simulations=5, time_points=13, repeat=1
+    )
+
+    assert results["bit_identical"]
+    assert set(results["functions"]) == {"per_float", "vectorized"}
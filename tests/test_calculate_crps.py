@@ -5,6 +5,7 @@ import numpy as np
 from synth.validator import prompt_config
 from synth.validator.crps_calculation import (
     calculate_crps_for_miner,
+    calculate_price_changes_over_intervals,
     label_observed_blocks,
 )
 from synth.validator.reward import compute_softmax
@@ -384,3 +385,52 @@ class TestCalculateCrps(unittest.TestCase):
         arr = np.array([])
         result = label_observed_blocks(arr)
         np.testing.assert_array_equal(result, [])
+
+    def test_price_changes_reuse_buffer(self):
+        price_paths = np.array(
+            [[100, 101, 99.5, 102, 103.25], [100, 98, 97.5, 99, 100.5]]
+        )
+        for interval_steps in [1, 2, 3]:
+            expected = calculate_price_changes_over_intervals(
+                price_paths, interval_steps
+            )
+            actual = calculate_price_changes_over_intervals(
+                price_paths, interval_steps, reuse_buffer=True
+            )
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_calculate_crps_for_miner_float32(self):
+        rng = np.random.default_rng(0)
+        time_points = 289
+        log_returns = rng.normal(0, 0.001, (1000, time_points - 1))
+        simulation_runs = 90000 * np.exp(
+            np.concatenate([np.zeros((1000, 1)), np.cumsum(log_returns, 1)], 1)
+        )
+        simulation_runs = np.round(simulation_runs, 2)
+        real_price_path = simulation_runs[0] * (
+            1 + rng.normal(0, 0.0005, time_points)
+        )
+        real_price_path[100:110] = np.nan
+
+        expected, expected_detail = calculate_crps_for_miner(
+            simulation_runs,
+            real_price_path,
+            300,
+            prompt_config.LOW_FREQUENCY.scoring_intervals,
+        )
+        actual, actual_detail = calculate_crps_for_miner(
+            simulation_runs.astype(np.float32),
+            real_price_path,
+            300,
+            prompt_config.LOW_FREQUENCY.scoring_intervals,
+        )
+
+        self.assertAlmostEqual(actual, expected, delta=1e-5 * expected)
+        self.assertEqual(len(actual_detail), len(expected_detail))
+        for actual_row, expected_row in zip(actual_detail, expected_detail):
+            self.assertEqual(actual_row["Interval"], expected_row["Interval"])
+            self.assertAlmostEqual(
+                actual_row["CRPS"],
+                expected_row["CRPS"],
+                delta=1e-4 * max(expected_row["CRPS"], 1e-3),
+            )
@@ -0,0 +1,41 @@
+from synth.db.models import get_connect_args
+
+
+def test_get_connect_args_defaults():
+    connect_args = get_connect_args("postgresql+psycopg2://u:p@localhost/db")
+
+    assert connect_args == {}
+
+
+def test_get_connect_args_statement_timeout():
+    connect_args = get_connect_args(
+        "postgresql+psycopg2://u:p@localhost/db",
+        statement_timeout=30000,
+        prepare_threshold=5,
+    )
+
+    # prepare_threshold is only supported by psycopg (v3)
+    assert connect_args == {"options": "-c statement_timeout=30000"}
+
+
+def test_get_connect_args_psycopg():
+    connect_args = get_connect_args(
+        "postgresql+psycopg://u:p@localhost/db",
+        statement_timeout=30000,
+        prepare_threshold=5,
+    )
+
+    assert connect_args == {
+        "options": "-c statement_timeout=30000",
+        "prepare_threshold": 5,
+    }
+
+
+def test_get_connect_args_asyncpg():
+    connect_args = get_connect_args(
+        "postgresql+asyncpg://u:p@localhost/db",
+        statement_timeout=30000,
+        prepare_threshold=5,
+    )
+
+    assert connect_args == {"server_settings": {"statement_timeout": "30000"}}
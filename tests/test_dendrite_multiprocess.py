@@ -0,0 +1,193 @@
+import asyncio
+import json
+import time
+
+
+from aiohttp import web
+import bittensor as bt
+
+
+from synth.base.dendrite_multiprocess import (
+    axon_headers,
+    preprocess_synapse_for_request,
+    request_headers,
+    serialize_body,
+    sign_axons,
+    worker,
+)
+from synth.protocol import Simulation
+from synth.simulation_input import SimulationInput
+
+
+def test_sign_axons():
+    keypair = bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+    axons = [
+        bt.AxonInfo(
+            version=1,
+            ip=f"10.0.0.{i}",
+            port=8091,
+            ip_type=4,
+            hotkey=bt.Keypair.create_from_mnemonic(
+                bt.Keypair.generate_mnemonic()
+            ).ss58_address,
+            coldkey="",
+        )
+        for i in range(3)
+    ]
+    synapse = Simulation(
+        simulation_input=SimulationInput(
+            asset="BTC",
+            start_time="2025-02-04T00:00:00+00:00",
+            time_increment=60,
+            time_length=3600,
+            num_simulations=100,
+        )
+    )
+
+    signatures = sign_axons(keypair, 123, "uuid", axons, synapse.body_hash)
+
+    assert len(signatures) == len(axons)
+    for axon, signature in zip(axons, signatures):
+        # the message the axon rebuilds from the request headers
+        request_synapse = preprocess_synapse_for_request(
+            keypair.ss58_address,
+            123,
+            "uuid",
+            "1.2.3.4",
+            axon,
+            synapse.model_copy(),
+            12,
+        )
+        message = (
+            f"{request_synapse.dendrite.nonce}."
+            f"{request_synapse.dendrite.hotkey}."
+            f"{request_synapse.axon.hotkey}."
+            f"{request_synapse.dendrite.uuid}."
+            f"{request_synapse.body_hash}"
+        )
+        assert keypair.verify(message, bytes.fromhex(signature[2:]))
+
+
+def test_axon_headers_match_the_synapse_headers():
+    keypair = bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+    axon = bt.AxonInfo(
+        version=1,
+        ip="10.0.0.1",
+        port=8091,
+        ip_type=4,
+        hotkey=keypair.ss58_address,
+        coldkey="",
+    )
+    synapse = Simulation(
+        simulation_input=SimulationInput(
+            asset="BTC",
+            start_time="2025-02-04T00:00:00+00:00",
+            time_increment=60,
+            time_length=3600,
+            num_simulations=100,
+        )
+    )
+    synapse_headers = synapse.to_headers()
+
+    headers = axon_headers(
+        request_headers(
+            keypair.ss58_address,
+            123,
+            "uuid",
+            "1.2.3.4",
+            synapse_headers,
+            12,
+        ),
+        axon,
+        "0xsignature",
+    )
+
+    # the headers built for each axon before they were shared
+    request_synapse = preprocess_synapse_for_request(
+        keypair.ss58_address,
+        123,
+        "uuid",
+        "1.2.3.4",
+        axon,
+        Simulation(simulation_input=SimulationInput()).from_headers(
+            synapse_headers
+        ),
+        12,
+    )
+    request_synapse.dendrite.signature = "0xsignature"
+    expected = request_synapse.to_headers()
+
+    assert headers.pop("content-type") == "application/json"
+    # total_size is informative only, it depends on the axon strings
+    headers.pop("total_size")
+    expected.pop("total_size")
+    assert headers == expected
+    assert (
+        serialize_body(synapse.model_dump())
+        == json.dumps(
+            synapse.model_dump(), ensure_ascii=False, separators=(",", ":")
+        ).encode()
+    )
+
+
+def test_worker_returns_at_the_deadline():
+    keypair = bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+    synapse = Simulation(simulation_input=SimulationInput())
+
+    async def handle(request: web.Request):
+        if request.headers["bt_header_axon_hotkey"] == "slow":
+            await asyncio.sleep(3)
+        body = await request.json()
+        body["simulation_output"] = [1, 2]
+        return web.json_response(body)
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/Simulation", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        axons = [
+            bt.AxonInfo(
+                version=1,
+                ip="127.0.0.1",
+                port=port,
+                ip_type=4,
+                hotkey=hotkey,
+                coldkey="",
+            )
+            for hotkey in ("fast", "slow")
+        ]
+        try:
+            start_time = time.time()
+            results = await worker(
+                keypair.ss58_address,
+                123,
+                "uuid",
+                "1.2.3.4",
+                request_headers(
+                    keypair.ss58_address,
+                    123,
+                    "uuid",
+                    "1.2.3.4",
+                    synapse.to_headers(),
+                    12,
+                ),
+                serialize_body(synapse.model_dump()),
+                [(axon.to_parameter_dict(), "0x") for axon in axons],
+                12,
+                start_time + 0.5,
+            )
+            return results, time.time() - start_time
+        finally:
+            await runner.cleanup()
+
+    results, elapsed = asyncio.run(run())
+
+    assert results[0][0] == (1, 2)
+    # the slow axon is cancelled at the deadline
+    assert results[1] == [None, None]
+    assert elapsed < 2
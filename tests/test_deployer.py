@@ -0,0 +1,201 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import threading
+
+
+import numpy as np
+import pytest
+
+
+from src.core.config import Config
+from src.deployment import deployer as deployer_module
+from src.deployment.deployer import Deployer, check_prediction
+from synth.miner.price_feed import PriceFeed
+from synth.protocol import Simulation
+from synth.simulation_input import SimulationInput
+from synth.utils.helpers import convert_prices_to_time_format
+from synth.validator.response_validation_v2 import CORRECT
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Stubs the models and the price feed, and records the
+    generate_prediction calls, which block until release is set."""
+    monkeypatch.setattr(deployer_module.db_manager, "get_all_models", list)
+    monkeypatch.setattr(PriceFeed, "get_price", lambda self, asset: 100.0)
+
+    calls = []
+    release = threading.Event()
+    generate_prediction = deployer_module.generate_prediction
+
+    def blocking_generate_prediction(*args):
+        calls.append(args[3])
+        release.wait(timeout=10)
+        return generate_prediction(*args)
+
+    monkeypatch.setattr(
+        deployer_module, "generate_prediction", blocking_generate_prediction
+    )
+    return calls, release
+
+
+def create_deployer(**kwargs) -> Deployer:
+    deployer = Deployer(use_simulation_pool=False, self_check="off", **kwargs)
+    # in-process workers, the stubs aren't seen by spawned processes
+    deployer.executor.shutdown()
+    deployer.executor = ThreadPoolExecutor(max_workers=2)
+    return deployer
+
+
+def synapse(asset: str = "BTC", seconds_to_start: float = 60) -> Simulation:
+    start_time = datetime.now(timezone.utc) + timedelta(
+        seconds=seconds_to_start
+    )
+    return Simulation(
+        simulation_input=SimulationInput(
+            asset=asset,
+            start_time=start_time.replace(microsecond=0).isoformat(),
+            time_increment=60,
+            time_length=3600,
+            num_simulations=Config.NUM_SIMULATIONS,
+        )
+    )
+
+
+def test_identical_requests_share_one_prediction(generated):
+    calls, release = generated
+    deployer = create_deployer()
+    request = synapse()
+
+    async def run():
+        responses = [
+            asyncio.ensure_future(
+                deployer.handle_synapse(None, request.model_copy(deep=True))
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.1)
+        release.set()
+        return await asyncio.gather(*responses)
+
+    try:
+        responses = asyncio.run(run())
+    finally:
+        deployer.executor.shutdown()
+
+    assert len(calls) == 1
+    assert responses[0].simulation_output is not None
+    # start time, time increment and the paths
+    assert len(responses[0].simulation_output) == 2 + Config.NUM_SIMULATIONS
+    assert all(
+        response.simulation_output == responses[0].simulation_output
+        for response in responses
+    )
+
+
+def test_request_past_its_deadline_is_returned_empty(generated):
+    calls, release = generated
+    deployer = create_deployer(deadline_margin=1.0)
+    # 0.3 seconds before the deadline
+    request = synapse(seconds_to_start=1.3)
+    key = deployer.response_cache.key(request.simulation_input)
+
+    async def run():
+        response = await deployer.handle_synapse(None, request)
+        task = deployer.response_cache.get(key)
+        running = not task.done()
+        release.set()
+        return response, running, await task
+
+    try:
+        response, running, prediction = asyncio.run(run())
+    finally:
+        deployer.executor.shutdown()
+
+    assert response.simulation_output is None
+    # the shared prediction isn't cancelled by the timeout
+    assert running
+    assert len(prediction) == 2 + Config.NUM_SIMULATIONS
+    assert len(calls) == 1
+
+
+def test_new_request_is_dropped_above_max_pending(generated):
+    calls, release = generated
+    deployer = create_deployer(max_pending=1)
+
+    async def run():
+        pending = asyncio.ensure_future(
+            deployer.handle_synapse(None, synapse("BTC"))
+        )
+        await asyncio.sleep(0.1)
+        assert deployer.response_cache.pending == 1
+
+        dropped = await deployer.handle_synapse(None, synapse("ETH"))
+        release.set()
+        return dropped, await pending
+
+    try:
+        dropped, response = asyncio.run(run())
+    finally:
+        deployer.executor.shutdown()
+
+    assert dropped.simulation_output is None
+    assert response.simulation_output is not None
+    assert [simulation_input.asset for simulation_input in calls] == ["BTC"]
+
+
+CHECKED_INPUT = SimulationInput(
+    asset="BTC",
+    start_time="2025-02-04T00:00:00+00:00",
+    time_increment=60,
+    time_length=3600,
+    num_simulations=100,
+)
+
+
+def checked_prediction(num_simulations: int = 100) -> tuple:
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(
+        np.cumsum(rng.normal(0, 0.001, (num_simulations, 61)), axis=1)
+    )
+    return convert_prices_to_time_format(
+        prices, CHECKED_INPUT.start_time, CHECKED_INPUT.time_increment
+    )
+
+
+def test_check_prediction_sampled():
+    prediction = checked_prediction()
+
+    assert check_prediction(prediction, CHECKED_INPUT, 10) == CORRECT
+    assert check_prediction(prediction, CHECKED_INPUT) == CORRECT
+    # the sample is validated as a copy of the input
+    assert CHECKED_INPUT.num_simulations == 100
+
+
+def test_check_prediction_wrong_number_of_paths():
+    prediction = checked_prediction(num_simulations=99)
+
+    assert check_prediction(prediction, CHECKED_INPUT, 10) == (
+        "Number of paths is incorrect: expected 100, got 99"
+    )
+
+
+def test_check_prediction_malformed_sampled_path(monkeypatch):
+    prediction = checked_prediction()
+    # the last path misses its last price and is in the sample
+    prediction = (*prediction[:-1], prediction[-1][:-1])
+    monkeypatch.setattr(
+        deployer_module.random,
+        "sample",
+        lambda population, k: list(population)[-k:],
+    )
+
+    assert check_prediction(prediction, CHECKED_INPUT, 10) == (
+        "Number of time points is incorrect: expected 61, got 60"
+    )
+
+
+def test_unknown_self_check_mode():
+    with pytest.raises(ValueError):
+        Deployer(use_simulation_pool=False, self_check="bogus")
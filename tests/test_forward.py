@@ -1,23 +1,31 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 import logging
+import os
 
 
 # from numpy.testing import assert_almost_equal
 import bittensor as bt
 
 
-from sqlalchemy import Engine, insert, select
+from sqlalchemy import Engine, insert, make_url, select
+from sqlalchemy.ext.asyncio import create_async_engine
 from synth.miner.simulations import generate_simulations
 from synth.simulation_input import SimulationInput
 from synth.validator import response_validation_v2
 from synth.validator.forward import (
     calculate_moving_average_and_update_rewards,
     calculate_scores,
+    calculate_scores_parallel,
+    calculate_scores_pipelined,
 )
 from synth.db.models import Miner, MinerReward
+from synth.validator.async_miner_data_handler import AsyncMinerDataHandler
 from synth.validator.miner_data_handler import MinerDataHandler
 from synth.validator.price_data_provider import PriceDataProvider
 from synth.validator import prompt_config
+from synth.validator.reward import get_rewards
+from synth.validator.scoring_pool import create_scoring_pool
 from tests.utils import prepare_random_predictions
 
 
@@ -45,6 +53,109 @@ def test_calculate_rewards_and_update_scores(db_engine: Engine):
     print("miner_scores_df", miner_scores_df)
 
 
+def test_calculate_scores_pipelined(db_engine: Engine):
+    start_time = "2024-10-25T23:58:00+00:00"
+    scored_time = datetime.fromisoformat("2024-10-28T00:00:00+00:00")
+
+    handler, _, miner_uids = prepare_random_predictions(db_engine, start_time)
+
+    price_data_provider = PriceDataProvider()
+
+    validator_requests = handler.get_validator_requests_to_score(
+        scored_time, prompt_config.LOW_FREQUENCY.window_days
+    )
+    assert len(validator_requests) == 1
+    expected_scores, _, _ = get_rewards(
+        handler, price_data_provider, validator_requests[0]
+    )
+
+    async def run():
+        engine = create_async_engine(
+            make_url(os.environ["DB_URL_TEST"]).set(
+                drivername="postgresql+asyncpg"
+            )
+        )
+        try:
+            return await calculate_scores_pipelined(
+                miner_data_handler=AsyncMinerDataHandler(engine),
+                price_data_provider=price_data_provider,
+                scored_time=scored_time,
+                prompt=prompt_config.LOW_FREQUENCY,
+            )
+        finally:
+            await engine.dispose()
+
+    success = asyncio.run(run())
+
+    assert success
+
+    miner_scores_df = handler.get_miner_scores(scored_time, 10)
+
+    assert len(miner_scores_df) == len(miner_uids)
+    assert sorted(miner_scores_df["prompt_score_v3"]) == sorted(
+        expected_scores
+    )
+
+
+def test_calculate_scores_parallel(db_engine: Engine):
+    start_times = [
+        "2024-07-20T23:58:00+00:00",
+        "2024-07-21T23:58:00+00:00",
+        "2024-07-22T23:58:00+00:00",
+    ]
+    scored_time = datetime.fromisoformat("2024-07-25T00:00:00+00:00")
+    later_start_times = [
+        "2024-07-25T23:58:00+00:00",
+        "2024-07-26T23:58:00+00:00",
+    ]
+    later_scored_time = datetime.fromisoformat("2024-07-28T00:00:00+00:00")
+
+    for start_time in start_times:
+        handler, _, miner_uids = prepare_random_predictions(
+            db_engine, start_time
+        )
+
+    price_data_provider = PriceDataProvider()
+    # one pool for both scoring passes, as the validator does
+    with create_scoring_pool(2, handler, price_data_provider) as executor:
+        success = calculate_scores_parallel(
+            miner_data_handler=handler,
+            price_data_provider=price_data_provider,
+            scored_time=scored_time,
+            prompt=prompt_config.LOW_FREQUENCY,
+            executor=executor,
+        )
+        worker_pids = set(executor._processes)
+
+        for start_time in later_start_times:
+            prepare_random_predictions(db_engine, start_time)
+        later_success = calculate_scores_parallel(
+            miner_data_handler=handler,
+            price_data_provider=price_data_provider,
+            scored_time=later_scored_time,
+            prompt=prompt_config.LOW_FREQUENCY,
+            executor=executor,
+        )
+        assert set(executor._processes) == worker_pids
+
+    assert success
+    assert later_success
+
+    miner_scores_df = handler.get_miner_scores(scored_time, 10)
+    # get_miner_scores has no upper bound on scored_time
+    miner_scores_df = miner_scores_df[
+        miner_scores_df["scored_time"] <= scored_time
+    ]
+
+    assert len(miner_scores_df) == len(start_times) * len(miner_uids)
+    assert (
+        handler.get_validator_requests_to_score(
+            later_scored_time, prompt_config.LOW_FREQUENCY.window_days
+        )
+        == []
+    )
+
+
 def test_calculate_moving_average_and_update_rewards(db_engine: Engine):
     start_time = "2024-09-25T23:58:00+00:00"
     scored_time = datetime.fromisoformat("2024-09-28T00:00:00+00:00")
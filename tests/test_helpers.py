@@ -2,6 +2,8 @@ import unittest
 from datetime import datetime
 
 
+import numpy as np
+
 from synth.utils.helpers import (
     convert_prices_to_time_format,
     get_intersecting_arrays,
@@ -9,6 +11,7 @@ from synth.utils.helpers import (
     from_iso_to_unix_time,
     get_current_time,
     round_to_8_significant_digits,
+    round_to_8_significant_digits_array,
 )
 
 
@@ -27,6 +30,33 @@ class TestHelpers(unittest.TestCase):
         assert round_to_8_significant_digits(0.000123456789) == 0.00012345679
         assert round_to_8_significant_digits(0.0) == 0.0
 
+    def test_round_to_8_significant_digits_array(self):
+        rng = np.random.default_rng(0)
+        prices = np.concatenate(
+            [
+                # random prices over many orders of magnitude
+                np.exp(rng.uniform(-30, 60, 10000))
+                * rng.choice([-1, 1], 10000),
+                # 9 digits ending with 5, ties at 8 significant digits
+                (rng.integers(10**7, 10**8, 1000) * 10 + 5)
+                / 10.0 ** rng.integers(0, 12, 1000),
+                [0.0, -0.0, 1.0, 100.0, 1e8, 99999999.5, 0.125, 1e-300],
+            ]
+        )
+
+        expected = np.array(
+            [round_to_8_significant_digits(float(p)) for p in prices]
+        )
+        actual = round_to_8_significant_digits_array(prices)
+
+        np.testing.assert_array_equal(
+            actual.view(np.int64), expected.view(np.int64)
+        )
+        self.assertEqual(
+            round_to_8_significant_digits_array([[123456.789]]).tolist(),
+            [[123456.79]],
+        )
+
     def test_convert_prices_to_time_format(self):
         prices = [[45.67, 56.78, 34.89, 62.15]]
         start_time = "2024-11-19T23:00:00"
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import urllib.request
+
+
+from synth.db.models import ValidatorRequest
+from synth.utils import metrics
+from synth.utils.metrics import MetricsRegistry, dump_json, start_http_server
+from synth.validator.reward import get_rewards, get_rewards_async
+
+
+def test_histogram_buckets():
+    registry = MetricsRegistry()
+    registry.observe("calculate_scores.crps", 0.3)
+    registry.observe("calculate_scores.crps", 7)
+    registry.observe("calculate_scores.crps", 1000)
+
+    histogram = registry.to_dict()["calculate_scores.crps"]
+
+    assert histogram["count"] == 3
+    assert histogram["sum"] == 1007.3
+    assert histogram["max"] == 1000
+    assert histogram["buckets"]["0.25"] == 0
+    assert histogram["buckets"]["0.5"] == 1
+    assert histogram["buckets"]["10"] == 2
+    assert histogram["buckets"]["600"] == 2
+    assert histogram["buckets"]["+Inf"] == 3
+
+
+def test_timer():
+    registry = MetricsRegistry()
+    with registry.timer("calculate_moving_average_and_update_rewards"):
+        pass
+
+    histogram = registry.to_dict()[
+        "calculate_moving_average_and_update_rewards"
+    ]
+    assert histogram["count"] == 1
+
+
+def test_prometheus_endpoint():
+    registry = MetricsRegistry()
+    registry.observe("query_available_miners_and_save_responses.sign", 0.02)
+
+    server = start_http_server(0, registry)
+    try:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{server.server_port}/metrics"
+        ) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "# TYPE synth_validator_stage_seconds histogram" in body
+    assert (
+        'synth_validator_stage_seconds_bucket{stage="query_available_miners_and_save_responses.sign",le="0.025"} 1'
+        in body
+    )
+    assert (
+        'synth_validator_stage_seconds_count{stage="query_available_miners_and_save_responses.sign"} 1'
+        in body
+    )
+
+
+def test_dump_json(tmp_path):
+    registry = MetricsRegistry()
+    registry.observe("calculate_scores.price_fetch", 1.5)
+    path = tmp_path / "metrics.json"
+
+    dump_json(str(path), registry)
+
+    data = json.loads(path.read_text())
+    assert data["stages"]["calculate_scores.price_fetch"]["count"] == 1
+
+
+class StubMinerDataHandler:
+    def get_miner_uid_of_prediction_request(self, validator_request_id):
+        return [1, 2]
+
+    def get_miner_prediction(self, miner_uid, validator_request_id):
+        return None
+
+
+class StubAsyncMinerDataHandler:
+    async def get_miner_prediction(self, miner_uid, validator_request_id):
+        return None
+
+
+class StubPriceDataProvider:
+    def fetch_data(self, validator_request):
+        return [100.0] * 289
+
+
+def test_get_rewards_records_the_crps_stage(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    validator_request = ValidatorRequest(
+        id=1, time_length=86400, time_increment=300
+    )
+
+    get_rewards(
+        StubMinerDataHandler(), StubPriceDataProvider(), validator_request
+    )
+    asyncio.run(
+        get_rewards_async(
+            StubAsyncMinerDataHandler(),
+            validator_request,
+            [1, 2],
+            [100.0] * 289,
+        )
+    )
+
+    histograms = registry.to_dict()
+    # one observation per request and path for each stage
+    assert histograms["calculate_scores.crps"]["count"] == 2
+    assert histograms["calculate_scores.rewards"]["count"] == 2
+    assert histograms["calculate_scores.price_fetch"]["count"] == 1
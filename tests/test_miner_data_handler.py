@@ -1,10 +1,16 @@
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from sqlalchemy import Engine, select, delete
 from sqlalchemy.dialects.postgresql import insert
 
-from synth.db.models import MinerPrediction, ValidatorRequest, Miner
+from synth.db.models import (
+    MetagraphHistory,
+    MinerPrediction,
+    ValidatorRequest,
+    Miner,
+)
 from synth.validator import response_validation_v2
 from synth.simulation_input import SimulationInput
 from synth.validator.miner_data_handler import MinerDataHandler
@@ -442,3 +448,77 @@ def test_insert_new_miners(db_engine: Engine):
                 len(connection.execute(select(Miner)).fetchall())
                 == initial_len + 2
             )
+
+
+def test_update_metagraph_history_skips_unchanged(db_engine: Engine):
+    handler = MinerDataHandler(db_engine)
+
+    def metagraph_item(uid: int, incentive: float, updated_at: str):
+        return {
+            "neuron_uid": uid,
+            "incentive": incentive,
+            "rank": 0.0,
+            "stake": 100.0,
+            "trust": 0.0,
+            "emission": 0.0,
+            "pruning_score": 0.0,
+            "coldkey": f"coldkey{uid}",
+            "hotkey": f"hotkey{uid}",
+            "updated_at": updated_at,
+            "ip_address": "127.0.0.1",
+        }
+
+    def count_rows(uid: int):
+        with db_engine.connect() as connection:
+            return len(
+                connection.execute(
+                    select(MetagraphHistory).where(
+                        MetagraphHistory.neuron_uid == uid
+                    )
+                ).fetchall()
+            )
+
+    handler.update_metagraph_history(
+        [
+            metagraph_item(201, 0.1, "2025-01-01T00:00:00+00:00"),
+            metagraph_item(202, 0.2, "2025-01-01T00:00:00+00:00"),
+        ]
+    )
+    assert count_rows(201) == 1
+    assert count_rows(202) == 1
+
+    # nothing changed except the timestamp: no new rows
+    handler.update_metagraph_history(
+        [
+            metagraph_item(201, 0.1, "2025-01-01T01:00:00+00:00"),
+            metagraph_item(202, 0.2, "2025-01-01T01:00:00+00:00"),
+        ]
+    )
+    assert count_rows(201) == 1
+    assert count_rows(202) == 1
+
+    # only the changed neuron is written
+    handler.update_metagraph_history(
+        [
+            metagraph_item(201, 0.1, "2025-01-01T02:00:00+00:00"),
+            metagraph_item(202, 0.3, "2025-01-01T02:00:00+00:00"),
+        ]
+    )
+    assert count_rows(201) == 1
+    assert count_rows(202) == 2
+
+
+def test_record_db_latency_from_threads(db_engine: Engine):
+    handler = MinerDataHandler(db_engine)
+
+    def record(_):
+        for _ in range(1000):
+            handler.record_db_latency("get_values", 0.001)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(record, range(8)))
+
+    assert handler.db_latency["get_values"]["count"] == 8000
+
+    handler.log_db_stats()
+    assert handler.db_latency == {}
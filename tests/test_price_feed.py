@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+
+
+from aiohttp import web
+import pytest
+
+
+from synth.miner.price_feed import PriceFeed
+from synth.miner.price_simulation import TOKEN_MAP
+
+
+def price_update(asset: str, price: int, publish_time: float) -> dict:
+    return {
+        "id": TOKEN_MAP[asset],
+        "price": {
+            "price": str(price),
+            "conf": "1000",
+            "expo": -8,
+            "publish_time": int(publish_time),
+        },
+    }
+
+
+async def start_hermes_stub(latest: list[dict], stream: list[list[dict]]):
+    """Local stand-in for the Hermes latest price and price stream
+    endpoints."""
+
+    async def handle_latest(request: web.Request):
+        return web.json_response({"parsed": latest})
+
+    async def handle_stream(request: web.Request):
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream"}
+        )
+        await response.prepare(request)
+        for parsed in stream:
+            await response.write(
+                f"data:{json.dumps({'parsed': parsed})}\n\n".encode()
+            )
+        # keep the stream open like Hermes, until the stub is stopped
+        await request.app["stopped"].wait()
+        return response
+
+    app = web.Application()
+    app["stopped"] = asyncio.Event()
+    app.router.add_get("/v2/updates/price/latest", handle_latest)
+    app.router.add_get("/v2/updates/price/stream", handle_stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_price_feed_follows_the_stream():
+    now = time.time()
+
+    async def run():
+        runner, base_url = await start_hermes_stub(
+            latest=[price_update("BTC", 9000000000000, now - 2)],
+            stream=[
+                [price_update("BTC", 9010000000000, now - 1)],
+                [
+                    price_update("ETH", 300000000000, now),
+                    # older than the one received, ignored
+                    price_update("BTC", 8000000000000, now - 3),
+                ],
+            ],
+        )
+        feed = PriceFeed(base_url=base_url)
+        task = asyncio.create_task(feed.run())
+        try:
+            for _ in range(100):
+                if feed.get_price("ETH") is not None:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            task.cancel()
+            runner.app["stopped"].set()
+            await runner.cleanup()
+        return feed
+
+    feed = asyncio.run(run())
+
+    assert feed.get_price("BTC") == pytest.approx(90100)
+    assert feed.get_price("ETH") == pytest.approx(3000)
+    assert feed.get_price("SOL") is None
+
+
+def test_get_price_is_none_when_stale():
+    feed = PriceFeed(max_age=60)
+    feed.update([price_update("BTC", 9000000000000, time.time() - 120)])
+
+    assert feed.get_price("BTC") is None
+    assert feed.get_price("BTC", max_age=300) == pytest.approx(90000)
+
+
+def test_price_feed_stops_while_reconnecting():
+    # nothing listens on port 9, the feed keeps retrying
+    feed = PriceFeed(base_url="http://127.0.0.1:9", reconnect_seconds=60)
+    feed.start()
+    start_time = time.time()
+    feed.stop()
+
+    assert time.time() - start_time < 5
+    assert feed.get_price("BTC") is None
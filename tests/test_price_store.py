@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+import numpy as np
+
+
+from src.training.price_data_provider import PriceDataProvider
+from src.training.price_store import PriceStore
+from synth.utils.helpers import from_iso_to_unix_time
+
+
+SYNC_START = datetime(2025, 2, 19)
+SYNC_END = datetime(2025, 2, 22)
+
+
+def in_memory_store() -> tuple[PriceStore, dict]:
+    """A PriceStore synced from SYNC_START to SYNC_END without files,
+    with missing candles, and the same candles as a Pyth response."""
+    start = from_iso_to_unix_time(SYNC_START.isoformat())
+    end = from_iso_to_unix_time(SYNC_END.isoformat())
+    t = np.arange(start, end + 60, 60)
+    rng = np.random.default_rng(0)
+    # a gap of an hour and single missing candles
+    missing = (t % 86400 >= 36000) & (t % 86400 < 39600)
+    missing |= rng.random(len(t)) < 0.05
+    t = t[~missing]
+    c = 90000 + np.cumsum(rng.normal(0, 10, len(t)))
+
+    store = PriceStore(path="unused")
+    store._candles["BTC"] = (t, c)
+    store._synced["BTC"] = (start, end)
+    return store, {"t": t.tolist(), "c": c.tolist()}
+
+
+def test_window_matches_transform_data():
+    store, data = in_memory_store()
+
+    for start_time, time_length, time_increment in [
+        (datetime(2025, 2, 19, 0, 0), 86400, 300),
+        (datetime(2025, 2, 20, 9, 30), 3600, 60),
+        (datetime(2025, 2, 20, 9, 57), 86400, 300),
+        (datetime(2025, 2, 21, 0, 0), 86400, 300),
+    ]:
+        window = store.window("BTC", start_time, time_length, time_increment)
+        expected = PriceDataProvider._transform_data(
+            data,
+            from_iso_to_unix_time(start_time.isoformat()),
+            time_increment,
+            time_length,
+        )
+
+        np.testing.assert_array_equal(window, expected)
+
+
+def test_window_is_none_outside_the_synced_range():
+    store, _ = in_memory_store()
+
+    assert store.window("BTC", SYNC_END - timedelta(hours=1), 3600, 60)
+    assert store.window("BTC", SYNC_END, 3600, 60) is None
+    assert (
+        store.window("BTC", SYNC_START - timedelta(minutes=1), 60, 60) is None
+    )
+    assert store.window("ETH", SYNC_START, 3600, 60) is None
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, select
+
+from synth.db.models import MinerScore
+from synth.validator import prompt_config
+from synth.validator.forward import (
+    append_owner_weight,
+    calculate_moving_average_and_update_rewards,
+    calculate_scores,
+    owner_uid,
+)
+from synth.validator.price_data_provider import PriceDataProvider
+from synth.validator.replay import compare_weights, replay
+from tests.utils import prepare_random_predictions
+
+
+def test_compare_weights():
+    comparison = compare_weights({1: 0.5, 2: 0.5}, {1: 0.5, 3: 0.5}, 1e-9)
+
+    assert not comparison["identical"]
+    assert comparison["max_difference"] == 0.5
+    assert comparison["missing_uids"] == [3]
+    assert comparison["extra_uids"] == [2]
+
+
+def test_replay_gives_the_recorded_weights(db_engine: Engine):
+    start_time = "2024-08-25T23:58:00+00:00"
+    scored_time = datetime.fromisoformat("2024-08-28T00:00:00+00:00")
+
+    handler, _, _ = prepare_random_predictions(db_engine, start_time)
+
+    # what the validator did live
+    assert calculate_scores(
+        handler,
+        PriceDataProvider(),
+        scored_time,
+        prompt_config.LOW_FREQUENCY,
+    )
+    moving_averages_data = calculate_moving_average_and_update_rewards(
+        handler, scored_time
+    )
+    append_owner_weight(moving_averages_data, owner_uid("finney"), scored_time)
+    handler.update_weights_history(
+        miner_uids=[item["miner_uid"] for item in moving_averages_data],
+        miner_weights=[item["reward_weight"] for item in moving_averages_data],
+        norm_miner_uids=[],
+        norm_miner_weights=[],
+        update_result="SUCCESS",
+        scored_time=scored_time,
+    )
+
+    # the real prices come from validator_requests, not the provider
+    results = replay(
+        db_engine,
+        scored_time - timedelta(days=3),
+        scored_time + timedelta(hours=1),
+    )
+
+    assert results["summary"]["compared_steps"] == 1
+    assert results["summary"]["identical_steps"] == 1
+    with db_engine.connect() as connection:
+        scores = connection.execute(select(MinerScore.id)).all()
+    assert len(scores) == len(moving_averages_data) - 1
@@ -0,0 +1,117 @@
+import asyncio
+
+
+from src.deployment.response_cache import ResponseCache
+from synth.simulation_input import SimulationInput
+
+
+def simulation_input(asset: str = "BTC") -> SimulationInput:
+    return SimulationInput(
+        asset=asset,
+        start_time="2025-02-04T00:00:00+00:00",
+        time_increment=300,
+        time_length=86400,
+        num_simulations=100,
+    )
+
+
+def test_concurrent_get_returns_the_same_task():
+    cache = ResponseCache(ttl=60)
+    key = cache.key(simulation_input())
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "prediction"
+
+    async def request():
+        task = cache.get(key)
+        if task is None:
+            task = cache.create(key, compute)
+        return task, await asyncio.shield(task)
+
+    async def run():
+        return await asyncio.gather(*(request() for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(task is results[0][0] for task, _ in results)
+    assert [prediction for _, prediction in results] == ["prediction"] * 3
+
+
+def test_get_is_none_after_ttl():
+    cache = ResponseCache(ttl=0.05)
+    key = cache.key(simulation_input())
+
+    async def compute():
+        return "prediction"
+
+    async def run():
+        task = cache.create(key, compute)
+        await task
+        # the done callback stores the expiry
+        await asyncio.sleep(0)
+        cached = cache.get(key)
+        await asyncio.sleep(0.1)
+        return task, cached, cache.get(key)
+
+    task, cached, expired = asyncio.run(run())
+
+    assert cached is task
+    assert expired is None
+
+
+def test_failed_or_cancelled_task_is_not_cached():
+    cache = ResponseCache(ttl=60)
+    failing_key = cache.key(simulation_input("BTC"))
+    cancelled_key = cache.key(simulation_input("ETH"))
+
+    async def fail():
+        raise ValueError("simulation failed")
+
+    async def never():
+        await asyncio.sleep(60)
+
+    async def run():
+        failing = cache.create(failing_key, fail)
+        cancelled = cache.create(cancelled_key, never)
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(failing, cancelled, return_exceptions=True)
+        await asyncio.sleep(0)
+        return cache.get(failing_key), cache.get(cancelled_key)
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_pending_counts_the_running_tasks():
+    cache = ResponseCache(ttl=60)
+    release = None
+
+    async def compute():
+        await release.wait()
+        return "prediction"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        assert cache.pending == 0
+
+        tasks = [
+            cache.create(cache.key(simulation_input(asset)), compute)
+            for asset in ["BTC", "ETH"]
+        ]
+        pending = cache.pending
+
+        release.set()
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0)
+        return pending, cache.pending
+
+    pending, pending_when_done = asyncio.run(run())
+
+    assert pending == 2
+    # done tasks stay cached but aren't pending
+    assert pending_when_done == 0
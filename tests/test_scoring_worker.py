@@ -0,0 +1,47 @@
+import threading
+import unittest
+
+
+from synth.validator.scoring_worker import ScoringWorker
+
+
+class TestScoringWorker(unittest.TestCase):
+    def test_jobs_are_coalesced_by_key(self):
+        worker = ScoringWorker()
+        release = threading.Event()
+        started = threading.Event()
+        calls = []
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+            calls.append("blocking")
+
+        worker.start()
+        self.assertTrue(worker.submit("low", blocking_job))
+        started.wait(5)
+
+        # the running job doesn't block a new submission with the same key
+        self.assertTrue(worker.submit("low", lambda: calls.append("low")))
+        # but a second queued one is dropped
+        self.assertFalse(worker.submit("low", lambda: calls.append("low")))
+        self.assertTrue(worker.submit("high", lambda: calls.append("high")))
+
+        release.set()
+        worker.stop(5)
+
+        self.assertEqual(calls, ["blocking", "low", "high"])
+
+    def test_failing_job_does_not_stop_the_worker(self):
+        worker = ScoringWorker()
+        calls = []
+
+        def failing_job():
+            raise ValueError("boom")
+
+        worker.start()
+        worker.submit("low", failing_job)
+        worker.submit("high", lambda: calls.append("high"))
+        worker.stop(5)
+
+        self.assertEqual(calls, ["high"])
@@ -0,0 +1,65 @@
+import numpy as np
+
+
+from src.deployment.simulation_pool import SimulationPool
+
+
+class FakeModel:
+    """Simulates num_simulations paths of rng draws, or fails."""
+
+    def __init__(self, num_simulations: int = 100, fail: bool = False):
+        self.num_simulations = num_simulations
+        self.fail = fail
+
+    def simulate_paths(self, time_increment, time_length, rng):
+        if self.fail:
+            raise RuntimeError("simulation failed")
+        num_steps = time_length // time_increment
+        return rng.random((self.num_simulations, num_steps + 1))
+
+
+def create_pool(model: FakeModel) -> SimulationPool:
+    return SimulationPool(
+        lambda asset, time_length: model,
+        assets=["BTC"],
+        time_configs={3600: (60, 3)},
+        seed=0,
+        executor=None,
+    )
+
+
+def test_get_is_none_before_the_first_refresh():
+    pool = create_pool(FakeModel())
+
+    assert pool.get("BTC", 60, 3600, 10) is None
+
+
+def test_get_slices_num_simulations_paths():
+    pool = create_pool(FakeModel(num_simulations=100))
+    pool.refresh_all()
+
+    paths = pool.get("BTC", 60, 3600, 10)
+
+    assert paths.shape == (10, 61)
+    np.testing.assert_array_equal(paths, pool.get("BTC", 60, 3600, 100)[:10])
+    # not enough paths, or a key the pool doesn't keep
+    assert pool.get("BTC", 60, 3600, 101) is None
+    assert pool.get("ETH", 60, 3600, 10) is None
+
+
+def test_failed_refresh_keeps_the_previous_paths():
+    model = FakeModel()
+    pool = create_pool(model)
+    pool.refresh_all()
+    paths = pool.get("BTC", 60, 3600, 100)
+
+    model.fail = True
+    pool.refresh_all()
+
+    np.testing.assert_array_equal(pool.get("BTC", 60, 3600, 100), paths)
+
+    model.fail = False
+    pool.refresh_all()
+
+    # a new child seed for each refresh
+    assert not np.array_equal(pool.get("BTC", 60, 3600, 100), paths)
@@ -1,6 +1,11 @@
 from datetime import datetime
 
 
+import numpy as np
+import pytest
+
+
+from synth.miner.price_simulation import simulate_crypto_price_paths
 from synth.miner.simulations import generate_simulations
 from synth.simulation_input import SimulationInput
 from synth.utils.helpers import get_current_time, round_time_to_minutes
@@ -24,6 +29,26 @@ def test_generate_simulations():
     )
 
 
+def test_simulate_crypto_price_paths():
+    price_paths = simulate_crypto_price_paths(
+        current_price=90000,
+        time_increment=300,
+        time_length=86400,
+        num_simulations=10000,
+        sigma=0.01,
+        rng=np.random.default_rng(0),
+    )
+
+    assert price_paths.shape == (10000, 289)
+    assert np.all(price_paths[:, 0] == 90000)
+    assert np.all(price_paths > 0)
+    # driftless: the expected price stays the current price
+    assert price_paths[:, -1].mean() == pytest.approx(90000, rel=0.01)
+    # hourly volatility sigma over 24 hours
+    log_returns = np.log(price_paths[:, -1] / 90000)
+    assert log_returns.std() == pytest.approx(0.01 * np.sqrt(24), rel=0.05)
+
+
 def test_run():
     simulation_input = SimulationInput(
         asset="BTC",
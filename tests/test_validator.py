@@ -1,5 +1,8 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
 
@@ -73,3 +76,64 @@ class TestValidator(unittest.TestCase):
                     latest_asset, asset_list, 0
                 )
                 self.assertEqual(selected_asset, "LTC")
+
+    def test_prompt_cycles_run_independently(self):
+        validator = Validator.__new__(Validator)
+        validator.loop = asyncio.new_event_loop()
+        validator.cycle_executor = ThreadPoolExecutor(max_workers=2)
+        validator.cycle_stats = {}
+        validator.miner_data_handler = Mock()
+        validator.miner_data_handler.get_latest_asset.return_value = None
+
+        # a long low frequency cycle must not hold the high frequency one
+        release_low = threading.Event()
+        validator.cycle_low_frequency = Mock(
+            side_effect=lambda asset: release_low.wait(5)
+        )
+        validator.cycle_high_frequency = Mock()
+
+        async def run():
+            task = asyncio.ensure_future(validator.run_cycles())
+            await asyncio.sleep(0.5)
+            high_frequency_calls = validator.cycle_high_frequency.call_count
+            release_low.set()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return high_frequency_calls
+
+        with patch.object(Validator, "select_delay", return_value=0):
+            high_frequency_calls = validator.loop.run_until_complete(run())
+        validator.loop.close()
+        validator.cycle_executor.shutdown()
+
+        self.assertGreater(high_frequency_calls, 1)
+        self.assertEqual(validator.cycle_low_frequency.call_count, 1)
+        self.assertGreater(
+            validator.cycle_stats[HIGH_FREQUENCY.label]["count"], 1
+        )
+
+    def test_forward_prompt_queries_a_snapshot(self):
+        validator = Validator.__new__(Validator)
+        validator.chain_lock = threading.Lock()
+        validator.miner_uids = [2, 0]
+        validator.metagraph = Mock()
+        validator.metagraph.axons = ["axon0", "axon1", "axon2"]
+        validator.miner_data_handler = Mock()
+
+        def update_miners(**kwargs):
+            # the low frequency cycle updates the miners meanwhile
+            validator.miner_uids = [1]
+            validator.metagraph.axons = ["new0", "new1"]
+
+        with patch(
+            "neurons.validator.query_available_miners_and_save_responses",
+            side_effect=update_miners,
+        ) as mock_query, patch(
+            "neurons.validator.get_current_time",
+            return_value=datetime(2025, 12, 3, 12, 0, 0, tzinfo=timezone.utc),
+        ):
+            validator.forward_prompt("BTC", HIGH_FREQUENCY)
+
+        kwargs = mock_query.call_args.kwargs
+        self.assertEqual(kwargs["miner_uids"], [2, 0])
+        self.assertEqual(kwargs["axons"], ["axon2", "axon0"])